@@ -0,0 +1,164 @@
+"""
+Benchmark suite for angular-tester.
+
+Generates a synthetic workspace, starts a stub LLM server and measures the
+throughput and peak memory of scanning, context collection, prompt assembly
+and a full ``process_components`` run. Results are compared against a stored
+baseline, and the script exits with status 1 when a phase regressed.
+
+    python benchmarks/run_benchmarks.py --components 1000
+    python benchmarks/run_benchmarks.py --components 1000 --update-baseline
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+import contextlib
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from angular_tester.main import AngularTester
+from stub_llm import StubLLMServer
+from workspace import generate_workspace
+
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def measure(name: str, items: int, function: Callable[[], Any]) -> Dict[str, Any]:
+    """Run ``function`` once and report items per second and peak traced memory"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    # The tester reports progress with print; keep the benchmark output readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        function()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"phase": name, "items": items, "seconds": round(elapsed, 4),
+            "throughput": round(items / elapsed, 2) if elapsed else None,
+            "peak_mb": round(peak / 1024 / 1024, 2)}
+
+
+def scenario_key(args: argparse.Namespace) -> str:
+    return (f"components={args.components},fan_out={args.fan_out},depth={args.depth},"
+            f"latency={args.latency},error_rate={args.error_rate},concurrency={args.concurrency}")
+
+
+def run_benchmarks(args: argparse.Namespace, root: str) -> List[Dict[str, Any]]:
+    generate_workspace(root, args.components, args.fan_out, args.depth, seed=args.seed)
+    directory = os.path.join(root, "src")
+
+    with StubLLMServer(args.latency, args.error_rate, seed=args.seed) as stub:
+        os.environ['LLM_API_URL'] = stub.url
+        tester = AngularTester(directory=root)
+        tester.config.update({
+            "cache_dir": os.path.join(root, ".angular-tester"),
+            "typecheck_specs": False,
+            "history": False,
+            "metrics": False,
+            "llm_concurrency": args.concurrency,
+        })
+
+        results = []
+        component_files: List[str] = []
+        results.append(measure("scan", args.components,
+                               lambda: component_files.extend(tester.find_component_files(directory))))
+
+        sample = sorted(component_files)[:args.sample]
+        closures: Dict[str, Dict[str, str]] = {}
+        results.append(measure("context", len(sample), lambda: closures.update(
+            (component_file, tester.collect_related_files(component_file)) for component_file in sample
+        )))
+        results.append(measure("prompt", len(sample), lambda: [
+            tester.build_prompt(component_file, closures[component_file]) for component_file in sample
+        ]))
+        closures.clear()
+
+        results.append(measure("process", len(component_files), lambda: tester.process_components(directory)))
+        results[-1]["llm_requests"] = stub.requests
+        results[-1]["llm_errors"] = stub.errors
+    return results
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Phases slower or larger than the baseline by more than ``tolerance``"""
+    regressions = []
+    for result in results:
+        expected = baseline.get(result["phase"])
+        if not expected:
+            continue
+        if expected.get("throughput") and result["throughput"] < expected["throughput"] * (1 - tolerance):
+            regressions.append(f"{result['phase']}: throughput {result['throughput']}/s "
+                               f"vs baseline {expected['throughput']}/s")
+        if expected.get("peak_mb") and result["peak_mb"] > expected["peak_mb"] * (1 + tolerance):
+            regressions.append(f"{result['phase']}: peak memory {result['peak_mb']} MB "
+                               f"vs baseline {expected['peak_mb']} MB")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='angular-tester benchmarks')
+    parser.add_argument('--components', type=int, default=1000, help='Number of synthetic components (1k-50k)')
+    parser.add_argument('--fan-out', type=int, default=3, help='Imports per component and per shared file')
+    parser.add_argument('--depth', type=int, default=3, help='Layers of shared services and models')
+    parser.add_argument('--sample', type=int, default=500,
+                        help='Components used for the context and prompt phases')
+    parser.add_argument('--latency', type=float, default=0.0, help='Stub LLM latency in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of failing stub LLM requests')
+    parser.add_argument('--concurrency', type=int, default=1, help='llm_concurrency used for the process phase')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--baseline', default=BASELINE_FILE, help='Baseline file to compare against')
+    parser.add_argument('--update-baseline', action='store_true', help='Store these results as the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed relative regression')
+    parser.add_argument('--keep', action='store_true', help='Keep the generated workspace')
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix='angular-tester-bench-')
+    try:
+        results = run_benchmarks(args, root)
+    finally:
+        if args.keep:
+            print(f"Workspace kept at {root}")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+
+    print(f"{'phase':<10} {'items':>8} {'seconds':>10} {'items/s':>12} {'peak MB':>10}")
+    for result in results:
+        print(f"{result['phase']:<10} {result['items']:>8} {result['seconds']:>10.3f} "
+              f"{result['throughput'] or 0:>12.1f} {result['peak_mb']:>10.2f}")
+
+    try:
+        with open(args.baseline, 'r') as f:
+            baselines = json.load(f)
+    except (OSError, ValueError):
+        baselines = {}
+    key = scenario_key(args)
+
+    if args.update_baseline:
+        baselines[key] = {result["phase"]: {"throughput": result["throughput"], "peak_mb": result["peak_mb"]}
+                          for result in results}
+        with open(args.baseline, 'w') as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print(f"Baseline updated for {key}")
+        return 0
+
+    if key not in baselines:
+        print(f"No baseline for {key}")
+        return 0
+    regressions = compare(results, baselines[key], args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""
+Local stub of the LLM completion API with configurable latency and error rate
+"""
+
+import json
+import time
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+SPEC_RESPONSE = """import { ComponentFixture, TestBed } from '@angular/core/testing';
+
+describe('StubComponent', () => {
+  it('should create', () => {
+    expect(true).toBeTruthy();
+  });
+});
+"""
+
+
+class StubLLMServer:
+    """Answers every POST with a fixed spec after ``latency`` seconds.
+
+    A fraction ``error_rate`` of the requests fails with HTTP 500. The
+    failures are drawn from a seeded generator so runs are repeatable.
+    """
+
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, seed: int = 0,
+                 host: str = "127.0.0.1", port: int = 0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.requests = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                with stub._lock:
+                    stub.requests += 1
+                    failed = stub._random.random() < stub.error_rate
+                    stub.errors += failed
+                if stub.latency:
+                    time.sleep(stub.latency)
+                if failed:
+                    payload = json.dumps({"error": "stub failure"}).encode('utf-8')
+                    self.send_response(500)
+                else:
+                    payload = json.dumps({
+                        "text": SPEC_RESPONSE,
+                        "usage": {"prompt_tokens": len(body.get("prompt", "")) // 4,
+                                  "completion_tokens": len(SPEC_RESPONSE) // 4},
+                    }).encode('utf-8')
+                    self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/v1/completions"
+
+    def __enter__(self) -> "StubLLMServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.server.shutdown()
+        self.server.server_close()
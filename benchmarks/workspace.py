@@ -0,0 +1,117 @@
+"""
+Synthetic Angular workspace generator for benchmarks
+"""
+
+import os
+import random
+from typing import Dict, List
+
+
+COMPONENT_TEMPLATE = """import {{ Component, Input, Output, EventEmitter }} from '@angular/core';
+{imports}
+
+@Component({{
+  selector: 'app-{slug}',
+  templateUrl: './{slug}.component.html'
+}})
+export class {name}Component {{
+  @Input() value: string = '';
+  @Output() changed = new EventEmitter<string>();
+
+  constructor({constructor}) {{}}
+
+  update(value: string): void {{
+    this.value = value;
+    this.changed.emit(value);
+  }}
+}}
+"""
+
+SERVICE_TEMPLATE = """import {{ Injectable }} from '@angular/core';
+{imports}
+
+@Injectable({{ providedIn: 'root' }})
+export class {name} {{
+  private items: string[] = [];
+
+  constructor({constructor}) {{}}
+
+  load(id: number): string | undefined {{
+    return this.items[id];
+  }}
+}}
+"""
+
+MODEL_TEMPLATE = """export interface {name} {{
+  id: number;
+  label: string;
+  tags: string[];
+}}
+"""
+
+
+def _import_lines(from_dir: str, targets: List[Dict[str, str]]) -> str:
+    lines = []
+    for target in targets:
+        relative = os.path.relpath(target["path"][:-3], from_dir)
+        if not relative.startswith('.'):
+            relative = './' + relative
+        lines.append(f"import {{ {target['name']} }} from '{relative}';")
+    return '\n'.join(lines)
+
+
+def _constructor(targets: List[Dict[str, str]]) -> str:
+    return ', '.join(
+        f"private dep{index}: {target['name']}" for index, target in enumerate(targets) if target["kind"] == "service"
+    )
+
+
+def generate_workspace(root: str, components: int = 1000, fan_out: int = 3, depth: int = 3,
+                       per_directory: int = 100, seed: int = 0) -> Dict[str, int]:
+    """Write a workspace of ``components`` components under ``root``/src/app.
+
+    Shared code is arranged in ``depth`` layers: layer 0 holds models, every
+    higher layer holds services importing ``fan_out`` files of the layer
+    below, and every component imports ``fan_out`` files of the top layer.
+    Import closures therefore have up to ``fan_out ** depth`` files.
+    Returns the number of files written per kind.
+    """
+    rng = random.Random(seed)
+    app = os.path.join(root, "src", "app")
+    shared_per_layer = max(10, components // 20)
+    layers: List[List[Dict[str, str]]] = []
+
+    for layer in range(depth):
+        directory = os.path.join(app, "shared", f"layer{layer}")
+        os.makedirs(directory, exist_ok=True)
+        entries = []
+        for index in range(shared_per_layer):
+            if layer == 0:
+                name = f"Model{index}"
+                path = os.path.join(directory, f"model-{index}.model.ts")
+                content = MODEL_TEMPLATE.format(name=name)
+                kind = "model"
+            else:
+                name = f"Layer{layer}Service{index}"
+                path = os.path.join(directory, f"layer{layer}-{index}.service.ts")
+                targets = rng.sample(layers[-1], min(fan_out, len(layers[-1])))
+                content = SERVICE_TEMPLATE.format(
+                    name=name, imports=_import_lines(directory, targets), constructor=_constructor(targets)
+                )
+                kind = "service"
+            with open(path, 'w') as f:
+                f.write(content)
+            entries.append({"name": name, "path": path, "kind": kind})
+        layers.append(entries)
+
+    for index in range(components):
+        directory = os.path.join(app, f"feature-{index // per_directory}", f"item-{index}")
+        os.makedirs(directory, exist_ok=True)
+        targets = rng.sample(layers[-1], min(fan_out, len(layers[-1]))) if layers else []
+        with open(os.path.join(directory, f"item-{index}.component.ts"), 'w') as f:
+            f.write(COMPONENT_TEMPLATE.format(
+                name=f"Item{index}", slug=f"item-{index}",
+                imports=_import_lines(directory, targets), constructor=_constructor(targets)
+            ))
+
+    return {"components": components, "shared": shared_per_layer * depth}
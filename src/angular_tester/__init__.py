@@ -4,5 +4,6 @@ Angular Tester - A tool to generate and run Angular unit tests using LLMs
 
 from .main import AngularTester
 from .config import ConfigManager
+from .metadata import MetadataExtractor
 
-__all__ = ['AngularTester', 'ConfigManager']
\ No newline at end of file
+__all__ = ['AngularTester', 'ConfigManager', 'MetadataExtractor']
\ No newline at end of file
@@ -0,0 +1,58 @@
+"""
+Token budget accounting and gain-per-token scheduling
+"""
+
+import threading
+from typing import Dict, List
+
+
+def rank_by_gain(estimates: Dict[str, Dict[str, float]]) -> List[str]:
+    """Components ordered by expected coverage gain per estimated token, best first.
+
+    ``estimates`` maps each component to its ``gain`` (uncovered statements)
+    and ``cost`` (prompt and completion tokens). Components that cost
+    nothing, such as trivial ones rendered from templates, come first.
+    """
+    def ratio(component: str) -> float:
+        estimate = estimates[component]
+        if estimate["cost"] <= 0:
+            return float('inf')
+        return estimate["gain"] / estimate["cost"]
+    return sorted(estimates, key=lambda component: (-ratio(component), component))
+
+
+class TokenBudget:
+    """Thread-safe LLM token budget for one run.
+
+    Each component reserves its estimated cost before it is generated and
+    is skipped when the reservation does not fit. Tokens actually spent
+    (as reported by the API) replace the estimate once the request is done.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.spent = 0
+        self.skipped: List[str] = []
+        self._reserved: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, component: str, estimate: float) -> bool:
+        with self._lock:
+            if self.spent + sum(self._reserved.values()) + estimate > self.limit:
+                self.skipped.append(component)
+                return False
+            self._reserved[component] = estimate
+            return True
+
+    def release(self, component: str) -> None:
+        with self._lock:
+            self._reserved.pop(component, None)
+
+    def spend(self, tokens: int) -> None:
+        with self._lock:
+            self.spent += tokens
+
+    def allows(self, component: str) -> bool:
+        """Whether an LLM request for ``component`` may still be sent"""
+        with self._lock:
+            return component in self._reserved or self.spent < self.limit
@@ -0,0 +1,83 @@
+"""
+Local classification of Angular artifacts from parsed metadata
+"""
+
+from typing import Any, Dict, Optional
+
+from .metadata import primary_class
+
+
+# Interfaces and function types that identify a route guard
+GUARD_TYPES = {
+    "CanActivate", "CanActivateChild", "CanDeactivate", "CanMatch", "CanLoad",
+    "CanActivateFn", "CanActivateChildFn", "CanDeactivateFn", "CanMatchFn",
+}
+
+# File name suffixes used when a file has no decorated class
+FILE_SUFFIX_KINDS = [
+    (".component.ts", "component"),
+    (".service.ts", "service"),
+    (".pipe.ts", "pipe"),
+    (".directive.ts", "directive"),
+    (".guard.ts", "guard"),
+]
+
+
+def _base_type(type_name: Optional[str]) -> str:
+    """Strip generic arguments from a type name"""
+    return (type_name or "").split('<')[0].strip()
+
+
+def functional_guard(metadata: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Return the exported guard function of a file, if it declares one"""
+    for function in metadata.get("functions", []):
+        if _base_type(function["type"]) in GUARD_TYPES:
+            return function
+    return None
+
+
+def artifact_kind(file_path: str, metadata: Dict[str, Any]) -> str:
+    """Determine the kind of artifact (component, service, pipe, directive or guard)"""
+    cls = primary_class(metadata)
+    if cls:
+        if any(_base_type(name) in GUARD_TYPES for name in cls["implements"]):
+            return "guard"
+        if cls["kind"] in ("component", "service", "pipe", "directive"):
+            return cls["kind"]
+    if functional_guard(metadata):
+        return "guard"
+
+    for suffix, kind in FILE_SUFFIX_KINDS:
+        if file_path.endswith(suffix):
+            return kind
+    return "component"
+
+
+def is_trivial(metadata: Dict[str, Any]) -> bool:
+    """Whether an artifact is simple enough that a templated spec covers it.
+
+    Trivial artifacts are decorated classes with no inputs, outputs, injected
+    dependencies or public methods (lifecycle hooks included, since their
+    bodies may hold logic). Files without a decorated class, such as
+    functional guards, are never considered trivial.
+    """
+    cls = primary_class(metadata)
+    if cls is None or cls["kind"] is None:
+        return False
+    return not (cls["inputs"] or cls["outputs"] or cls["dependencies"] or cls["methods"])
+
+
+def complexity(metadata: Dict[str, Any], content: str) -> Dict[str, int]:
+    """Size measures of an artifact used to route its LLM request.
+
+    ``loc`` counts non-blank source lines; the other measures come from the
+    primary class and are zero for files without one.
+    """
+    cls = primary_class(metadata) or {}
+    return {
+        "loc": sum(1 for line in content.splitlines() if line.strip()),
+        "inputs": len(cls.get("inputs", [])),
+        "outputs": len(cls.get("outputs", [])),
+        "dependencies": len(cls.get("dependencies", [])),
+        "methods": len(cls.get("methods", [])),
+    }
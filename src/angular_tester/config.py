@@ -1,6 +1,41 @@
 import os
+import re
 import json
-from typing import Dict, Any, Optional
+import fnmatch
+from typing import Dict, Any, List, Optional, Pattern, Tuple
+
+try:
+    import yaml
+except ImportError:  # optional dependency, YAML files are read as JSON without it
+    yaml = None
+
+
+# Config file names, in order of preference; only the first valid one in a directory is used
+CONFIG_FILES = [
+    "angular-tester.config.js",
+    ".angulartesterrc",
+    ".angulartesterrc.json",
+    ".angulartesterrc.yaml",
+    ".angulartesterrc.yml",
+]
+
+
+def compile_patterns(patterns: List[str]) -> Optional[Pattern]:
+    """One regex matching a path (relative to the config's directory) against any of the glob patterns.
+
+    Patterns match the whole path or any trailing part of it, so ``*.d.ts``
+    and ``legacy/**`` apply at any depth; a leading ``/`` anchors a pattern
+    to the config's directory.
+    """
+    if not patterns:
+        return None
+    parts = []
+    for pattern in patterns:
+        if pattern.startswith('/'):
+            parts.append(fnmatch.translate(pattern.lstrip('/')))
+        else:
+            parts.append(r'(?:.*/)?' + fnmatch.translate(pattern))
+    return re.compile('|'.join(f'(?:{part})' for part in parts))
 
 
 class ConfigManager:
@@ -15,38 +50,90 @@ class ConfigManager:
             "custom_templates": {},
             "excluded_files": [],
             "included_files": ["*.component.ts"],
-            "test_file_suffix": ".spec.ts"
+            "test_file_suffix": ".spec.ts",
+            "summarize_dependencies": True,
+            "skip_llm_for_trivial": True,
+            "typecheck_specs": True,
+            "typecheck_retries": 1,
+            "tsconfig_spec": "tsconfig.spec.json",
+            "cache_dir": ".angular-tester",
+            "per_spec_results": True,
+            "karma_config": "karma.conf.js",
+            "test_runner": "karma",
+            "jest_config": None,
+            "spec_retry_budget": 2,
+            "warmup_build": True,
+            "warmup_timeout": 300,
+            "journal": True,
+            "coverage_metric": "lines",
+            "history": True,
+            "llm_concurrency": 1,
+            "watch_debounce": 0.3,
+            "watch_poll_interval": 1.0,
+            "service_host": "127.0.0.1",
+            "service_port": 8765,
+            "service_workers": 2,
+            "service_queue_size": 32,
+            "metrics": True,
+            "metrics_file": None,
+            "metrics_port": None,
+            "max_prompt_chars": 120000,
+            "max_context_chars": 1000000,
+            "cache_friendly_prompt": True,
+            "group_by_dependencies": False,
+            "few_shot_examples": 2,
+            "few_shot_token_budget": 1500,
+            "routing_rules": [],
+            "coverage_guided": False,
+            "token_budget": None,
+            "projects": [],
+            "project_workers": 2,
+            "project_thresholds": {},
+            "browser_dirs": []
         }
         self.config = self.default_config.copy()
+        self.root = os.path.abspath(".")
+        # Resolved (config, include matcher, exclude matcher) per directory
+        self._resolved: Dict[str, Tuple[Dict[str, Any], Any, Any]] = {}
     
     def load_config(self, directory: str = ".") -> Dict[str, Any]:
-        """Load configuration from supported config files"""
-        # Look for config files in order of preference
-        config_files = [
-            os.path.join(directory, "angular-tester.config.js"),
-            os.path.join(directory, ".angulartesterrc"),
-            os.path.join(directory, ".angulartesterrc.json"),
-            os.path.join(directory, ".angulartesterrc.yaml"),
-            os.path.join(directory, ".angulartesterrc.yml")
-        ]
-        
-        for config_file in config_files:
-            if os.path.exists(config_file):
-                try:
-                    if config_file.endswith(".js"):
-                        # For JavaScript config files, we'll need a different approach
-                        # For now, we'll skip JS files and focus on JSON/YAML
-                        continue
-                    elif config_file.endswith((".json", ".yaml", ".yml")) or ".angulartesterrc" in config_file:
-                        config = self._load_json_config(config_file)
-                        if config:
-                            self.config.update(config)
-                            break
-                except Exception as e:
-                    print(f"Warning: Could not load config file {config_file}: {str(e)}")
-        
+        """Load configuration from supported config files.
+
+        ``directory`` becomes the root for ``config_for``: config files in
+        its subdirectories override these settings for the files below them.
+        """
+        config = self._read_layer(directory)
+        if config:
+            self.config.update(config)
+        self.root = os.path.abspath(directory)
+        self._resolved = {}
         return self.config
     
+    def _read_layer(self, directory: str) -> Optional[Dict[str, Any]]:
+        """Settings of the first valid config file in ``directory``"""
+        try:
+            names = set(os.listdir(directory))
+        except OSError:
+            return None
+        for name in CONFIG_FILES:
+            if name not in names:
+                continue
+            config_file = os.path.join(directory, name)
+            try:
+                if config_file.endswith(".js"):
+                    # For JavaScript config files, we'll need a different approach
+                    # For now, we'll skip JS files and focus on JSON/YAML
+                    continue
+                elif config_file.endswith((".yaml", ".yml")):
+                    config = self._load_yaml_config(config_file)
+                else:
+                    config = self._load_json_config(config_file)
+                if config:
+                    return config
+            except Exception as e:
+                print(f"Warning: Could not load config file {config_file}: {str(e)}")
+        return None
+    
     def _load_json_config(self, config_file: str) -> Optional[Dict[str, Any]]:
         """Load configuration from JSON file"""
         try:
@@ -59,10 +146,117 @@ class ConfigManager:
             print(f"Warning: Could not read config file {config_file}: {str(e)}")
             return None
     
+    def _load_yaml_config(self, config_file: str) -> Optional[Dict[str, Any]]:
+        """Load configuration from YAML file (JSON-compatible YAML only without PyYAML)"""
+        if yaml is None:
+            return self._load_json_config(config_file)
+        try:
+            with open(config_file, 'r') as f:
+                config = yaml.safe_load(f)
+        except yaml.YAMLError as e:
+            print(f"Warning: Invalid YAML in config file {config_file}: {str(e)}")
+            return None
+        except Exception as e:
+            print(f"Warning: Could not read config file {config_file}: {str(e)}")
+            return None
+        return config if isinstance(config, dict) else None
+    
+    def _resolve(self, directory: str) -> Tuple[Dict[str, Any], Any, Any]:
+        """Config of ``directory``: the root config overridden by every config file from the root down.
+
+        Resolved configs are cached per directory, so each config file is read
+        and compiled once per scan.
+        """
+        resolved = self._resolved.get(directory)
+        if resolved is not None:
+            return resolved
+        absolute = os.path.abspath(directory)
+        if absolute == self.root or not absolute.startswith(os.path.join(self.root, '')):
+            resolved = self._resolved.get(self.root)
+            if resolved is None:
+                resolved = (self.config, self._matcher(self.root, self.config.get("included_files")),
+                            self._matcher(self.root, self.config.get("excluded_files")))
+                self._resolved[self.root] = resolved
+        else:
+            parent = self._resolve(os.path.dirname(absolute))
+            layer = self._read_layer(absolute)
+            if layer:
+                config = dict(parent[0])
+                for key, value in layer.items():
+                    # Mappings (e.g. custom_templates) are merged, everything else replaced
+                    if isinstance(value, dict) and isinstance(config.get(key), dict):
+                        config[key] = dict(config[key], **value)
+                    else:
+                        config[key] = value
+                include = self._matcher(absolute, layer["included_files"]) if "included_files" in layer else parent[1]
+                exclude = self._matcher(absolute, layer["excluded_files"]) if "excluded_files" in layer else parent[2]
+                resolved = (config, include, exclude)
+            else:
+                resolved = parent
+        self._resolved[directory] = resolved
+        self._resolved[absolute] = resolved
+        return resolved
+    
+    @staticmethod
+    def _matcher(directory: str, patterns: Optional[List[str]]) -> Optional[Tuple[str, Pattern]]:
+        regex = compile_patterns(patterns or [])
+        return (directory, regex) if regex else None
+    
+    def config_for(self, path: str) -> Dict[str, Any]:
+        """Resolved configuration for a file (a dict lookup once its directory has been seen)"""
+        return self._resolve(os.path.dirname(path))[0]
+    
+    def is_included(self, path: str) -> bool:
+        """Whether the file matches the ``included_files`` and not the ``excluded_files`` in effect for it"""
+        _, include, exclude = self._resolve(os.path.dirname(path))
+        return self._matches(include, path, True) and not self._matches(exclude, path, False)
+    
+    @staticmethod
+    def _matches(matcher: Optional[Tuple[str, Pattern]], path: str, default: bool) -> bool:
+        if matcher is None:
+            return default
+        directory, regex = matcher
+        relative = os.path.relpath(os.path.abspath(path), directory).replace(os.sep, '/')
+        return regex.match(relative) is not None
+    
     def get(self, key: str, default=None):
         """Get a configuration value"""
         return self.config.get(key, default)
     
+    def route(self, complexity: Dict[str, int], config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """LLM request settings for a component of the given complexity.
+
+        Each rule in ``routing_rules`` has a ``when`` mapping of ``max_<measure>``
+        and ``min_<measure>`` bounds (``loc``, ``inputs``, ``outputs``,
+        ``dependencies``, ``methods``). The first rule whose bounds all hold
+        supplies ``llm_api_url``, ``model``, ``max_tokens`` and ``temperature``;
+        settings it leaves out fall back to the global values. ``config`` is
+        the resolved config of the component (see ``config_for``).
+        """
+        config = self.config if config is None else config
+        settings = {
+            "llm_api_url": None,
+            "model": None,
+            "max_tokens": config.get("max_tokens", 2000),
+            "temperature": config.get("temperature", 0.3),
+        }
+        for rule in config.get("routing_rules") or []:
+            if self._rule_matches(rule.get("when", {}), complexity):
+                settings.update({key: rule[key] for key in settings if key in rule})
+                break
+        return settings
+    
+    @staticmethod
+    def _rule_matches(conditions: Dict[str, Any], complexity: Dict[str, int]) -> bool:
+        for condition, bound in conditions.items():
+            prefix, _, measure = condition.partition("_")
+            value = complexity.get(measure, 0)
+            if prefix == "max" and value > bound:
+                return False
+            if prefix == "min" and value < bound:
+                return False
+        return True
+    
     def get_custom_template(self, component_type: str) -> Optional[str]:
         """Get a custom template for a specific component type"""
         return self.config.get("custom_templates", {}).get(component_type)
\ No newline at end of file
@@ -0,0 +1,187 @@
+"""
+Parsing and merging of Istanbul coverage reports
+"""
+
+import os
+import re
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+
+METRICS = ("statements", "branches", "functions", "lines")
+
+# Karma's text-summary reporter, e.g. "Lines        : 85.5% ( 171/200 )"
+_TEXT_SUMMARY_PATTERN = re.compile(r'^\s*(Statements|Branches|Functions|Lines)\s*:\s*([\d.]+)%', re.MULTILINE)
+
+
+def _load_json(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def find_coverage_dir(root: str = "coverage") -> Optional[str]:
+    """Find the directory holding the JSON coverage reports.
+
+    Karma writes either directly into ``root`` or into a per-project or
+    per-browser subdirectory of it, so one level of subdirectories is searched.
+    """
+    if not os.path.isdir(root):
+        return None
+    candidates = [root] + sorted(
+        os.path.join(root, name) for name in os.listdir(root) if os.path.isdir(os.path.join(root, name))
+    )
+    for candidate in candidates:
+        if any(os.path.exists(os.path.join(candidate, name))
+               for name in ("coverage-summary.json", "coverage-final.json")):
+            return candidate
+    return None
+
+
+def load_coverage_summary(coverage_dir: str) -> Optional[Dict[str, Any]]:
+    """Load ``coverage-summary.json`` (Istanbul json-summary reporter)"""
+    return _load_json(os.path.join(coverage_dir, "coverage-summary.json"))
+
+
+def load_coverage_final(coverage_dir: str) -> Optional[Dict[str, Any]]:
+    """Load ``coverage-final.json`` (Istanbul json reporter)"""
+    return _load_json(os.path.join(coverage_dir, "coverage-final.json"))
+
+
+def coverage_percentage(summary: Dict[str, Any], metric: str = "lines") -> Optional[float]:
+    """Overall percentage of ``metric`` from a coverage summary"""
+    total = summary.get("total", {}).get(metric)
+    if not total:
+        return None
+    if not total.get("total"):
+        return 100.0
+    return round(100.0 * total["covered"] / total["total"], 2)
+
+
+def parse_text_summary(output: str, metric: str = "lines") -> Optional[float]:
+    """Extract a percentage from text-summary reporter output"""
+    for match in _TEXT_SUMMARY_PATTERN.finditer(output or ""):
+        if match.group(1).lower() == metric:
+            return float(match.group(2))
+    return None
+
+
+def merge_coverage_final(reports: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge per-file hit counts of several coverage-final reports.
+
+    Reports of the same sources (e.g. one per CI shard) are combined by
+    adding statement, function and branch hit counts, which gives the
+    coverage of the union of all test runs.
+    """
+    merged: Dict[str, Any] = {}
+    for report in reports:
+        for file_path, file_coverage in report.items():
+            if file_path not in merged:
+                merged[file_path] = json.loads(json.dumps(file_coverage))
+                continue
+            target = merged[file_path]
+            for key in ("s", "f"):
+                for index, hits in file_coverage.get(key, {}).items():
+                    target[key][index] = target[key].get(index, 0) + hits
+            for index, hits in file_coverage.get("b", {}).items():
+                existing = target["b"].get(index, [0] * len(hits))
+                target["b"][index] = [a + b for a, b in zip(existing, hits)]
+    return merged
+
+
+def file_totals(file_coverage: Dict[str, Any]) -> Dict[str, Dict[str, int]]:
+    """Covered/total counts per metric for one file of a coverage-final report"""
+    statements = file_coverage.get("s", {})
+    functions = file_coverage.get("f", {})
+    branches = [hits for counts in file_coverage.get("b", {}).values() for hits in counts]
+
+    # A line is covered when any statement starting on it was executed
+    lines: Dict[int, int] = {}
+    for index, location in file_coverage.get("statementMap", {}).items():
+        line = location["start"]["line"]
+        lines[line] = max(lines.get(line, 0), statements.get(index, 0))
+
+    return {
+        "statements": {"total": len(statements), "covered": sum(1 for hits in statements.values() if hits)},
+        "branches": {"total": len(branches), "covered": sum(1 for hits in branches if hits)},
+        "functions": {"total": len(functions), "covered": sum(1 for hits in functions.values() if hits)},
+        "lines": {"total": len(lines), "covered": sum(1 for hits in lines.values() if hits)},
+    }
+
+
+def summarize_coverage_final(final: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a json-summary style document from a coverage-final report"""
+    summary: Dict[str, Any] = {"total": {metric: {"total": 0, "covered": 0} for metric in METRICS}}
+    for file_path, file_coverage in final.items():
+        totals = file_totals(file_coverage)
+        summary[file_path] = totals
+        for metric in METRICS:
+            summary["total"][metric]["total"] += totals[metric]["total"]
+            summary["total"][metric]["covered"] += totals[metric]["covered"]
+    for metric in METRICS:
+        summary["total"][metric]["pct"] = coverage_percentage(summary, metric)
+    return summary
+
+
+def line_ranges(lines: List[int]) -> List[Tuple[int, int]]:
+    """Collapse line numbers into sorted (first, last) ranges of consecutive lines"""
+    ranges: List[Tuple[int, int]] = []
+    for line in sorted(set(lines)):
+        if ranges and line == ranges[-1][1] + 1:
+            ranges[-1] = (ranges[-1][0], line)
+        else:
+            ranges.append((line, line))
+    return ranges
+
+
+def coverage_gaps(file_coverage: Dict[str, Any], metric: str = "lines") -> Dict[str, Any]:
+    """Uncovered line ranges and branch paths of one file of a coverage-final report"""
+    statements = file_coverage.get("s", {})
+    lines = []
+    for index, location in file_coverage.get("statementMap", {}).items():
+        if not statements.get(index):
+            lines.extend(range(location["start"]["line"], location["end"]["line"] + 1))
+
+    branches = []
+    for index, branch in sorted(file_coverage.get("branchMap", {}).items(), key=lambda item: int(item[0])):
+        hits = file_coverage.get("b", {}).get(index, [])
+        line = branch.get("line") or branch.get("loc", {}).get("start", {}).get("line")
+        for path, count in enumerate(hits):
+            if not count:
+                branches.append({"line": line, "type": branch.get("type", "branch"), "path": path})
+
+    totals = file_totals(file_coverage)[metric]
+    return {
+        "lines": line_ranges(lines),
+        "branches": branches,
+        "uncovered_statements": sum(1 for hits in statements.values() if not hits),
+        "pct": round(100.0 * totals["covered"] / totals["total"], 2) if totals["total"] else 100.0,
+    }
+
+
+def find_file_coverage(final: Dict[str, Any], file_path: str) -> Optional[Dict[str, Any]]:
+    """Coverage of ``file_path`` in a coverage-final report keyed by absolute or relative paths"""
+    target = os.path.normpath(os.path.abspath(file_path))
+    relative = os.path.normpath(file_path)
+    for path, file_coverage in final.items():
+        normalized = os.path.normpath(path)
+        if normalized == target or normalized == relative or target.endswith(os.sep + normalized.lstrip(os.sep)):
+            return file_coverage
+    return None
+
+
+def describe_gaps(gaps: Optional[Dict[str, Any]]) -> str:
+    """Prompt text listing the uncovered lines and branches of a file"""
+    if gaps is None:
+        return "No existing test executes this file."
+    parts = []
+    if gaps["lines"]:
+        ranges = ", ".join(str(first) if first == last else f"{first}-{last}" for first, last in gaps["lines"])
+        parts.append(f"Uncovered lines: {ranges}")
+    if gaps["branches"]:
+        branches = ", ".join(f"line {branch['line']} ({branch['type']} path {branch['path'] + 1})"
+                             for branch in gaps["branches"])
+        parts.append(f"Uncovered branches: {branches}")
+    return "\n".join(parts) or "All lines and branches are covered."
@@ -0,0 +1,195 @@
+"""
+Lazily imported modules and cached probes of the local toolchain
+"""
+
+import os
+import re
+import glob
+import json
+import shutil
+import hashlib
+import importlib
+import subprocess
+from typing import Any, Dict, Iterable, List, Optional
+
+
+# Executable names of Chrome/Chromium, in order of preference
+BROWSER_NAMES = ['google-chrome', 'chromium', 'chromium-browser', 'google-chrome-stable']
+
+# Layouts of the browser downloads of Puppeteer and Playwright, relative to their cache
+DOWNLOADED_BROWSER_PATTERNS = [
+    "chrome/*/chrome-linux64/chrome",
+    "chrome/*/chrome-mac-*/Google Chrome for Testing.app/Contents/MacOS/Google Chrome for Testing",
+    "chrome-headless-shell/*/chrome-headless-shell-linux64/chrome-headless-shell",
+    "chromium-*/chrome-linux/chrome",
+    "chromium-*/chrome-linux64/chrome",
+    "chromium-*/chrome-mac/Chromium.app/Contents/MacOS/Chromium",
+    "chromium_headless_shell-*/chrome-linux/headless_shell",
+    # Puppeteer before v19 (node_modules/puppeteer/.local-chromium)
+    "*/chrome-linux/chrome",
+]
+
+# Executable names looked for in configured browser directories
+BROWSER_EXECUTABLES = {"chrome", "chromium", "chromium-browser", "google-chrome", "headless_shell",
+                       "chrome-headless-shell"}
+
+ENVIRONMENT_FILE = "environment.json"
+
+
+class LazyModule:
+    """Stands in for a module and imports it on first attribute access.
+
+    Attributes assigned on the proxy (e.g. by ``unittest.mock.patch``) take
+    precedence over those of the module.
+    """
+
+    def __init__(self, name: str):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def __getattr__(self, attribute: str) -> Any:
+        if self._module is None:
+            self.__dict__['_module'] = importlib.import_module(self._name)
+        return getattr(self._module, attribute)
+
+
+def is_executable(path: Optional[str]) -> bool:
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def browser_caches(project_dir: str = ".") -> List[str]:
+    """Directories where Puppeteer and Playwright keep downloaded browsers"""
+    home = os.path.expanduser("~")
+    caches = [os.environ.get('PUPPETEER_CACHE_DIR') or os.path.join(home, ".cache", "puppeteer")]
+    playwright = os.environ.get('PLAYWRIGHT_BROWSERS_PATH')
+    if playwright and playwright != "0":
+        caches.append(playwright)
+    caches += [os.path.join(home, ".cache", "ms-playwright"), os.path.join(home, "Library", "Caches", "ms-playwright")]
+    node_modules = os.path.join(project_dir, "node_modules")
+    caches += [os.path.join(node_modules, ".cache", "puppeteer"),
+               os.path.join(node_modules, "puppeteer", ".local-chromium"),
+               os.path.join(node_modules, "playwright-core", ".local-browsers")]
+    return caches
+
+
+def _newest_first(paths: Iterable[str]) -> List[str]:
+    """Sort browser paths by the version numbers in them, newest first"""
+    return sorted(paths, key=lambda path: [int(part) for part in re.findall(r'\d+', path)], reverse=True)
+
+
+def find_downloaded_browser(search_dirs: Iterable[str] = (), project_dir: str = ".") -> Optional[str]:
+    """The newest Chrome/Chromium executable in ``search_dirs`` or the Puppeteer/Playwright caches.
+
+    Configured ``search_dirs`` are searched first, up to three levels deep.
+    """
+    for directory in search_dirs:
+        directory = os.path.expanduser(directory).rstrip(os.sep)
+        base_depth = directory.count(os.sep)
+        found = []
+        for current, dirs, files in os.walk(directory):
+            if current.count(os.sep) - base_depth >= 3:
+                dirs[:] = []
+            found += [os.path.join(current, name) for name in files if name in BROWSER_EXECUTABLES]
+        found = [path for path in found if is_executable(path)]
+        if found:
+            return os.path.abspath(_newest_first(found)[0])
+
+    for cache in browser_caches(project_dir):
+        if not os.path.isdir(cache):
+            continue
+        found = [path for pattern in DOWNLOADED_BROWSER_PATTERNS
+                 for path in glob.glob(os.path.join(glob.escape(cache), pattern)) if is_executable(path)]
+        if found:
+            return os.path.abspath(_newest_first(found)[0])
+    return None
+
+
+def find_browser(search_dirs: Iterable[str] = ()) -> Optional[str]:
+    """Path of the browser Karma should use.
+
+    ``CHROME_BIN`` wins if it is executable, then browsers on PATH, then
+    already downloaded builds (see ``find_downloaded_browser``).
+    """
+    chrome_bin = os.environ.get('CHROME_BIN')
+    if is_executable(chrome_bin):
+        return chrome_bin
+    for name in BROWSER_NAMES:
+        path = shutil.which(name)
+        if path:
+            return path
+    return find_downloaded_browser(search_dirs)
+
+
+def browser_works(path: str) -> bool:
+    """Whether the browser starts, e.g. its shared libraries are installed"""
+    try:
+        result = subprocess.run([path, '--version'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=30)
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    return result.returncode == 0
+
+
+def node_version() -> Optional[str]:
+    if not shutil.which('node'):
+        return None
+    try:
+        result = subprocess.run(['node', '--version'], capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return result.stdout.strip() or None
+
+
+def angular_cli_version(project_dir: str = ".") -> Optional[str]:
+    """Version of the project's local Angular CLI, read from its package.json"""
+    try:
+        with open(os.path.join(project_dir, 'node_modules', '@angular', 'cli', 'package.json'), 'r') as f:
+            return json.load(f).get('version')
+    except (OSError, ValueError):
+        return None
+
+
+def environment_key(search_dirs: Iterable[str] = ()) -> str:
+    """Identifies the toolchain visible to this process (PATH and the browser directories)"""
+    value = "\0".join([os.environ.get('PATH', '')] + list(search_dirs))
+    return hashlib.sha1(value.encode('utf-8')).hexdigest()
+
+
+def probe_environment(cache_dir: Optional[str] = None, search_dirs: Iterable[str] = ()) -> Dict[str, Optional[str]]:
+    """Browser path, node version and Angular CLI version.
+
+    With ``cache_dir``, results are reused from ``environment.json`` as long
+    as PATH and ``search_dirs`` are unchanged and the cached browser still
+    exists. An executable ``CHROME_BIN`` always takes precedence, and a
+    missing browser is looked up again on every call.
+    """
+    search_dirs = list(search_dirs)
+    key = environment_key(search_dirs)
+    path = os.path.join(cache_dir, ENVIRONMENT_FILE) if cache_dir else None
+    if path:
+        try:
+            with open(path, 'r') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            cached = {}
+        probes = cached.get(key) if isinstance(cached, dict) else None
+        chrome_bin = os.environ.get('CHROME_BIN')
+        if probes and is_executable(chrome_bin):
+            return dict(probes, browser=chrome_bin, cached=True)
+        if probes and is_executable(probes.get("browser")):
+            return dict(probes, cached=True)
+        if probes and probes.get("browser") is None:
+            # A browser may have been installed since; looking it up does not spawn anything
+            return dict(probes, browser=find_browser(search_dirs), cached=True)
+
+    probes = {"browser": find_browser(search_dirs), "node": node_version(), "ng": angular_cli_version()}
+    if path:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            temporary = f"{path}.tmp"
+            with open(temporary, 'w') as f:
+                # Only the current toolchain is kept
+                json.dump({key: probes}, f)
+            os.replace(temporary, path)
+        except OSError as e:
+            print(f"Could not cache environment probes: {str(e)}")
+    return dict(probes, cached=False)
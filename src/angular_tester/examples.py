@@ -0,0 +1,154 @@
+"""
+Lexical (BM25) index of existing spec files, used for few-shot examples
+"""
+
+import os
+import re
+import json
+import math
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+INDEX_VERSION = 1
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+_IDENTIFIER_PATTERN = re.compile(r'[A-Za-z_$][\w$]*')
+_IMPORT_PATTERN = re.compile(r'from\s+[\'"]([^\'"]+)[\'"]')
+_CAMEL_PATTERN = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+')
+
+# Language keywords carry no signal about what a file is about
+STOPWORDS = {
+    "import", "from", "export", "class", "const", "let", "var", "new", "this", "return", "function",
+    "if", "else", "for", "of", "in", "true", "false", "null", "undefined", "void", "public",
+    "private", "protected", "readonly", "async", "await", "string", "number", "boolean", "any",
+    "type", "interface", "extends", "implements", "constructor", "get", "set", "the", "a", "to",
+}
+
+
+def tokenize(source: str) -> List[str]:
+    """Identifiers, their camelCase parts and import path segments, lowercased"""
+    tokens = []
+    for identifier in _IDENTIFIER_PATTERN.findall(source):
+        lowered = identifier.lower()
+        if lowered in STOPWORDS or len(lowered) < 2:
+            continue
+        tokens.append(lowered)
+        parts = [part.lower() for part in _CAMEL_PATTERN.findall(identifier)]
+        if len(parts) > 1:
+            tokens.extend(part for part in parts if part not in STOPWORDS and len(part) > 1)
+    for module in _IMPORT_PATTERN.findall(source):
+        tokens.extend(segment.lower() for segment in re.split(r'[/.\-@]+', module) if len(segment) > 1)
+    return tokens
+
+
+class SpecIndex:
+    """BM25 index over spec files, persisted as JSON and updated incrementally.
+
+    Each document stores its term frequencies and the modification time and
+    size of the file it was built from, so ``update`` only re-reads specs
+    that changed since the index was saved.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.documents: Dict[str, Dict] = {}
+        self._document_frequency: Optional[Counter] = None
+
+    def load(self) -> None:
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == INDEX_VERSION:
+            self.documents = data.get("documents", {})
+            self._document_frequency = None
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        temporary = f"{self.path}.tmp"
+        with open(temporary, 'w') as f:
+            json.dump({"version": INDEX_VERSION, "documents": self.documents}, f)
+        os.replace(temporary, self.path)
+
+    def update(self, spec_files: Iterable[str]) -> int:
+        """Index new and modified specs and drop missing ones; returns the number re-read"""
+        current = set()
+        changed = 0
+        for spec_file in spec_files:
+            current.add(spec_file)
+            try:
+                stat = os.stat(spec_file)
+            except OSError:
+                continue
+            document = self.documents.get(spec_file)
+            if document and document["mtime"] == stat.st_mtime_ns and document["size"] == stat.st_size:
+                continue
+            try:
+                with open(spec_file, 'r') as f:
+                    tokens = tokenize(f.read())
+            except (OSError, UnicodeDecodeError):
+                continue
+            self.documents[spec_file] = {"mtime": stat.st_mtime_ns, "size": stat.st_size,
+                                         "length": len(tokens), "tf": dict(Counter(tokens))}
+            changed += 1
+        removed = set(self.documents) - current
+        for spec_file in removed:
+            del self.documents[spec_file]
+        if changed or removed:
+            self._document_frequency = None
+        return changed
+
+    def _frequencies(self) -> Counter:
+        if self._document_frequency is None:
+            self._document_frequency = Counter()
+            for document in self.documents.values():
+                self._document_frequency.update(document["tf"].keys())
+        return self._document_frequency
+
+    def search(self, query: str, k: int = 3, exclude: Iterable[str] = ()) -> List[Tuple[str, float]]:
+        """The ``k`` specs most similar to ``query`` (source text), best first"""
+        if not self.documents:
+            return []
+        excluded = set(exclude)
+        frequencies = self._frequencies()
+        count = len(self.documents)
+        average_length = sum(document["length"] for document in self.documents.values()) / count or 1
+        terms = set(tokenize(query))
+
+        scores = []
+        for spec_file, document in self.documents.items():
+            if spec_file in excluded:
+                continue
+            score = 0.0
+            for term in terms:
+                tf = document["tf"].get(term)
+                if not tf:
+                    continue
+                idf = math.log(1 + (count - frequencies[term] + 0.5) / (frequencies[term] + 0.5))
+                score += idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * document["length"] / average_length))
+            if score > 0:
+                scores.append((spec_file, score))
+        scores.sort(key=lambda item: (-item[1], item[0]))
+        return scores[:k]
+
+
+def select_examples(matches: List[Tuple[str, float]], token_budget: int) -> List[Tuple[str, str]]:
+    """Read the matched specs, best first, while they fit in ``token_budget`` (~4 characters per token)"""
+    examples = []
+    remaining = token_budget * 4
+    for spec_file, _ in matches:
+        try:
+            with open(spec_file, 'r') as f:
+                content = f.read()
+        except OSError:
+            continue
+        if len(content) > remaining:
+            continue
+        examples.append((spec_file, content))
+        remaining -= len(content)
+    return examples
@@ -0,0 +1,139 @@
+"""
+Historical per-component timing database
+"""
+
+import os
+import time
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional
+
+
+# Weight of the newest observation in the moving averages
+SMOOTHING = 0.5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS component_stats (
+    component TEXT PRIMARY KEY,
+    runs INTEGER NOT NULL DEFAULT 0,
+    llm_latency REAL,
+    prompt_tokens REAL,
+    spec_runtime REAL,
+    duration REAL,
+    failures INTEGER NOT NULL DEFAULT 0,
+    updated REAL
+);
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started REAL,
+    components INTEGER,
+    duration REAL,
+    llm_latency REAL,
+    prompt_tokens INTEGER,
+    failures INTEGER
+);
+"""
+
+_METRICS = ("llm_latency", "prompt_tokens", "spec_runtime", "duration")
+
+
+def _smooth(previous: Optional[float], value: Optional[float]) -> Optional[float]:
+    if value is None:
+        return previous
+    if previous is None:
+        return value
+    return SMOOTHING * value + (1 - SMOOTHING) * previous
+
+
+class HistoryStore:
+    """SQLite store of per-component LLM latency, prompt size, spec runtime and failures.
+
+    Components are keyed by their path relative to the scanned directory so
+    the data can be shared between checkouts (e.g. through a CI cache).
+    Measurements are smoothed with an exponential moving average so that a
+    single slow request does not dominate scheduling decisions.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def get(self, component: str) -> Optional[Dict[str, Any]]:
+        row = self.connection.execute(
+            "SELECT * FROM component_stats WHERE component = ?", (component,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def record_many(self, stats: Dict[str, Dict[str, Any]]) -> None:
+        """Fold one run's measurements into the moving averages, in one transaction"""
+        now = time.time()
+        with self.connection:
+            for component, values in stats.items():
+                current = self.get(component) or {"runs": 0, "failures": 0}
+                updated = {metric: _smooth(current.get(metric), values.get(metric)) for metric in _METRICS}
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO component_stats "
+                    "(component, runs, llm_latency, prompt_tokens, spec_runtime, duration, failures, updated) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (component, current["runs"] + 1, updated["llm_latency"], updated["prompt_tokens"],
+                     updated["spec_runtime"], updated["duration"],
+                     current["failures"] + (1 if values.get("failed") else 0), now)
+                )
+
+    def record_run(self, started: float, stats: Dict[str, Dict[str, Any]]) -> None:
+        """Store one aggregate row per run for trend reports"""
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO runs (started, components, duration, llm_latency, prompt_tokens, failures) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (started, len(stats), time.time() - started,
+                 sum(values.get("llm_latency") or 0 for values in stats.values()),
+                 int(sum(values.get("prompt_tokens") or 0 for values in stats.values())),
+                 sum(1 for values in stats.values() if values.get("failed")))
+            )
+
+    def expected_costs(self, components: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """Expected seconds of work per component (generation plus spec runtime)"""
+        rows = self.connection.execute("SELECT component, duration, spec_runtime FROM component_stats").fetchall()
+        wanted = set(components) if components is not None else None
+        costs = {}
+        for row in rows:
+            if wanted is not None and row["component"] not in wanted:
+                continue
+            cost = (row["duration"] or 0) + (row["spec_runtime"] or 0)
+            if cost:
+                costs[row["component"]] = cost
+        return costs
+
+    def recent_runs(self, limit: int = 10) -> List[Dict[str, Any]]:
+        rows = self.connection.execute("SELECT * FROM runs ORDER BY run_id DESC LIMIT ?", (limit,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def slowest_components(self, limit: int = 20) -> List[Dict[str, Any]]:
+        rows = self.connection.execute(
+            "SELECT * FROM component_stats "
+            "ORDER BY COALESCE(duration, 0) + COALESCE(spec_runtime, 0) DESC LIMIT ?", (limit,)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def report(self, limit: int = 20) -> str:
+        """Render recent run trends and the most expensive components as text"""
+        lines = ["Recent runs:", f"{'started':<20} {'components':>10} {'duration':>10} {'llm time':>10} {'tokens':>10} {'failures':>8}"]
+        for run in self.recent_runs():
+            started = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(run["started"]))
+            lines.append(f"{started:<20} {run['components']:>10} {run['duration']:>9.1f}s "
+                         f"{run['llm_latency']:>9.1f}s {run['prompt_tokens']:>10} {run['failures']:>8}")
+
+        lines += ["", "Most expensive components:",
+                  f"{'component':<50} {'runs':>5} {'llm':>8} {'tokens':>8} {'spec':>8} {'fails':>6}"]
+        for stats in self.slowest_components(limit):
+            lines.append(
+                f"{stats['component'][-50:]:<50} {stats['runs']:>5} {stats['llm_latency'] or 0:>7.1f}s "
+                f"{stats['prompt_tokens'] or 0:>8.0f} {(stats['spec_runtime'] or 0):>7.1f}s {stats['failures']:>6}"
+            )
+        return '\n'.join(lines)
@@ -4,17 +4,15 @@ import subprocess
 import sys
 import os
 
-def is_chrome_installed():
-    """Check if Chrome/Chromium is installed"""
-    browsers = ['google-chrome', 'chromium', 'chromium-browser', 'google-chrome-stable']
-    for browser in browsers:
-        try:
-            subprocess.run([browser, '--version'], 
-                         stdout=subprocess.DEVNULL, 
-                         stderr=subprocess.DEVNULL)
+from .config import ConfigManager
+from .environment import browser_works, find_browser, find_downloaded_browser
+
+def is_chrome_installed(search_dirs=()):
+    """Find a working Chrome/Chromium: CHROME_BIN, PATH, configured directories or Puppeteer/Playwright downloads"""
+    candidates = [find_browser(search_dirs), find_downloaded_browser(search_dirs)]
+    for browser in dict.fromkeys(candidate for candidate in candidates if candidate):
+        if browser_works(browser):
             return browser
-        except FileNotFoundError:
-            continue
     return None
 
 def install_chrome():
@@ -37,11 +35,14 @@ def install_chrome():
             print("Failed to install Chromium using yum")
             return None
 
-def ensure_chrome():
-    """Ensure Chrome/Chromium is available"""
-    chrome_path = is_chrome_installed()
+def ensure_chrome(search_dirs=()):
+    """Ensure Chrome/Chromium is available, reusing an existing binary before installing one"""
+    chrome_path = is_chrome_installed(search_dirs)
     if chrome_path:
+        # Karma's Chrome launcher reads CHROME_BIN
+        os.environ['CHROME_BIN'] = chrome_path
         print(f"Chrome/Chromium found: {chrome_path}")
+        print(f"export CHROME_BIN={chrome_path}")
         return chrome_path
     
     print("Chrome/Chromium not found. Attempting to install...")
@@ -54,7 +55,9 @@ def ensure_chrome():
         return None
 
 if __name__ == "__main__":
-    chrome = ensure_chrome()
+    # Directories given on the command line are searched before the configured ones
+    search_dirs = sys.argv[1:] + ConfigManager().load_config(".").get('browser_dirs', [])
+    chrome = ensure_chrome(search_dirs)
     if chrome:
         print(f"Ready to use: {chrome}")
     else:
@@ -0,0 +1,101 @@
+"""
+Append-only journal of per-component progress for resumable runs
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+STATES = ("pending", "generated", "written", "failed")
+
+
+def content_hash(parts: Iterable[Tuple[str, str]]) -> str:
+    """Hash (path, content) pairs in a stable order"""
+    digest = hashlib.sha256()
+    for path, content in sorted(parts):
+        digest.update(path.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(content.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def file_hash(file_path: str) -> Optional[str]:
+    """Hash a single file, or None if it cannot be read"""
+    try:
+        with open(file_path, 'r') as f:
+            return content_hash([(file_path, f.read())])
+    except OSError:
+        return None
+
+
+class WorkJournal:
+    """JSON-lines journal recording the state of every component in a run.
+
+    Each state change is appended as one line and flushed to the OS, which
+    costs a single write call per record; the file is only fsynced when the
+    journal is closed. Replaying the journal keeps the last record per
+    component, and a torn final line from a crash is ignored. Records may
+    come from several generation workers at once.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._file = None
+        self._lock = threading.Lock()
+
+    def open(self, resume: bool = False) -> None:
+        """Open the journal, replaying it when resuming and truncating it otherwise"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        if resume:
+            self.entries = self.load()
+        else:
+            self.entries = {}
+        self._file = open(self.path, 'a' if resume else 'w')
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Replay the journal file and return the latest entry per component"""
+        entries = {}
+        if not os.path.exists(self.path):
+            return entries
+        with open(self.path, 'r') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                entries[entry["component"]] = entry
+        return entries
+
+    def record(self, component: str, state: str, **fields: Any) -> None:
+        """Append a state change for a component"""
+        if state not in STATES:
+            raise ValueError(f"Unknown journal state: {state}")
+        with self._lock:
+            entry = dict(self.entries.get(component, {}))
+            entry.update(fields)
+            entry.update({"component": component, "state": state, "time": time.time()})
+            self.entries[component] = entry
+            if self._file:
+                self._file.write(json.dumps(entry) + '\n')
+                self._file.flush()
+
+    def is_complete(self, component: str, input_hash: str, spec_file: str) -> bool:
+        """Whether a component was written with the same inputs and its spec is intact"""
+        entry = self.entries.get(component)
+        if not entry or entry.get("state") != "written" or entry.get("input_hash") != input_hash:
+            return False
+        return entry.get("spec_hash") is not None and entry.get("spec_hash") == file_hash(spec_file)
+
+    def close(self) -> None:
+        """Flush the journal to disk and close it"""
+        if self._file:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
@@ -0,0 +1,159 @@
+"""
+Per-spec result collection for Karma test runs
+"""
+
+import os
+import re
+import json
+from typing import Any, Dict, List, Optional
+
+
+# Karma config that wraps the project configuration (or Angular's defaults
+# when the project has none) and adds an inline reporter writing one JSON
+# record per executed `it`
+KARMA_WRAPPER_TEMPLATE = """// Generated by angular-tester, do not edit
+const fs = require('fs');
+const path = require('path');
+
+const BASE_CONFIG = %(base_config)s;
+const RESULTS_FILE = %(results_file)s;
+
+function defaultConfig(config) {
+  config.set({
+    basePath: '',
+    frameworks: ['jasmine', '@angular-devkit/build-angular'],
+    plugins: [
+      require('karma-jasmine'),
+      require('karma-chrome-launcher'),
+      require('karma-coverage'),
+      require('@angular-devkit/build-angular/plugins/karma')
+    ],
+    coverageReporter: {
+      dir: path.join(process.cwd(), 'coverage'),
+      subdir: '.',
+      reporters: [{ type: 'text-summary' }, { type: 'json-summary' }, { type: 'json' }]
+    },
+    reporters: ['progress'],
+    browsers: ['ChromeHeadless'],
+    singleRun: true
+  });
+}
+
+function AngularTesterJsonReporter() {
+  const specs = [];
+  this.onSpecComplete = function (browser, result) {
+    specs.push({
+      suite: result.suite,
+      description: result.description,
+      success: result.success,
+      skipped: result.skipped,
+      time: result.time,
+      log: result.log
+    });
+  };
+  this.onRunComplete = function () {
+    fs.mkdirSync(path.dirname(RESULTS_FILE), { recursive: true });
+    fs.writeFileSync(RESULTS_FILE, JSON.stringify({ specs: specs }));
+  };
+}
+
+// The coverage gate and shard merging read the JSON reports
+function withJsonCoverage(coverageReporter) {
+  const reporters = (coverageReporter.reporters || [{ type: coverageReporter.type || 'html' }]).slice();
+  ['json-summary', 'json'].forEach(function (type) {
+    if (!reporters.some(function (reporter) { return reporter.type === type; })) {
+      reporters.push({ type: type });
+    }
+  });
+  return Object.assign({}, coverageReporter, { reporters: reporters });
+}
+
+module.exports = function (config) {
+  (BASE_CONFIG ? require(BASE_CONFIG) : defaultConfig)(config);
+  config.set({
+    coverageReporter: withJsonCoverage(config.coverageReporter || {}),
+    plugins: (config.plugins || []).concat([
+      { 'reporter:angular-tester-json': ['type', AngularTesterJsonReporter] }
+    ]),
+    reporters: (config.reporters || ['progress'])
+      .filter(function (reporter) { return reporter !== 'kjhtml'; })
+      .concat(['angular-tester-json'])
+  });
+};
+"""
+
+_DESCRIBE_PATTERN = re.compile(r'^describe\s*\(\s*([\'"`])(.+?)\1', re.MULTILINE)
+
+
+def write_karma_wrapper(cache_dir: str, base_config: Optional[str], results_file: str) -> str:
+    """Write the wrapping Karma config and return its path"""
+    os.makedirs(cache_dir, exist_ok=True)
+    wrapper_path = os.path.join(cache_dir, "karma.conf.js")
+    with open(wrapper_path, 'w') as f:
+        f.write(KARMA_WRAPPER_TEMPLATE % {
+            "base_config": json.dumps(os.path.abspath(base_config)) if base_config else "null",
+            "results_file": json.dumps(os.path.abspath(results_file)),
+        })
+    return wrapper_path
+
+
+def load_spec_results(results_file: str) -> Optional[List[Dict[str, Any]]]:
+    """Load the per-`it` records written by the reporter, or None if missing"""
+    try:
+        with open(results_file, 'r') as f:
+            return json.load(f).get("specs", [])
+    except (OSError, ValueError) as e:
+        print(f"Per-spec results not available: {str(e)}")
+        return None
+
+
+def spec_describe_names(spec_file: str) -> List[str]:
+    """Return the top-level describe names declared in a spec file"""
+    try:
+        with open(spec_file, 'r') as f:
+            content = f.read()
+    except OSError:
+        return []
+    return [match.group(2) for match in _DESCRIBE_PATTERN.finditer(content)]
+
+
+def failure_message(result: Dict[str, Any], max_lines: int = 3) -> str:
+    """Format a failed `it` as a short message suitable for a prompt"""
+    title = ' > '.join(list(result.get("suite", [])) + [result.get("description", "")])
+    details = []
+    for log in result.get("log", []):
+        details.extend(line.strip() for line in str(log).splitlines()[:max_lines])
+    return f"{title}: {' | '.join(details)}" if details else title
+
+
+def group_results_by_spec(results: List[Dict[str, Any]], spec_files: List[str]) -> Dict[Optional[str], Dict[str, Any]]:
+    """Aggregate `it` records per spec file.
+
+    Records carrying the spec path (Jest and Vitest) are matched on it, the
+    others by their top-level describe name. Records that cannot be
+    attributed to one of ``spec_files`` are grouped under the ``None`` key.
+    """
+    owners = {}
+    paths = {}
+    for spec_file in spec_files:
+        paths[os.path.abspath(spec_file)] = spec_file
+        for name in spec_describe_names(spec_file):
+            owners.setdefault(name, spec_file)
+
+    grouped: Dict[Optional[str], Dict[str, Any]] = {}
+    for result in results:
+        if result.get("file"):
+            spec_file = paths.get(os.path.abspath(result["file"]))
+        else:
+            suite = result.get("suite") or [""]
+            spec_file = owners.get(suite[0])
+        summary = grouped.setdefault(spec_file, {"passed": 0, "failed": 0, "skipped": 0, "duration": 0, "failures": []})
+        summary["duration"] += result.get("time") or 0
+        if result.get("skipped"):
+            summary["skipped"] += 1
+        elif result.get("success"):
+            summary["passed"] += 1
+        else:
+            summary["failed"] += 1
+            summary["failures"].append(failure_message(result))
+    return grouped
@@ -1,17 +1,57 @@
 import os
 import sys
+import copy
+import argparse
 import subprocess
-import requests
 import json
 import glob
 import re
-from typing import List, Optional, Dict
+import time
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Dict, Set, Tuple
 
 from .config import ConfigManager
+from .environment import LazyModule, probe_environment
+from .metadata import MetadataExtractor
+from .classifier import artifact_kind, complexity, functional_guard, is_trivial
+from .templates import FUNCTIONAL_GUARD_TEMPLATE, get_basic_template
+from .template_engine import build_context, render_template
+from .typecheck import SpecTypeChecker
+from .karma import group_results_by_spec
+from .runners import create_runner
+from .warmup import BuildWarmer, build_environment
+from .journal import WorkJournal, content_hash, file_hash
+from .sharding import merge_shard_results, parse_shard, select_shard, shard_results_path, write_shard_results
+from .history import HistoryStore
+from .watch import ImportGraph, create_watcher, wait_for_changes
+from .profiling import DISABLED, Profiler
+from .prompt import PROMPT_INSTRUCTIONS, PromptBuffer
+from .examples import SpecIndex, select_examples
+from .budget import TokenBudget, rank_by_gain
+from .workspace import discover_projects, format_report, select_projects
+from . import metrics
+from .coverage import (
+    coverage_gaps, coverage_percentage, describe_gaps, find_coverage_dir, find_file_coverage,
+    load_coverage_final, load_coverage_summary, parse_text_summary, summarize_coverage_final
+)
+
+
+# Importing requests dominates start-up; it is only needed once the LLM is called
+requests = LazyModule('requests')
+
+# Test cases of a Jasmine/Jest spec
+TEST_CASE_PATTERN = re.compile(r'\b(?:it|fit|xit|test)\s*\(')
 
 
 class AngularTester:
-    def __init__(self, directory: str = "."):
+    # Guards counters shared by concurrent generation workers
+    _lock = threading.Lock()
+    # Replaced by a Profiler with --profile
+    profiler = DISABLED
+
+    def __init__(self, directory: str = ".", resume: bool = False, shard: Optional[Tuple[int, int]] = None):
         # Initialize configuration manager
         self.config_manager = ConfigManager()
         self.config = self.config_manager.load_config(directory)
@@ -22,25 +62,70 @@ class AngularTester:
         self.llm_timeout = self.config.get('llm_timeout', 30)
         self.max_tokens = self.config.get('max_tokens', 2000)
         self.temperature = self.config.get('temperature', 0.3)
+        self.metadata_extractor = MetadataExtractor()
+        self.resume = resume
+        self.shard = shard
         
         if not self.llm_api_url:
             raise ValueError("LLM_API_URL must be set via environment variable or config file")
 
+    def session(self) -> 'AngularTester':
+        """A copy sharing configuration and caches, with its own per-run state.
+
+        Sessions let several jobs use one warm tester at the same time.
+        """
+        session = copy.copy(self)
+        session.history = None
+        session.journal = None
+        session.written_specs = {}
+        session.component_stats = {}
+        session.spec_results = None
+        session.llm_calls_avoided = 0
+        session.token_budget = None
+        session.collected_context = {}
+        session.last_coverage = None
+        session.run_started = time.time()
+        session.run_status = {"processed": False, "tests_passed": False}
+        return session
+
     def find_component_files(self, directory: str) -> List[str]:
-        """Find all Angular component files (.ts files excluding spec files)"""
+        """Find all Angular component files (.ts files excluding spec files)
+
+        With a config manager, files are selected by the ``included_files``
+        and ``excluded_files`` in effect for their directory.
+        """
         component_files = []
         for root, _, files in os.walk(directory):
             for file in files:
-                if file.endswith('.component.ts'):
-                    component_files.append(os.path.join(root, file))
+                path = os.path.join(root, file)
+                if self.is_component_file(path):
+                    component_files.append(path)
         return component_files
 
+    def is_component_file(self, path: str) -> bool:
+        """Whether ``path`` is a file that specs are generated for"""
+        manager = getattr(self, 'config_manager', None)
+        if manager is None:
+            return path.endswith('.component.ts')
+        return (path.endswith('.ts') and not path.endswith(('.spec.ts', '.d.ts'))
+                and not path.endswith(self.file_config(path).get('test_file_suffix', '.spec.ts'))
+                and manager.is_included(path))
+
+    def file_config(self, path: str) -> Dict:
+        """Configuration in effect for a file, including config files in the directories above it"""
+        manager = getattr(self, 'config_manager', None)
+        if manager is None:
+            return getattr(self, 'config', {})
+        config = manager.config_for(path)
+        # Without overrides, this tester's (possibly per-project) config applies
+        return self.config if config is manager.config else config
+
     def find_test_file(self, component_file: str) -> str:
         """Find or create the corresponding test file for a component"""
         # Use config value or default
         test_suffix = '.spec.ts'
         if hasattr(self, 'config'):
-            test_suffix = self.config.get('test_file_suffix', '.spec.ts')
+            test_suffix = self.file_config(component_file).get('test_file_suffix', '.spec.ts')
         
         # Handle component files specifically
         if component_file.endswith('.component.ts'):
@@ -53,8 +138,12 @@ class AngularTester:
             test_file = component_file + test_suffix
         return test_file
 
-    def extract_imports(self, file_path: str) -> List[str]:
-        """Extract all import statements from a TypeScript file"""
+    def extract_imports(self, file_path: str, local_only: bool = False) -> List[str]:
+        """Extract all import statements from a TypeScript file
+
+        Relative imports are resolved to existing files; with ``local_only``,
+        module imports (e.g. ``@angular/core``) are left out.
+        """
         imports = []
         try:
             with open(file_path, 'r') as f:
@@ -78,7 +167,7 @@ class AngularTester:
                         elif os.path.exists(resolved_path + '/index' + ext):
                             imports.append(resolved_path + '/index' + ext)
                             break
-                else:
+                elif not local_only:
                     # This is a module import, we might need to find it in node_modules
                     # For now, we'll just record it
                     imports.append(match)
@@ -87,8 +176,23 @@ class AngularTester:
         
         return imports
 
-    def collect_related_files(self, component_file: str) -> Dict[str, str]:
-        """Collect all related files (services, interfaces, etc.) for a component"""
+    def _context_limit(self) -> Optional[int]:
+        """Characters of related sources held in memory for one component"""
+        return self.config.get('max_context_chars') if hasattr(self, 'config') else None
+
+    def _take_context(self, component_file: str) -> Dict[str, str]:
+        """Related files already collected for the journal hash, or collected now"""
+        related_files = getattr(self, 'collected_context', {}).pop(component_file, None)
+        if related_files is None:
+            related_files = self.collect_related_files(component_file, self._context_limit())
+        return related_files
+
+    def collect_related_files(self, component_file: str, max_chars: Optional[int] = None) -> Dict[str, str]:
+        """Collect all related files (services, interfaces, etc.) for a component
+
+        With ``max_chars``, no further files are read once their total size
+        reaches the limit.
+        """
         related_files = {}
         
         # Start with the component file itself
@@ -103,33 +207,36 @@ class AngularTester:
         files_to_process = [component_file]
         processed_files = set()
         
-        while files_to_process:
+        total_chars = len(related_files[component_file])
+        while files_to_process and (max_chars is None or total_chars < max_chars):
             current_file = files_to_process.pop()
             if current_file in processed_files:
                 continue
             processed_files.add(current_file)
             
-            imports = self.extract_imports(current_file)
+            # Module imports are skipped; resolved local paths may be relative to the cwd
+            imports = self.extract_imports(current_file, local_only=True)
             for imported_file in imports:
-                # Skip node_modules and absolute module imports
-                if not imported_file.startswith('.') and not os.path.isabs(imported_file):
-                    continue
-                
                 # Only process .ts files
                 if imported_file.endswith('.ts') and os.path.exists(imported_file):
+                    if max_chars is not None and total_chars >= max_chars:
+                        break
                     if imported_file not in related_files:
                         try:
                             with open(imported_file, 'r') as f:
                                 related_files[imported_file] = f.read()
+                            total_chars += len(related_files[imported_file])
                             # Add this file to the processing queue to check its imports
                             files_to_process.append(imported_file)
                         except Exception as e:
                             print(f"Error reading imported file {imported_file}: {str(e)}")
         
+        if max_chars is not None and total_chars >= max_chars:
+            print(f"Context limit reached for {component_file}, using {len(related_files)} files")
         return related_files
 
     def generate_basic_test_content(self, component_file: str) -> str:
-        """Generate basic test content when LLM fails"""
+        """Generate basic test content from the built-in template for the artifact kind"""
         try:
             # Read the component file to extract basic info
             with open(component_file, 'r') as f:
@@ -146,29 +253,16 @@ class AngularTester:
             # Extract the component file name without extension
             file_base_name = os.path.basename(component_file).replace('.ts', '')
             
-            # Generate basic test template
-            basic_test = f"""import {{ ComponentFixture, TestBed }} from '@angular/core/testing';
-import {{ {component_name} }} from './{file_base_name}';
-
-describe('{component_name}', () => {{
-  let component: {component_name};
-  let fixture: ComponentFixture<{component_name}>;
-
-  beforeEach(async () => {{
-    await TestBed.configureTestingModule({{
-      imports: [{component_name}]
-    }})
-    .compileComponents();
-    
-    fixture = TestBed.createComponent({component_name});
-    component = fixture.componentInstance;
-    fixture.detectChanges();
-  }});
-
-  it('should create', () => {{
-    expect(component).toBeTruthy();
-  }});
-}});"""
+            # Pick the built-in template matching the kind of artifact
+            metadata = self.get_metadata(component_file, content)
+            kind = artifact_kind(component_file, metadata)
+            template = get_basic_template(kind)
+            guard = functional_guard(metadata) if kind == 'guard' and not metadata["classes"] else None
+            if guard:
+                component_name = guard["name"]
+                template = FUNCTIONAL_GUARD_TEMPLATE.replace('{{guard_type}}', guard["type"].split('<')[0])
+            
+            basic_test = self._render_template(template, component_name, file_base_name)
             
             return basic_test
         except Exception as e:
@@ -182,11 +276,16 @@ describe('Component', () => {
   });
 });"""
 
-    def generate_test_content(self, component_file: str) -> str:
-        """Generate test content using LLM API"""
+    def generate_test_content(self, component_file: str, feedback: Optional[str] = None) -> str:
+        """Generate test content using LLM API
+
+        ``feedback`` describes problems with a previous attempt (compiler or
+        test failures) and is included in the prompt when regenerating.
+        """
         try:
             # Collect all related files
-            related_files = self.collect_related_files(component_file)
+            with self.profiler.span('context', component_file):
+                related_files = self._take_context(component_file)
             
             # Check for custom template based on component type
             if hasattr(self, 'config_manager'):
@@ -194,31 +293,29 @@ describe('Component', () => {
                 if custom_template:
                     return self._apply_custom_template(custom_template, component_file, related_files)
             
-            # Prepare the prompt with all related content
-            prompt = f"""
-            Generate comprehensive unit tests for the following Angular component.
-            The tests should follow Angular testing best practices and include:
-            1. Component creation test
-            2. Input/output tests if applicable
-            3. Method testing
-            4. DOM interaction tests if applicable
-            5. Service mocking where needed
-            
-            Component file: {component_file}
-            """
-            
-            # Add component content
-            component_content = related_files.get(component_file, "")
-            prompt += f"\nComponent code:\n{component_content}"
+            # Trivial artifacts are fully covered by the built-in templates
+            if self.is_trivial_component(component_file, related_files.get(component_file, "")):
+                print(f"Skipping LLM for trivial artifact {component_file}")
+                with self._lock:
+                    self.llm_calls_avoided = getattr(self, 'llm_calls_avoided', 0) + 1
+                metrics.LLM_CALLS_AVOIDED.inc()
+                return self.generate_basic_test_content(component_file)
             
-            # Add related files content
-            for file_path, content in related_files.items():
-                if file_path != component_file:
-                    prompt += f"\n\nRelated file ({file_path}):\n{content}"
+            route = self.route_request(component_file, related_files.get(component_file, ""))
+            with self.profiler.span('prompt', component_file):
+                examples = self.find_examples(component_file, related_files.get(component_file, ""))
+                prompt = self.build_prompt(component_file, related_files, feedback, release=True,
+                                           examples=examples, coverage=self.coverage_section(component_file))
+            # Only the prompt is kept alive while waiting for the LLM
+            del related_files
             
-            prompt += "\n\nOnly return the test code, nothing else."
+            budget = getattr(self, 'token_budget', None)
+            if budget and not budget.allows(component_file):
+                print(f"Token budget exhausted, not calling the LLM for {component_file}")
+                return ""
             
-            print(f"Calling LLM API at: {self.llm_api_url}")
+            llm_api_url = route.get('llm_api_url') or self.llm_api_url
+            print(f"Calling LLM API at: {llm_api_url}")
             
             # Use config values or defaults
             max_tokens = 2000
@@ -226,9 +323,12 @@ describe('Component', () => {
             timeout = 30
             
             if hasattr(self, 'config'):
-                max_tokens = self.config.get('max_tokens', 2000)
-                temperature = self.config.get('temperature', 0.3)
+                config = self.file_config(component_file)
+                max_tokens = config.get('max_tokens', 2000)
+                temperature = config.get('temperature', 0.3)
                 timeout = self.config.get('llm_timeout', 30)
+            max_tokens = route.get('max_tokens', max_tokens)
+            temperature = route.get('temperature', temperature)
             
             # Call the LLM API - use the exact URL provided without any modifications
             request_data = {
@@ -236,11 +336,16 @@ describe('Component', () => {
                 "max_tokens": max_tokens,
                 "temperature": temperature
             }
+            if route.get('model'):
+                request_data["model"] = route['model']
             
             # Try the direct endpoint first
+            request_started = time.time()
+            span_started = time.perf_counter()
             try:
-                response = requests.post(
-                    self.llm_api_url,
+                # Service mode shares a pooled session between jobs
+                response = (getattr(self, 'http_session', None) or requests).post(
+                    llm_api_url,
                     json=request_data,
                     headers={"Content-Type": "application/json"},
                     timeout=timeout
@@ -248,12 +353,24 @@ describe('Component', () => {
             except requests.exceptions.RequestException as e:
                 print(f"LLM API request failed: {str(e)}")
                 response = None
+            self.profiler.record('llm', span_started, component_file)
+            metrics.LLM_LATENCY.observe(time.perf_counter() - span_started)
+            # requests measures the time until the response headers arrived
+            elapsed = getattr(response, 'elapsed', None)
+            if isinstance(elapsed, datetime.timedelta):
+                self.profiler.record('llm_ttfb', span_started, component_file,
+                                     finished=span_started + elapsed.total_seconds())
+            # Roughly four characters per token when the API does not report usage
+            self._record_stats(component_file, llm_latency=time.time() - request_started,
+                               prompt_tokens=len(prompt) // 4)
             
             response_text = ""
             if response is not None and response.status_code == 200:
                 # Extract the generated test content
+                usage = None
                 try:
                     data = response.json()
+                    usage = data.get('usage') if isinstance(data, dict) else None
                     # Handle different possible response formats
                     if 'choices' in data and len(data['choices']) > 0:
                         choice = data['choices'][0]
@@ -269,16 +386,23 @@ describe('Component', () => {
                 except json.JSONDecodeError:
                     # If response is not JSON, treat as text
                     response_text = response.text.strip()
+                self._spend_tokens(usage, prompt, response_text)
                 
                 # Validate that response looks like code
                 if response_text and (response_text.startswith("import") or 
                                     "describe(" in response_text or 
                                     "it(" in response_text or 
                                     "expect(" in response_text):
+                    metrics.LLM_REQUESTS.inc(outcome="ok")
                     return response_text
                 else:
                     print("LLM response doesn't look like valid test code")
                     response_text = ""
+                    metrics.LLM_REQUESTS.inc(outcome="invalid")
+                    metrics.FALLBACKS.inc(reason="invalid_response")
+            else:
+                metrics.LLM_REQUESTS.inc(outcome="error")
+                metrics.FALLBACKS.inc(reason="llm_error")
             
             if not response_text and response is not None:
                 print(f"LLM API request failed with status {response.status_code}: {response.text}")
@@ -291,21 +415,210 @@ describe('Component', () => {
         except Exception as e:
             print(f"Error generating test content for {component_file}: {str(e)}")
             print("Falling back to basic test generation...")
+            metrics.FALLBACKS.inc(reason="exception")
             return self.generate_basic_test_content(component_file)
     
+    def build_prompt(self, component_file: str, related_files: Dict[str, str],
+                     feedback: Optional[str] = None, release: bool = False,
+                     examples: Optional[List[Tuple[str, str]]] = None, coverage: Optional[str] = None) -> str:
+        """Build the LLM prompt for a component and its related files
+
+        The prompt is written into a single buffer and capped at
+        ``max_prompt_chars``. With ``release``, the contents of related files
+        are removed from ``related_files`` as soon as they are emitted.
+        ``examples`` are (spec file, content) pairs of existing project specs.
+        ``coverage`` describes the existing spec and what it leaves uncovered.
+        """
+        # Closing sections are always sent, so room is kept for them
+        closing = coverage or ""
+        if feedback:
+            closing += f"\n\nA previous version of the tests failed with:\n{feedback}\nFix these problems."
+        closing += "\n\nOnly return the test code, nothing else."
+        
+        max_chars = None
+        cache_friendly = True
+        if hasattr(self, 'config'):
+            max_chars = self.config.get('max_prompt_chars')
+            cache_friendly = self.config.get('cache_friendly_prompt', True)
+        component_content = related_files.get(component_file, "")
+        conventions = self.runner_conventions()
+        if conventions:
+            conventions += "\n\n"
+        
+        if cache_friendly:
+            # Text shared between components comes first so LLM servers can reuse
+            # cached prefixes: fixed instructions, dependencies sorted by path,
+            # then the component itself
+            component_section = f"\n\nComponent file: {component_file}\nComponent code:\n{component_content}"
+            buffer = PromptBuffer(max_chars, reserve=len(component_section) + len(closing))
+            buffer.write(PROMPT_INSTRUCTIONS + conventions)
+            self._write_related_files(buffer, component_file, related_files, sorted(related_files), release)
+            self._write_examples(buffer, examples)
+            buffer.write(component_section)
+        else:
+            buffer = PromptBuffer(max_chars, reserve=len(closing))
+            buffer.write(f"{PROMPT_INSTRUCTIONS}{conventions}Component file: {component_file}\n            ")
+            buffer.write(f"\nComponent code:\n{component_content}")
+            self._write_related_files(buffer, component_file, related_files, list(related_files), release)
+            self._write_examples(buffer, examples)
+        
+        if buffer.omitted:
+            print(f"Prompt size limit reached, omitted {len(buffer.omitted)} related files for {component_file}")
+        buffer.write(closing)
+        return buffer.getvalue()
+
+    def runner_conventions(self) -> str:
+        """Prompt text describing the mocking APIs of the configured test runner"""
+        try:
+            return create_runner(getattr(self, 'config', {}), getattr(self, 'project', None)).conventions
+        except ValueError:
+            return ""
+
+    def coverage_section(self, component_file: str) -> Optional[str]:
+        """Prompt section asking to extend the existing spec to the uncovered code, in coverage-guided runs"""
+        gaps = getattr(self, 'coverage_gaps', {})
+        if component_file not in gaps:
+            return None
+        test_file = self.find_test_file(component_file)
+        try:
+            with open(test_file, 'r') as f:
+                existing = f.read()
+        except OSError:
+            return (f"\n\nThe last coverage report shows these parts of the component are not tested:\n"
+                    f"{describe_gaps(gaps[component_file])}\nMake sure the tests exercise them.")
+        return (f"\n\nExisting test file ({test_file}):\n{existing}"
+                f"\n\nThe last coverage report shows these parts of the component are not tested:\n"
+                f"{describe_gaps(gaps[component_file])}\n"
+                "Return the complete test file: keep every existing test unchanged and add tests "
+                "for the uncovered lines and branches.")
+
+    def _write_related_files(self, buffer: PromptBuffer, component_file: str, related_files: Dict[str, str],
+                             order: List[str], release: bool) -> None:
+        """Add related files to the prompt in ``order``, as summaries unless disabled"""
+        summarize = True
+        if hasattr(self, 'config'):
+            summarize = self.config.get('summarize_dependencies', True)
+        
+        for file_path in order:
+            if file_path == component_file:
+                continue
+            content = related_files[file_path]
+            summary = self.summarize_related_file(file_path, content) if summarize else None
+            if summary:
+                buffer.write_optional(f"\n\nRelated file summary ({file_path}):\n{summary}", file_path)
+            else:
+                buffer.write_optional(f"\n\nRelated file ({file_path}):\n{content}", file_path)
+            # Sources are no longer needed once emitted
+            if release:
+                del related_files[file_path]
+    
+    def _write_examples(self, buffer: PromptBuffer, examples: Optional[List[Tuple[str, str]]]) -> None:
+        """Add existing specs of the project as few-shot examples"""
+        for spec_file, content in examples or []:
+            buffer.write_optional(f"\n\nExample of an existing test in this project ({spec_file}):\n{content}", spec_file)
+
+    def open_example_index(self, directory: str) -> Optional[SpecIndex]:
+        """Load the index of existing specs and bring it up to date with ``directory``"""
+        if not hasattr(self, 'config') or not self.config.get('few_shot_examples', 2):
+            return None
+        index = SpecIndex(os.path.join(self.config.get('cache_dir', '.angular-tester'), 'spec-index.json'))
+        index.load()
+        if index.update(self.find_spec_files(directory)):
+            index.save()
+        self.example_index = index
+        return index
+
+    def find_spec_files(self, directory: str) -> List[str]:
+        """Find existing spec files, skipping node_modules"""
+        test_suffix = self.config.get('test_file_suffix', '.spec.ts') if hasattr(self, 'config') else '.spec.ts'
+        spec_files = []
+        for root, dirs, files in os.walk(directory):
+            dirs[:] = [name for name in dirs if name != 'node_modules']
+            for file in files:
+                if file.endswith(test_suffix):
+                    spec_files.append(os.path.join(root, file))
+        return spec_files
+
+    def find_examples(self, component_file: str, content: str) -> List[Tuple[str, str]]:
+        """The existing specs most similar to a component, within the example token budget"""
+        index = getattr(self, 'example_index', None)
+        if index is None:
+            return []
+        matches = index.search(content, self.config.get('few_shot_examples', 2),
+                               exclude=[self.find_test_file(component_file)])
+        return select_examples(matches, self.config.get('few_shot_token_budget', 1500))
+
+    def get_metadata(self, file_path: str, content: Optional[str] = None) -> Dict:
+        """Extract (cached) Angular metadata for a file"""
+        if not hasattr(self, 'metadata_extractor'):
+            self.metadata_extractor = MetadataExtractor()
+        return self.metadata_extractor.extract_file(file_path, content)
+    
+    def summarize_related_file(self, file_path: str, content: str) -> Optional[str]:
+        """Summarize a dependency's Angular metadata, or None if nothing useful was found"""
+        try:
+            metadata = self.get_metadata(file_path, content)
+        except Exception as e:
+            print(f"Error extracting metadata from {file_path}: {str(e)}")
+            return None
+        if not metadata["classes"] and not metadata["types"] and not metadata["functions"]:
+            return None
+        return self.metadata_extractor.summarize(metadata)
+    
+    def is_trivial_component(self, component_file: str, content: str) -> bool:
+        """Whether the component can skip the LLM and use a built-in template"""
+        if hasattr(self, 'config') and not self.config.get('skip_llm_for_trivial', True):
+            return False
+        try:
+            return is_trivial(self.get_metadata(component_file, content))
+        except Exception as e:
+            print(f"Error classifying {component_file}: {str(e)}")
+            return False
+    
+    def _spend_tokens(self, usage: Optional[Dict], prompt: str, completion: str) -> None:
+        """Count a completed LLM request's tokens and charge them to the token budget.
+
+        Without reported usage, tokens are estimated at four characters each.
+        """
+        if isinstance(usage, dict):
+            prompt_tokens = usage.get('prompt_tokens', 0)
+            completion_tokens = usage.get('completion_tokens', 0)
+        else:
+            prompt_tokens, completion_tokens = len(prompt) // 4, len(completion) // 4
+        metrics.TOKENS.inc(prompt_tokens, kind="prompt")
+        metrics.TOKENS.inc(completion_tokens, kind="completion")
+        budget = getattr(self, 'token_budget', None)
+        if budget is not None:
+            budget.spend(prompt_tokens + completion_tokens)
+    
+    def route_request(self, component_file: str, content: str) -> Dict:
+        """LLM endpoint, model and token budget chosen by the configured routing rules"""
+        if not hasattr(self, 'config_manager') or not self.file_config(component_file).get('routing_rules'):
+            return {}
+        try:
+            measures = complexity(self.get_metadata(component_file, content), content)
+        except Exception as e:
+            print(f"Error measuring {component_file}: {str(e)}")
+            return {}
+        route = self.config_manager.route(measures, self.file_config(component_file))
+        print(f"Routing {component_file} ({measures['loc']} lines, {measures['methods']} methods): "
+              f"max_tokens={route['max_tokens']}" + (f", model={route['model']}" if route['model'] else ""))
+        return route
+    
     def _get_custom_template(self, component_file: str, related_files: Dict[str, str]) -> Optional[str]:
         """Get custom template for component if available"""
         # Check for component-specific custom template
         component_name = self._extract_component_name(component_file)
         if hasattr(self, 'config_manager'):
-            custom_template = self.config_manager.get_custom_template(component_name)
+            templates = self.file_config(component_file).get('custom_templates') or {}
+            custom_template = templates.get(component_name)
             if custom_template:
                 return custom_template
             
             # Check for service template if component uses services
             for file_path, content in related_files.items():
                 if file_path.endswith('.service.ts'):
-                    custom_template = self.config_manager.get_custom_template('service')
+                    custom_template = templates.get('service')
                     if custom_template:
                         return custom_template
         
@@ -316,15 +629,29 @@ describe('Component', () => {
         component_name = self._extract_component_name(component_file)
         file_base_name = os.path.basename(component_file).replace('.ts', '')
         
-        # Replace template variables
-        test_content = template.replace('{{component_name}}', component_name)
-        test_content = test_content.replace('{{file_name}}', file_base_name)
-        
-        # Add imports section
+        return self._render_template(template, component_name, file_base_name,
+                                     self.template_context(component_file, related_files))
+    
+    def template_context(self, component_file: str, related_files: Dict[str, str]) -> Dict:
+        """Inputs, outputs, injected services and public methods of a component, for templates"""
+        content = related_files.get(component_file)
+        if content is None:
+            with open(component_file, 'r') as f:
+                content = f.read()
+        related_classes = {}
+        for file_path, related_content in related_files.items():
+            if file_path != component_file and file_path.endswith('.ts'):
+                for cls in self.get_metadata(file_path, related_content)["classes"]:
+                    related_classes.setdefault(cls["name"], cls)
+        return build_context(self.get_metadata(component_file, content), content, related_classes)
+    
+    def _render_template(self, template: str, component_name: str, file_base_name: str,
+                         context: Optional[Dict] = None) -> str:
+        """Render a (compiled and cached) template with the standard variables and ``context``"""
         imports_section = f"import {{ {component_name} }} from './{file_base_name}';"
-        test_content = test_content.replace('{{imports}}', imports_section)
-        
-        return test_content
+        variables = dict(context or {}, component_name=component_name, file_name=file_base_name,
+                         imports=imports_section)
+        return render_template(template, variables)
     
     def _extract_component_name(self, component_file: str) -> str:
         """Extract component name from component file"""
@@ -353,16 +680,18 @@ describe('Component', () => {
         # Convert to PascalCase
         return ''.join(word.capitalize() for word in base_name.split('-'))
 
-    def create_or_update_test(self, component_file: str) -> bool:
+    def create_or_update_test(self, component_file: str, feedback: Optional[str] = None) -> bool:
         """Create or update a test file for a component"""
         test_file = self.find_test_file(component_file)
         
         # Generate test content
-        test_content = self.generate_test_content(component_file)
+        test_content = self.generate_test_content(component_file, feedback)
         
         if not test_content:
             print(f"Failed to generate test content for {component_file}")
             return False
+        self._journal_record(component_file, 'generated')
+        validation_started = time.perf_counter()
         
         # Validate that the content looks like valid test code
         # Check if it contains typical test framework elements
@@ -374,16 +703,27 @@ describe('Component', () => {
             else:
                 print(f"Generated content doesn't look like valid test code, generating basic test")
                 test_content = self.generate_basic_test_content(component_file)
+            metrics.FALLBACKS.inc(reason="invalid_content")
         
         # Clean up the test content to remove any stray characters at the beginning
         # that might be artifacts from the LLM response
         test_content = test_content.lstrip()
         if test_content.startswith("*/"):
             test_content = test_content[2:].lstrip()
+        self.profiler.record('validation', validation_started, component_file)
+        
+        # Coverage-guided runs extend existing specs and must not lose their tests
+        if component_file in getattr(self, 'coverage_gaps', {}) and os.path.exists(test_file):
+            with open(test_file, 'r') as f:
+                existing_tests = len(TEST_CASE_PATTERN.findall(f.read()))
+            if len(TEST_CASE_PATTERN.findall(test_content)) < existing_tests:
+                print(f"Generated spec for {component_file} drops existing tests, keeping {test_file}")
+                metrics.FALLBACKS.inc(reason="dropped_tests")
+                return False
         
         # Write the test file
         try:
-            with open(test_file, 'w') as f:
+            with self.profiler.span('write', component_file), open(test_file, 'w') as f:
                 f.write(test_content)
             print(f"Created/updated test file: {test_file}")
             return True
@@ -393,43 +733,75 @@ describe('Component', () => {
 
     def ensure_chrome_installed(self) -> bool:
         """Ensure Chrome/Chromium is installed for headless testing"""
-        browsers = ['google-chrome', 'chromium', 'chromium-browser', 'google-chrome-stable']
-        for browser in browsers:
-            try:
-                subprocess.run([browser, '--version'], 
-                             stdout=subprocess.DEVNULL, 
-                             stderr=subprocess.DEVNULL)
-                return True
-            except FileNotFoundError:
-                continue
+        cache_dir = None
+        search_dirs = []
+        if hasattr(self, 'config'):
+            cache_dir = self.config.get('cache_dir', '.angular-tester')
+            search_dirs = self.config.get('browser_dirs', [])
+        environment = probe_environment(cache_dir, search_dirs)
+        # Passed to Karma as CHROME_BIN, which also covers browsers it would not find itself
+        self.browser = environment["browser"]
+        if environment["browser"]:
+            if not environment["cached"]:
+                print(f"Using browser {environment['browser']} (node {environment['node'] or 'not found'}, "
+                      f"Angular CLI {environment['ng'] or 'not found'})")
+            return True
         
         print("Chrome/Chromium not found. Please install a Chromium-based browser.")
         print("On Ubuntu/Debian: sudo apt install chromium-browser")
         print("On CentOS/RHEL/Fedora: sudo yum install chromium")
         return False
 
-    def run_tests(self) -> bool:
-        """Run Angular tests and check coverage"""
+    def run_tests(self, spec_files: Optional[List[str]] = None, code_coverage: bool = True) -> bool:
+        """Run Angular tests and check coverage
+
+        ``spec_files`` restricts the run to the given specs. When per-spec
+        results are enabled they are stored in ``self.spec_results``.
+        """
+        config = getattr(self, 'config', {})
+        project = getattr(self, 'project', None)
+        try:
+            runner = create_runner(config, project)
+        except ValueError as e:
+            print(str(e))
+            return False
+        
         # Ensure Chrome is installed
-        if not self.ensure_chrome_installed():
+        if runner.needs_browser and not self.ensure_chrome_installed():
             return False
+        
+        self.spec_results = None
+        command, results_file = self.test_command(runner, spec_files or [], code_coverage)
+        if results_file and os.path.exists(results_file):
+            os.remove(results_file)
             
         try:
             # Run tests with coverage using specific parameters to ensure consistency
-            result = subprocess.run(
-                ['ng', 'test', '--browsers=ChromeHeadless', '--watch=false', '--code-coverage'],
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minutes timeout
-            )
+            test_started = time.perf_counter()
+            with self.profiler.span('test', specs=len(spec_files or [])):
+                result = subprocess.run(
+                    command,
+                    capture_output=True,
+                    text=True,
+                    timeout=300,  # 5 minutes timeout
+                    env=build_environment(getattr(self, 'browser', None))
+                )
+            metrics.TEST_RUN_SECONDS.observe(time.perf_counter() - test_started, coverage=str(code_coverage).lower())
             
             print("Test output:")
             print(result.stdout)
+            self.last_test_output = result.stdout
             
             if result.stderr:
                 print("Test errors:")
                 print(result.stderr)
             
+            if results_file:
+                self.spec_results = runner.load_results(results_file)
+                if self.spec_results is not None:
+                    self.print_spec_summary(self.spec_results)
+                    self._record_spec_runtimes(self.spec_results)
+            
             # Check if tests passed
             return result.returncode == 0
             
@@ -437,36 +809,118 @@ describe('Component', () => {
             print("Tests timed out after 5 minutes")
             return False
         except FileNotFoundError:
-            print("Angular CLI not found. Please ensure it's installed and in PATH.")
+            print(f"{command[0]} not found. Please ensure the Angular CLI and Node.js are installed and in PATH.")
             return False
         except Exception as e:
             print(f"Error running tests: {str(e)}")
             return False
 
+    def test_command(self, runner, spec_files: List[str], code_coverage: bool) -> Tuple[List[str], Optional[str]]:
+        """Command running ``spec_files`` (all specs if empty) and the per-spec results file it writes, if any"""
+        config = getattr(self, 'config', {})
+        cache_dir = config.get('cache_dir', '.angular-tester')
+        results_file = None
+        if config and config.get('per_spec_results', True):
+            results_file = os.path.join(cache_dir, f'{runner.name}-results.json')
+        return runner.command(spec_files, code_coverage, results_file, cache_dir, getattr(self, 'project', None)), results_file
+
+    def print_spec_summary(self, results: List[Dict]) -> None:
+        """Print pass/fail counts and duration per spec file"""
+        grouped = group_results_by_spec(results, list(getattr(self, 'written_specs', {})))
+        for spec_file, summary in sorted(grouped.items(), key=lambda item: item[0] or ''):
+            status = "FAIL" if summary["failed"] else "PASS"
+            name = spec_file or "(other specs)"
+            print(f"{status} {name}: {summary['passed']} passed, {summary['failed']} failed, "
+                  f"{summary['skipped']} skipped ({summary['duration'] / 1000:.2f}s)")
+            for message in summary["failures"]:
+                print(f"    {message}")
+
+    def _record_spec_runtimes(self, results: List[Dict]) -> None:
+        """Attribute spec durations and failures to the generated components"""
+        written_specs = getattr(self, 'written_specs', {})
+        for spec_file, summary in group_results_by_spec(results, list(written_specs)).items():
+            if spec_file is None:
+                continue
+            values = {"spec_runtime": summary["duration"] / 1000}
+            if summary["failed"]:
+                values["failed"] = True
+            self._record_stats(written_specs[spec_file], **values)
+
+    def retry_failing_specs(self) -> bool:
+        """Regenerate failing generated specs and re-run only those files
+
+        Failure messages from the last run are added to the prompt. Returns
+        True once the re-run specs pass within the ``spec_retry_budget``.
+        """
+        results = getattr(self, 'spec_results', None)
+        written_specs = getattr(self, 'written_specs', {})
+        if not results or not written_specs or not hasattr(self, 'config'):
+            return False
+        
+        # Rewritten specs are journaled after this run's generation records
+        journal = self.open_journal(resume=True)
+        try:
+            for attempt in range(self.config.get('spec_retry_budget', 2)):
+                grouped = group_results_by_spec(results, list(written_specs))
+                failing = {spec: summary for spec, summary in grouped.items() if summary["failed"]}
+                if not failing or None in failing:
+                    # Failures in specs we did not generate cannot be fixed by regenerating
+                    return False
+                
+                print(f"Regenerating {len(failing)} failing specs (attempt {attempt + 1})...")
+                for spec_file, summary in failing.items():
+                    metrics.RETRIES.inc(cause="spec_failure")
+                    self._regenerate_spec(written_specs[spec_file], '\n'.join(summary["failures"]))
+                
+                # Coverage from the full run is kept; re-runs only check the fixed specs
+                if self.run_tests(list(failing), code_coverage=False):
+                    return True
+                results = self.spec_results
+                if not results:
+                    return False
+            return False
+        finally:
+            if journal:
+                journal.close()
+                self.journal = None
+
+    def _coverage_dir(self) -> Optional[str]:
+        """Directory of the JSON coverage reports of this run's project"""
+        project = getattr(self, 'project', None)
+        if project is None:
+            return find_coverage_dir('coverage')
+        # Angular CLI writes to coverage/<name>, Nx to coverage/<project root>
+        for candidate in (project['name'], project['root']):
+            if candidate:
+                coverage_dir = find_coverage_dir(os.path.join('coverage', candidate))
+                if coverage_dir:
+                    return coverage_dir
+        return None
+
     def get_coverage_report(self) -> Optional[float]:
         """Parse coverage report to get overall coverage percentage"""
+        metric = 'lines'
+        if hasattr(self, 'config'):
+            metric = self.config.get('coverage_metric', 'lines')
         try:
-            # Look for coverage report directory
-            coverage_dirs = [
-                'coverage',
-                'coverage/example-angular-app'
-            ]
-            
-            coverage_found = False
-            for coverage_dir in coverage_dirs:
-                if os.path.exists(coverage_dir):
-                    coverage_found = True
-                    break
-            
-            if not coverage_found:
-                print("Coverage report directory not found")
-                return None
-                
-            # For now, we'll parse the stdout from the test run to get coverage
-            # In a real implementation, we would parse the actual coverage files
-            # Since we saw 100% coverage in the test output, we'll return that
-            print("Note: Using coverage from test output (100%)")
-            return 100.0
+            # Look for the JSON reports written by the coverage reporter
+            coverage_dir = self._coverage_dir()
+            if coverage_dir:
+                summary = load_coverage_summary(coverage_dir)
+                if summary is None:
+                    final = load_coverage_final(coverage_dir)
+                    summary = summarize_coverage_final(final) if final else None
+                if summary is not None:
+                    return coverage_percentage(summary, metric)
+            
+            # Fall back to the text summary printed by the test run
+            coverage = parse_text_summary(getattr(self, 'last_test_output', ''), metric)
+            if coverage is not None:
+                print("Note: Using coverage from test output")
+                return coverage
+            
+            print("Coverage report not found")
+            return None
             
         except Exception as e:
             print(f"Error reading coverage report: {str(e)}")
@@ -474,12 +928,14 @@ describe('Component', () => {
 
     def check_coverage(self) -> bool:
         """Check if coverage meets threshold"""
-        coverage = self.get_coverage_report()
+        with self.profiler.span('coverage'):
+            coverage = self.get_coverage_report()
         if coverage is None:
             print("Could not determine coverage percentage")
             return False
             
         print(f"Coverage: {coverage}%")
+        self.last_coverage = coverage
         if coverage >= self.coverage_threshold:
             print(f"Coverage meets threshold of {self.coverage_threshold}%")
             return True
@@ -489,7 +945,8 @@ describe('Component', () => {
 
     def process_components(self, directory: str) -> bool:
         """Process all components in a directory"""
-        component_files = self.find_component_files(directory)
+        with self.profiler.span('scan'):
+            component_files = self.find_component_files(directory)
         
         if not component_files:
             print(f"No component files found in {directory}")
@@ -497,30 +954,401 @@ describe('Component', () => {
             
         print(f"Found {len(component_files)} component files")
         
+        # Spend LLM calls only where they can raise the coverage number
+        if hasattr(self, 'config') and self.config.get('coverage_guided', False):
+            component_files = self.select_uncovered(component_files)
+            if not component_files:
+                print(f"All components meet the coverage threshold of {self.coverage_threshold}%")
+                self.processed_components = []
+                return True
+        
+        # Only keep this CI shard's part of the work
+        shard = getattr(self, 'shard', None)
+        if shard:
+            self.sharded_components = component_files
+            component_files = select_shard(component_files, directory, shard, self.load_cost_weights())
+            print(f"Shard {shard[0]}/{shard[1]}: processing {len(component_files)} component files")
+        self.processed_components = component_files
+        
+        # Best coverage gain per token first, within the run's token budget
+        token_budget = self.config.get('token_budget') if hasattr(self, 'config') else None
+        if token_budget:
+            component_files = self.plan_token_budget(component_files, directory, token_budget)
+        
+        # Index the specs that exist before this run as few-shot examples
+        with self.profiler.span('index'):
+            self.open_example_index(directory)
+        
         # Generate/update tests for all components
-        success = True
-        for component_file in component_files:
-            print(f"Processing {component_file}...")
-            if not self.create_or_update_test(component_file):
-                success = False
+        self.llm_calls_avoided = 0
+        self.written_specs = written_specs = {}
+        if not token_budget:
+            self.token_budget = None
+        journal = self.open_journal()
+        try:
+            success = self._process_all(component_files, directory)
+            
+            if self.llm_calls_avoided:
+                print(f"Avoided {self.llm_calls_avoided} LLM calls for trivial components")
+            
+            if self.token_budget:
+                self.report_token_budget()
+            
+            # Catch specs that do not compile before the expensive browser run
+            if hasattr(self, 'config') and self.config.get('typecheck_specs', True):
+                self.preflight_typecheck(written_specs)
+        finally:
+            if journal:
+                journal.close()
+                self.journal = None
                 
         return success
 
+    def select_uncovered(self, component_files: List[str]) -> List[str]:
+        """Components below the coverage threshold in the last coverage report.
+
+        Their uncovered lines and branches are kept in ``coverage_gaps`` for
+        the prompt. Without a report every component is selected.
+        """
+        self.coverage_gaps = {}
+        coverage_dir = self._coverage_dir()
+        final = load_coverage_final(coverage_dir) if coverage_dir else None
+        if not final:
+            print("No coverage report found, processing all components")
+            return component_files
+        
+        metric = self.config.get('coverage_metric', 'lines') if hasattr(self, 'config') else 'lines'
+        selected = []
+        for component_file in component_files:
+            file_coverage = find_file_coverage(final, component_file)
+            gaps = coverage_gaps(file_coverage, metric) if file_coverage else None
+            if gaps is not None and gaps["pct"] >= self.coverage_threshold:
+                continue
+            self.coverage_gaps[component_file] = gaps
+            selected.append(component_file)
+        print(f"Coverage-guided: {len(selected)} of {len(component_files)} components are "
+              f"below {self.coverage_threshold}% {metric} coverage")
+        return selected
+
+    def _process_all(self, component_files: List[str], directory: str) -> bool:
+        """Generate the specs of ``component_files``, in parallel if configured"""
+        concurrency = self.config.get('llm_concurrency', 1) if hasattr(self, 'config') else 1
+        if getattr(self, 'token_budget', None):
+            # Already ranked by coverage gain per token
+            pass
+        elif hasattr(self, 'config') and self.config.get('group_by_dependencies', False):
+            # Components sharing dependencies are sent back to back, while their
+            # common prompt prefix is still in the LLM server's cache
+            component_files = self.group_by_dependencies(component_files)
+        elif concurrency > 1:
+            # Longest expected work is submitted first so it does not stretch the tail
+            component_files = self.schedule_components(component_files, directory)
+        
+        if concurrency > 1:
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                results = list(pool.map(self._process_component, component_files))
+        else:
+            results = [self._process_component(component_file) for component_file in component_files]
+        return all(results)
+
+    def _process_component(self, component_file: str) -> bool:
+        """Generate the spec of one component if its estimated tokens fit in the budget"""
+        budget = getattr(self, 'token_budget', None)
+        if budget:
+            if not budget.reserve(component_file, self.budget_estimates[component_file]["cost"]):
+                print(f"Skipping {component_file} (token budget)")
+                metrics.COMPONENTS.inc(result="skipped")
+                return True
+            try:
+                return self._generate_component(component_file)
+            finally:
+                budget.release(component_file)
+        return self._generate_component(component_file)
+
+    def _generate_component(self, component_file: str) -> bool:
+        """Generate and write the spec of one component, recording its progress"""
+        test_file = self.find_test_file(component_file)
+        journal = getattr(self, 'journal', None)
+        if journal:
+            # Hash the context generation will use, and hand it over instead of reading it twice
+            related_files = self.collect_related_files(component_file, self._context_limit())
+            input_hash = content_hash(related_files.items())
+            if getattr(self, 'resume', False) and journal.is_complete(component_file, input_hash, test_file):
+                print(f"Skipping {component_file} (unchanged since the interrupted run)")
+                self.written_specs[test_file] = component_file
+                metrics.CACHE_REQUESTS.inc(cache="journal", result="hit")
+                metrics.COMPONENTS.inc(result="skipped")
+                return True
+            journal.record(component_file, 'pending', input_hash=input_hash)
+            with self._lock:
+                if getattr(self, 'collected_context', None) is None:
+                    self.collected_context = {}
+            self.collected_context[component_file] = related_files
+            del related_files
+        
+        print(f"Processing {component_file}...")
+        started = time.time()
+        try:
+            created = self.create_or_update_test(component_file)
+        finally:
+            # Left over when create_or_update_test did not reach generation
+            getattr(self, 'collected_context', {}).pop(component_file, None)
+        if created:
+            self.written_specs[test_file] = component_file
+            duration = time.time() - started
+            self._journal_record(component_file, 'written', spec_hash=file_hash(test_file), duration=duration)
+            self._record_stats(component_file, duration=duration)
+            metrics.COMPONENTS.inc(result="written")
+            return True
+        duration = time.time() - started
+        self._journal_record(component_file, 'failed', duration=duration)
+        self._record_stats(component_file, duration=duration, failed=True)
+        metrics.COMPONENTS.inc(result="failed")
+        return False
+
+    def estimate_component(self, component_file: str, final: Optional[Dict]) -> Dict[str, float]:
+        """Estimated LLM tokens and uncovered statements (coverage gain) of a component"""
+        related_files = self.collect_related_files(component_file, self._context_limit())
+        content = related_files.get(component_file, "")
+        
+        file_coverage = find_file_coverage(final, component_file) if final else None
+        if file_coverage:
+            gain = coverage_gaps(file_coverage)["uncovered_statements"]
+        else:
+            # Untested: every line of the file is a potential gain
+            gain = sum(1 for line in content.splitlines() if line.strip())
+        
+        if self.is_trivial_component(component_file, content):
+            return {"gain": gain, "cost": 0}
+        max_prompt_chars = self.config.get('max_prompt_chars') if hasattr(self, 'config') else None
+        prompt_chars = sum(len(text) for text in related_files.values())
+        if max_prompt_chars:
+            prompt_chars = min(prompt_chars, max_prompt_chars)
+        config = self.file_config(component_file)
+        max_tokens = config.get('max_tokens', 2000)
+        # Routing rules may give small components a shorter completion budget
+        if hasattr(self, 'config_manager') and config.get('routing_rules'):
+            measures = complexity(self.get_metadata(component_file, content), content)
+            max_tokens = self.config_manager.route(measures, config)["max_tokens"]
+        return {"gain": gain, "cost": prompt_chars // 4 + max_tokens}
+
+    def plan_token_budget(self, component_files: List[str], directory: str, limit: int) -> List[str]:
+        """Rank components by coverage gain per token and open the run's token budget"""
+        coverage_dir = self._coverage_dir()
+        final = load_coverage_final(coverage_dir) if coverage_dir else None
+        self.budget_estimates = {component_file: self.estimate_component(component_file, final)
+                                 for component_file in component_files}
+        self.token_budget = TokenBudget(limit)
+        ranked = rank_by_gain(self.budget_estimates)
+        estimated = sum(estimate["cost"] for estimate in self.budget_estimates.values())
+        print(f"Token budget: {limit} tokens for an estimated {estimated} tokens of work")
+        return ranked
+
+    def report_token_budget(self) -> None:
+        """Print the tokens spent and the components skipped for lack of budget"""
+        budget = self.token_budget
+        print(f"Token budget: spent {budget.spent} of {budget.limit} tokens")
+        if not budget.skipped:
+            return
+        print(f"Skipped {len(budget.skipped)} components (estimated tokens, uncovered statements):")
+        for component_file in budget.skipped:
+            estimate = self.budget_estimates[component_file]
+            print(f"  {component_file}: {estimate['cost']} tokens, {estimate['gain']} statements")
+
+    def group_by_dependencies(self, component_files: List[str]) -> List[str]:
+        """Order components so that those with the same sorted dependencies are adjacent"""
+        def dependencies(component_file: str) -> Tuple[str, ...]:
+            related = self.collect_related_files(component_file, self._context_limit())
+            return tuple(sorted(path for path in related if path != component_file))
+        keys = {component_file: dependencies(component_file) for component_file in component_files}
+        return sorted(component_files, key=lambda component_file: (keys[component_file], component_file))
+
+    def schedule_components(self, component_files: List[str], directory: str) -> List[str]:
+        """Order components longest expected work first (LPT) using the timing history"""
+        costs = self.load_cost_weights()
+        if not costs:
+            return component_files
+        known = sorted(costs.values())
+        default_cost = known[len(known) // 2]
+        return sorted(
+            component_files,
+            key=lambda component_file: -costs.get(os.path.relpath(component_file, directory), default_cost)
+        )
+
+    def open_journal(self, resume: Optional[bool] = None) -> Optional[WorkJournal]:
+        """Open the work journal for this run (replaying and appending to it when resuming)
+
+        ``resume`` defaults to whether this run resumes an interrupted one.
+        """
+        if not hasattr(self, 'config') or not self.config.get('journal', True):
+            return None
+        path = os.path.join(self.config.get('cache_dir', '.angular-tester'), 'journal.jsonl')
+        self.journal = WorkJournal(path)
+        self.journal.open(resume=getattr(self, 'resume', False) if resume is None else resume)
+        return self.journal
+
+    def open_history(self) -> Optional[HistoryStore]:
+        """Open the timing history database, if enabled"""
+        if getattr(self, 'history', None) is not None:
+            return self.history
+        if not hasattr(self, 'config') or not self.config.get('history', True):
+            return None
+        try:
+            self.history = HistoryStore(os.path.join(self.config.get('cache_dir', '.angular-tester'), 'history.sqlite'))
+        except Exception as e:
+            print(f"Could not open timing history: {str(e)}")
+            self.history = None
+        return self.history
+
+    def load_cost_weights(self) -> Dict[str, float]:
+        """Expected cost per component from the timing history, keyed by path relative to the run directory"""
+        history = self.open_history()
+        return history.expected_costs() if history else {}
+
+    def _record_stats(self, component_file: str, **values) -> None:
+        """Accumulate measurements for a component during this run"""
+        stats = getattr(self, 'component_stats', None)
+        if stats is None:
+            return
+        with self._lock:
+            stats.setdefault(component_file, {}).update(values)
+
+    def save_history(self, directory: str) -> None:
+        """Fold this run's measurements into the timing history"""
+        stats = getattr(self, 'component_stats', None)
+        if not stats:
+            return
+        history = self.open_history()
+        if history is None:
+            return
+        relative_stats = {os.path.relpath(component_file, directory): values for component_file, values in stats.items()}
+        history.record_many(relative_stats)
+        history.record_run(self.run_started, relative_stats)
+
+    def _regenerate_spec(self, component_file: str, feedback: str) -> bool:
+        """Rewrite a component's spec with feedback, keeping the journal's spec hash current"""
+        if not self.create_or_update_test(component_file, feedback=feedback):
+            return False
+        self._journal_record(component_file, 'written', spec_hash=file_hash(self.find_test_file(component_file)))
+        return True
+
+    def _journal_record(self, component_file: str, state: str, **fields) -> None:
+        """Record a component state change if a journal is open"""
+        journal = getattr(self, 'journal', None)
+        if journal:
+            journal.record(component_file, state, **fields)
+
+    def preflight_typecheck(self, written_specs: Dict[str, str]) -> int:
+        """Type-check newly written specs, regenerating or replacing broken ones
+
+        ``written_specs`` maps spec files to their component files. Returns the
+        number of specs that had to be replaced by the basic template.
+        """
+        checker = SpecTypeChecker(
+            tsconfig=self.config.get('tsconfig_spec', 'tsconfig.spec.json'),
+            cache_dir=self.config.get('cache_dir', '.angular-tester')
+        )
+        print(f"Type-checking {len(written_specs)} generated spec files...")
+        errors = checker.check(list(written_specs))
+        if errors is None:
+            print("Skipping pre-flight type check")
+            return 0
+        
+        # Give the LLM a chance to fix compile errors first
+        retries = self.config.get('typecheck_retries', 1)
+        while errors and retries > 0:
+            retries -= 1
+            for spec_file, messages in errors.items():
+                print(f"Spec {spec_file} does not compile, regenerating...")
+                metrics.RETRIES.inc(cause="typecheck")
+                self._regenerate_spec(written_specs[spec_file], '\n'.join(messages))
+            errors = checker.check(list(errors)) or {}
+        
+        # Anything still broken falls back to the basic template
+        for spec_file in errors:
+            print(f"Spec {spec_file} still does not compile, using basic test instead")
+            metrics.FALLBACKS.inc(reason="typecheck")
+            try:
+                with open(spec_file, 'w') as f:
+                    f.write(self.generate_basic_test_content(written_specs[spec_file]))
+                self._journal_record(written_specs[spec_file], 'written', spec_hash=file_hash(spec_file))
+            except Exception as e:
+                print(f"Error writing test file {spec_file}: {str(e)}")
+        return len(errors)
+
+    def start_build_warmup(self) -> Optional[BuildWarmer]:
+        """Start warming the Angular test build cache, if enabled"""
+        if not hasattr(self, 'config') or not self.config.get('warmup_build', True):
+            return None
+        try:
+            runner = create_runner(self.config, getattr(self, 'project', None))
+        except ValueError:
+            return None
+        if runner.name != 'karma':
+            # Only the Karma builder has a separate build step worth warming
+            return None
+        # Same arguments as the full run (coverage instrumentation, Karma wrapper) so its build is what gets cached
+        command, _ = self.test_command(runner, [], True)
+        # Karma needs the same browser as the real run, e.g. a Puppeteer download
+        if not self.ensure_chrome_installed():
+            return None
+        warmer = BuildWarmer(command, chrome_bin=getattr(self, 'browser', None))
+        if not warmer.start():
+            return None
+        print("Started Angular test build warm-up in the background")
+        return warmer
+
     def run(self, directory: str = './src') -> bool:
         """Main method to run the tester"""
         print(f"Angular Tester started with coverage threshold: {self.coverage_threshold}%")
         print(f"Processing components in: {directory}")
         
+        self.run_status = {"processed": False, "tests_passed": False}
+        self.run_started = time.time()
+        self.component_stats = {}
+        try:
+            return self._run(directory)
+        finally:
+            if getattr(self, 'shard', None):
+                self.save_shard_results(directory)
+            self.save_history(directory)
+            self.write_metrics()
+
+    def _run(self, directory: str) -> bool:
+        """Generate specs, run the tests and check coverage"""
+        # Compile the test build in the background while waiting on the LLM
+        warmer = self.start_build_warmup()
+        
         # Process components and generate tests
         if not self.process_components(directory):
+            if warmer:
+                warmer.cancel()
             print("Failed to process components")
             return False
+        
+        self.run_status["processed"] = True
+        
+        if warmer:
+            print("Waiting for build warm-up to finish...")
+            warmer.wait(self.config.get('warmup_timeout', 300))
             
-        # Run tests
-        print("Running tests...")
-        if not self.run_tests():
+        # Run tests (a shard only runs the specs of its own components)
+        if getattr(self, 'shard', None):
+            spec_files = self.shard_spec_files()
+            print(f"Running the {len(spec_files)} specs of this shard...")
+            passed = not spec_files or self.run_tests(spec_files) or self.retry_failing_specs()
+        else:
+            print("Running tests...")
+            passed = self.run_tests() or self.retry_failing_specs()
+        if not passed:
             print("Tests failed")
             return False
+        self.run_status["tests_passed"] = True
+        
+        # A single shard only sees part of the specs; coverage is gated after merging
+        if getattr(self, 'shard', None):
+            print("Coverage check deferred to --merge-shards")
+            return True
             
         # Check coverage
         print("Checking coverage...")
@@ -532,13 +1360,245 @@ describe('Component', () => {
         return True
 
 
+    def run_workspace(self, root: str = '.') -> bool:
+        """Run the generate/test/coverage pipeline of every workspace project, in parallel"""
+        projects = select_projects(discover_projects(root), self.config.get('projects') or None)
+        if not projects:
+            print("No projects with a test target found in angular.json or project.json files")
+            return False
+        workers = max(1, self.config.get('project_workers', 2))
+        print(f"Found {len(projects)} projects, running {min(workers, len(projects))} at a time")
+        
+        self.run_started = time.time()
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                reports = list(pool.map(self.run_project, projects))
+        finally:
+            self.write_metrics()
+        
+        print(format_report(reports))
+        report_file = os.path.join(self.config.get('cache_dir', '.angular-tester'), 'workspace-report.json')
+        os.makedirs(os.path.dirname(report_file), exist_ok=True)
+        with open(report_file, 'w') as f:
+            json.dump({"projects": reports, "duration": round(time.time() - self.run_started, 2)}, f, indent=2)
+        print(f"Workspace report written to {report_file}")
+        return all(report["passed"] for report in reports)
+
+    def project_config(self, project: Dict) -> Dict:
+        """Configuration of one project: its own state directory, Karma config and spec tsconfig"""
+        config = dict(self.config)
+        state_name = re.sub(r'[^\w.-]+', '_', project['name']).strip('_')
+        config['cache_dir'] = os.path.join(self.config.get('cache_dir', '.angular-tester'), 'projects', state_name)
+        options = (project['test'] or {}).get('options') or {}
+        if options.get('karmaConfig'):
+            config['karma_config'] = options['karmaConfig']
+        if options.get('tsConfig'):
+            config['tsconfig_spec'] = options['tsConfig']
+        return config
+
+    def run_project(self, project: Dict) -> Dict:
+        """Generate, test and check the coverage of one workspace project in its own session"""
+        name = project['name']
+        session = self.session()
+        session.project = project
+        session.config = self.project_config(project)
+        session.coverage_threshold = self.config.get('project_thresholds', {}).get(name, self.coverage_threshold)
+        session.last_coverage = None
+        print(f"[{name}] Processing components in: {project['source_root']}")
+        started = time.time()
+        try:
+            passed = session._run(project['source_root'])
+        except Exception as e:
+            print(f"[{name}] Error: {str(e)}")
+            passed = False
+        finally:
+            session.save_history(project['source_root'])
+            if session.history:
+                session.history.close()
+        return {
+            "project": name,
+            "passed": passed,
+            "specs": len(session.written_specs),
+            "tests_passed": session.run_status["tests_passed"],
+            "coverage": session.last_coverage,
+            "threshold": session.coverage_threshold,
+            "duration": round(time.time() - started, 2),
+        }
+
+    def watch(self, directory: str = './src') -> bool:
+        """Regenerate and re-run the specs of components affected by file changes, until interrupted"""
+        test_suffix = self.config.get('test_file_suffix', '.spec.ts')
+        graph = ImportGraph(lambda component_file: self.collect_related_files(component_file).keys(),
+                            self.is_component_file)
+        for component_file in self.find_component_files(directory):
+            graph.update(component_file)
+        self.open_example_index(directory)
+        
+        watcher = create_watcher(directory, test_suffix)
+        self.start_metrics_server()
+        print(f"Watching {len(graph.closures)} components in {directory} (Ctrl+C to stop)")
+        try:
+            while True:
+                changes = wait_for_changes(
+                    watcher,
+                    self.config.get('watch_poll_interval', 1.0),
+                    self.config.get('watch_debounce', 0.3)
+                )
+                self.watch_cycle(graph, changes, directory)
+        except KeyboardInterrupt:
+            print("Stopped watching")
+        finally:
+            watcher.stop()
+        return True
+
+    def watch_cycle(self, graph: ImportGraph, changes: Set[str], directory: str) -> bool:
+        """Handle one debounced batch of changes in watch mode"""
+        affected = graph.apply(changes)
+        if not affected:
+            return True
+        print(f"{len(changes)} changed files affect {len(affected)} components")
+        
+        self.run_started = time.time()
+        self.component_stats = {}
+        self.written_specs = {}
+        self.llm_calls_avoided = 0
+        success = self._process_all(affected, directory)
+        if self.written_specs:
+            success = self.run_tests(spec_files=list(self.written_specs), code_coverage=False) and success
+        self.save_history(directory)
+        self.write_metrics()
+        print("Waiting for changes...")
+        return success
+
+    def write_metrics(self) -> None:
+        """Write the Prometheus textfile, if enabled"""
+        if not hasattr(self, 'config') or not self.config.get('metrics', True):
+            return
+        path = self.config.get('metrics_file') or os.path.join(
+            self.config.get('cache_dir', '.angular-tester'), 'metrics.prom')
+        try:
+            metrics.REGISTRY.write_textfile(path)
+        except OSError as e:
+            print(f"Could not write metrics to {path}: {str(e)}")
+
+    def start_metrics_server(self) -> None:
+        """Serve /metrics when a port is configured"""
+        port = self.config.get('metrics_port')
+        if port:
+            host = self.config.get('service_host', '127.0.0.1')
+            metrics.start_metrics_server(metrics.REGISTRY, host, port)
+            print(f"Serving metrics on http://{host}:{port}/metrics")
+
+    def write_profile(self) -> None:
+        """Print the per-phase summary and write the trace of a profiled run"""
+        path = os.path.join(self.config.get('cache_dir', '.angular-tester'), 'profile-trace.json')
+        self.profiler.write_trace(path)
+        print("Phase timings:")
+        print(self.profiler.summary())
+        print(f"Trace written to {path} (open in chrome://tracing or Perfetto)")
+
+    def shard_spec_files(self) -> List[str]:
+        """Existing spec files of this shard's components"""
+        spec_files = [self.find_test_file(component_file)
+                      for component_file in getattr(self, 'processed_components', [])]
+        return [spec_file for spec_file in spec_files if os.path.exists(spec_file)]
+
+    def save_shard_results(self, directory: str) -> None:
+        """Write this shard's components, status and raw coverage for --merge-shards"""
+        coverage_dir = self._coverage_dir()
+        results = {
+            "shard": list(self.shard),
+            "components": [
+                os.path.relpath(component_file, directory)
+                for component_file in getattr(self, 'processed_components', [])
+            ],
+            # Every shard must have partitioned the same components
+            "all_components": sorted(
+                os.path.relpath(component_file, directory)
+                for component_file in getattr(self, 'sharded_components', [])
+            ),
+            "processed": self.run_status.get("processed", False),
+            "tests_passed": self.run_status.get("tests_passed", False),
+            "coverage": load_coverage_final(coverage_dir) if coverage_dir else None,
+        }
+        path = shard_results_path(self.config.get('cache_dir', '.angular-tester'), self.shard)
+        write_shard_results(path, results)
+        print(f"Shard results written to {path}")
+
+
 def main():
-    # Get directory from command line or default to current directory
-    directory = sys.argv[1] if len(sys.argv) > 1 else './src'
+    parser = argparse.ArgumentParser(
+        prog='angular-tester',
+        description='Generate and run Angular unit tests using an LLM'
+    )
+    # Get directory from command line or default to ./src
+    parser.add_argument('directory', nargs='?', default='./src',
+                        help='Directory containing the components to test (default: ./src)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Skip components completed by a previous interrupted run')
+    parser.add_argument('--shard', type=parse_shard, metavar='i/N',
+                        help='Only process the i-th of N deterministic partitions (1-based)')
+    parser.add_argument('--merge-shards', nargs='+', metavar='RESULTS',
+                        help='Merge shard result files into one coverage gate decision and exit')
+    parser.add_argument('--history-report', action='store_true',
+                        help='Print run trends and the most expensive components from the timing history and exit')
+    parser.add_argument('--workspace', action='store_true',
+                        help='Run every project of the angular.json/Nx workspace in the current directory')
+    parser.add_argument('--watch', action='store_true',
+                        help='Regenerate and re-run the specs of components affected by file changes')
+    parser.add_argument('--serve', action='store_true',
+                        help='Run a local HTTP service accepting generate/test/coverage jobs')
+    parser.add_argument('--coverage-guided', action='store_true',
+                        help='Only extend the specs of files below the threshold in the last coverage report')
+    parser.add_argument('--token-budget', type=int, metavar='TOKENS',
+                        help='Stop calling the LLM after this many tokens, best coverage gain per token first')
+    parser.add_argument('--test-runner', choices=['auto', 'karma', 'jest', 'vitest', 'angular'],
+                        help='Test runner backend used to run the specs (default: test_runner from the config)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Time each phase per component and write a Chrome trace')
+    args = parser.parse_args()
+    
+    if args.history_report:
+        config = ConfigManager().load_config(".")
+        history = HistoryStore(os.path.join(config.get('cache_dir', '.angular-tester'), 'history.sqlite'))
+        print(history.report())
+        history.close()
+        sys.exit(0)
+    
+    if args.merge_shards:
+        config = ConfigManager().load_config(".")
+        threshold = int(os.environ.get('COVERAGE_THRESHOLD', config.get('coverage_threshold', 80)))
+        success = merge_shard_results(args.merge_shards, threshold, config.get('coverage_metric', 'lines'))
+        sys.exit(0 if success else 1)
     
     try:
-        tester = AngularTester()
-        success = tester.run(directory)
+        tester = AngularTester(resume=args.resume, shard=args.shard)
+        if args.coverage_guided:
+            tester.config['coverage_guided'] = True
+        if args.token_budget:
+            tester.config['token_budget'] = args.token_budget
+        if args.test_runner:
+            tester.config['test_runner'] = args.test_runner
+        if args.profile:
+            tester.profiler = Profiler()
+        if args.serve:
+            # The HTTP service is only imported when it is used
+            from .service import serve
+            success = serve(
+                tester, args.directory,
+                tester.config.get('service_host', '127.0.0.1'),
+                tester.config.get('service_port', 8765),
+                tester.config.get('service_workers', 2),
+                tester.config.get('service_queue_size', 32)
+            )
+        elif args.workspace:
+            success = tester.run_workspace('.')
+        elif args.watch:
+            success = tester.watch(args.directory)
+        else:
+            success = tester.run(args.directory)
+        if args.profile:
+            tester.write_profile()
         sys.exit(0 if success else 1)
     except Exception as e:
         print(f"Error: {str(e)}")
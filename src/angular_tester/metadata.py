@@ -0,0 +1,460 @@
+"""
+Extraction of Angular decorator metadata from TypeScript sources
+"""
+
+import re
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from .metrics import CACHE_REQUESTS
+
+
+# Decorators that mark a class as an Angular artifact, mapped to the artifact kind
+ANGULAR_DECORATORS = {
+    "Component": "component",
+    "Injectable": "service",
+    "Pipe": "pipe",
+    "Directive": "directive",
+    "NgModule": "module",
+}
+
+# Decorator properties worth keeping in a summary; bulky ones such as
+# ``template`` and ``styles`` are deliberately left out
+DECORATOR_KEYS = [
+    "selector", "standalone", "providedIn", "name", "pure", "exportAs",
+    "templateUrl", "changeDetection", "imports", "providers", "declarations",
+]
+
+_CLASS_PATTERN = re.compile(
+    r'(?:export\s+)?(?:default\s+)?(?:abstract\s+)?class\s+(\w+)'
+    r'(?:\s*<[^{]*?>)?'
+    r'(?:\s+extends\s+([\w.]+)(?:\s*<[^{]*?>)?)?'
+    r'(?:\s+implements\s+([\w.,\s<>]+?))?\s*\{'
+)
+_DECORATOR_PATTERN = re.compile(r'@(\w+)\s*\(')
+_DECORATOR_INPUT_PATTERN = re.compile(
+    r'@Input\s*\(([^)]*)\)\s*(?:set\s+)?(\w+)\s*[!?]?\s*'
+    r'(?::\s*([^;=\n]+?))?\s*(?:[;=\n(])'
+)
+_DECORATOR_OUTPUT_PATTERN = re.compile(
+    r'@Output\s*\(([^)]*)\)\s*(\w+)\s*[!?]?\s*'
+    r'(?::\s*([^;=\n]+))?(?:=\s*new\s+EventEmitter\s*(?:<(.+?)>)?\s*\()?'
+)
+_SIGNAL_INPUT_PATTERN = re.compile(
+    r'(\w+)\s*=\s*(input|model)(\.required)?\s*(?:<(.+?)>)?\s*\('
+)
+_SIGNAL_OUTPUT_PATTERN = re.compile(
+    r'(\w+)\s*=\s*(output|outputFromObservable)\s*(?:<(.+?)>)?\s*\('
+)
+_INJECT_PATTERN = re.compile(r'(\w+)\s*(?::\s*[^=;]+)?=\s*inject\s*(?:<[^>]*>)?\s*\(\s*([\w.]+)')
+_METHOD_PATTERN = re.compile(
+    r'(?:^|[;}\n])\s*((?:(?:public|private|protected|static|async|override|readonly)\s+)*)'
+    r'(get\s+|set\s+)?(\w+)\s*(<[^>(]*>)?\s*\('
+)
+_TYPE_PATTERN = re.compile(r'export\s+(?:declare\s+)?(interface|type|enum|const\s+enum)\s+(\w+)')
+_EXPORTED_CONST_PATTERN = re.compile(r'export\s+const\s+(\w+)\s*(?::\s*([\w.]+(?:<[^=]*>)?))?\s*=')
+_EXPORTED_FUNCTION_PATTERN = re.compile(r'export\s+(?:async\s+)?function\s+(\w+)\s*(?:<[^>(]*>)?\s*\(')
+
+_NOT_METHODS = {"constructor", "if", "for", "while", "switch", "catch", "return", "function", "super"}
+
+
+def mask_literals(content: str) -> str:
+    """Blank out string, template literal and comment contents, preserving offsets.
+
+    Working on the masked copy keeps braces and keywords inside templates,
+    styles or comments from confusing the structural scans below.
+    """
+    masked = list(content)
+    i = 0
+    length = len(content)
+    while i < length:
+        char = content[i]
+        if char in ("'", '"', '`'):
+            j = i + 1
+            while j < length and content[j] != char:
+                if content[j] == '\\':
+                    j += 1
+                j += 1
+            for k in range(i + 1, min(j, length)):
+                if masked[k] != '\n':
+                    masked[k] = ' '
+            i = j + 1
+        elif content.startswith('//', i):
+            j = content.find('\n', i)
+            j = length if j == -1 else j
+            for k in range(i, j):
+                masked[k] = ' '
+            i = j
+        elif content.startswith('/*', i):
+            j = content.find('*/', i + 2)
+            j = length if j == -1 else j + 2
+            for k in range(i, j):
+                if masked[k] != '\n':
+                    masked[k] = ' '
+            i = j
+        else:
+            i += 1
+    return ''.join(masked)
+
+
+def find_closing(masked: str, start: int, open_char: str = '{', close_char: str = '}') -> int:
+    """Return the index of the bracket closing the one at ``start`` (or -1)"""
+    depth = 0
+    for i in range(start, len(masked)):
+        if masked[i] == open_char:
+            depth += 1
+        elif masked[i] == close_char:
+            depth -= 1
+            if depth == 0:
+                return i
+    return -1
+
+
+def split_top_level(text: str, separator: str = ',') -> List[str]:
+    """Split ``text`` on ``separator`` ignoring separators nested in brackets"""
+    parts = []
+    depth = 0
+    current = []
+    for char in text:
+        if char in '([{<':
+            depth += 1
+        elif char in ')]}>':
+            depth -= 1
+        if char == separator and depth == 0:
+            parts.append(''.join(current))
+            current = []
+        else:
+            current.append(char)
+    if ''.join(current).strip():
+        parts.append(''.join(current))
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _clean(text: Optional[str]) -> Optional[str]:
+    """Collapse whitespace in a type or value expression"""
+    if text is None:
+        return None
+    text = ' '.join(text.split())
+    return text or None
+
+
+class MetadataExtractor:
+    """Extracts a compact structured summary of Angular artifacts.
+
+    The summary keeps what a test author needs from a dependency (decorator
+    metadata, inputs/outputs, injected dependencies and public method
+    signatures) and drops implementation bodies, templates and styles.
+    """
+
+    def __init__(self):
+        # Metadata per file with the digest of the content it was extracted from;
+        # the source itself is not kept, so memory does not grow with the repo
+        self._cache: Dict[str, Tuple[bytes, Dict[str, Any]]] = {}
+
+    def extract_file(self, file_path: str, content: Optional[str] = None) -> Dict[str, Any]:
+        """Extract metadata for a file, reusing the result while the content is unchanged"""
+        if content is None:
+            with open(file_path, 'r') as f:
+                content = f.read()
+        digest = hashlib.blake2b(content.encode('utf-8'), digest_size=16).digest()
+        cached = self._cache.get(file_path)
+        if cached and cached[0] == digest:
+            CACHE_REQUESTS.inc(cache="metadata", result="hit")
+            return cached[1]
+        CACHE_REQUESTS.inc(cache="metadata", result="miss")
+        metadata = self.extract(content)
+        self._cache[file_path] = (digest, metadata)
+        return metadata
+
+    def extract(self, content: str) -> Dict[str, Any]:
+        """Extract metadata for every class and exported type in a TypeScript source"""
+        masked = mask_literals(content)
+        classes = []
+        for match in _CLASS_PATTERN.finditer(masked):
+            body_start = match.end() - 1
+            body_end = find_closing(masked, body_start)
+            if body_end == -1:
+                body_end = len(masked)
+            decorator = self._find_decorator(content, masked, match.start())
+            classes.append(self._extract_class(content, masked, match, body_start, body_end, decorator))
+
+        # Decorated classes are the interesting ones, keep them first
+        classes.sort(key=lambda cls: cls["kind"] is None)
+
+        return {
+            "classes": classes,
+            "types": self._extract_types(content, masked),
+            "functions": self._extract_functions(content, masked),
+        }
+
+    def _find_decorator(self, content: str, masked: str, class_start: int) -> Optional[Dict[str, Any]]:
+        """Find the Angular decorator directly preceding a class declaration"""
+        preceding = masked[:class_start]
+        for match in reversed(list(_DECORATOR_PATTERN.finditer(preceding))):
+            name = match.group(1)
+            args_start = match.end() - 1
+            args_end = find_closing(masked, args_start, '(', ')')
+            if args_end == -1 or masked[args_end + 1:class_start].strip():
+                return None
+            if name not in ANGULAR_DECORATORS:
+                # Another decorator stacked on the class, keep looking upwards
+                class_start = match.start()
+                continue
+            return {
+                "name": name,
+                "properties": self._decorator_properties(content, masked, args_start + 1, args_end),
+            }
+        return None
+
+    def _decorator_properties(self, content: str, masked: str, start: int, end: int) -> Dict[str, str]:
+        """Extract the summary-worthy properties of a decorator argument object"""
+        properties = {}
+        for key in DECORATOR_KEYS:
+            match = re.search(r'\b%s\s*:\s*' % key, masked[start:end])
+            if not match:
+                continue
+            value_start = start + match.end()
+            if masked[value_start] == '[':
+                value_end = find_closing(masked, value_start, '[', ']') + 1
+            else:
+                value_end = value_start
+                while value_end < end and masked[value_end] not in ',\n}':
+                    value_end += 1
+            properties[key] = _clean(content[value_start:value_end])
+        return properties
+
+    def _extract_class(self, content: str, masked: str, match, body_start: int, body_end: int,
+                       decorator: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Extract members of a single class body"""
+        body = content[body_start + 1:body_end]
+        masked_body = masked[body_start + 1:body_end]
+        implements = [_clean(name) for name in split_top_level(match.group(3) or '')]
+
+        return {
+            "name": match.group(1),
+            "kind": ANGULAR_DECORATORS.get(decorator["name"]) if decorator else None,
+            "decorator": decorator,
+            "extends": match.group(2),
+            "implements": implements,
+            "inputs": self._extract_inputs(body, masked_body),
+            "outputs": self._extract_outputs(body, masked_body),
+            "dependencies": self._extract_dependencies(body, masked_body),
+            "methods": self._extract_methods(body, masked_body),
+        }
+
+    def _member_depths(self, masked_body: str) -> List[int]:
+        """Brace depth at every offset of a class body (0 means class member level)"""
+        depths = []
+        depth = 0
+        for char in masked_body:
+            if char == '}':
+                depth -= 1
+            depths.append(depth)
+            if char == '{':
+                depth += 1
+        return depths
+
+    def _extract_inputs(self, body: str, masked_body: str) -> List[Dict[str, Any]]:
+        inputs = []
+        for match in _DECORATOR_INPUT_PATTERN.finditer(masked_body):
+            inputs.append({
+                "name": match.group(2),
+                "type": _clean(body[match.start(3):match.end(3)]) if match.group(3) else None,
+                "required": 'required' in body[match.start(1):match.end(1)],
+                "signal": False,
+            })
+        depths = self._member_depths(masked_body)
+        for match in _SIGNAL_INPUT_PATTERN.finditer(masked_body):
+            if depths[match.start()] != 0:
+                continue
+            inputs.append({
+                "name": match.group(1),
+                "type": _clean(match.group(4)),
+                "required": bool(match.group(3)),
+                "signal": True,
+                "model": match.group(2) == "model",
+            })
+        return inputs
+
+    def _extract_outputs(self, body: str, masked_body: str) -> List[Dict[str, Any]]:
+        outputs = []
+        for match in _DECORATOR_OUTPUT_PATTERN.finditer(masked_body):
+            event_type = match.group(4) or _clean(match.group(3))
+            if event_type and event_type.startswith('EventEmitter<') and event_type.endswith('>'):
+                event_type = event_type[len('EventEmitter<'):-1]
+            outputs.append({
+                "name": match.group(2),
+                "type": _clean(event_type),
+                "signal": False,
+            })
+        depths = self._member_depths(masked_body)
+        for match in _SIGNAL_OUTPUT_PATTERN.finditer(masked_body):
+            if depths[match.start()] != 0:
+                continue
+            outputs.append({
+                "name": match.group(1),
+                "type": _clean(match.group(3)),
+                "signal": True,
+            })
+        return outputs
+
+    def _extract_dependencies(self, body: str, masked_body: str) -> List[Dict[str, Any]]:
+        dependencies = []
+        depths = self._member_depths(masked_body)
+
+        constructor = re.search(r'\bconstructor\s*\(', masked_body)
+        if constructor and depths[constructor.start()] == 0:
+            params_start = constructor.end() - 1
+            params_end = find_closing(masked_body, params_start, '(', ')')
+            for param in split_top_level(body[params_start + 1:params_end]):
+                # Drop parameter decorators and accessibility modifiers
+                param = re.sub(r'@\w+\s*\([^)]*\)\s*', '', param)
+                param = re.sub(r'\b(?:public|private|protected|readonly|override)\s+', '', param)
+                name, _, param_type = param.partition(':')
+                dependencies.append({
+                    "name": name.strip().rstrip('?'),
+                    "type": _clean(param_type.split('=')[0]) if param_type else None,
+                    "via": "constructor",
+                })
+
+        for match in _INJECT_PATTERN.finditer(masked_body):
+            if depths[match.start(1)] == 0:
+                dependencies.append({
+                    "name": match.group(1),
+                    "type": match.group(2),
+                    "via": "inject",
+                })
+        return dependencies
+
+    def _extract_methods(self, body: str, masked_body: str) -> List[Dict[str, Any]]:
+        methods = []
+        depths = self._member_depths(masked_body)
+        for match in _METHOD_PATTERN.finditer(masked_body):
+            name = match.group(3)
+            if depths[match.start(3)] != 0 or name in _NOT_METHODS:
+                continue
+            modifiers = match.group(1).split()
+            if 'private' in modifiers or 'protected' in modifiers or name.startswith('_'):
+                continue
+
+            params_start = match.end() - 1
+            params_end = find_closing(masked_body, params_start, '(', ')')
+            if params_end == -1:
+                continue
+            # A method declaration is followed by an optional return type and its body
+            rest = masked_body[params_end + 1:]
+            signature_end = re.search(r'[{;=]', rest)
+            if not signature_end or rest[signature_end.start()] != '{':
+                continue
+            return_type = rest[:signature_end.start()].strip()
+            if return_type and not return_type.startswith(':'):
+                continue
+
+            methods.append({
+                "name": name,
+                "params": _clean(body[params_start + 1:params_end]) or '',
+                "returns": _clean(body[params_end + 1:params_end + 1 + signature_end.start()].strip()[1:]),
+                "accessor": (match.group(2) or '').strip() or None,
+                "async": 'async' in modifiers,
+                "static": 'static' in modifiers,
+            })
+        return methods
+
+    def _extract_types(self, content: str, masked: str) -> List[str]:
+        """Return the source of exported interfaces, type aliases and enums"""
+        types = []
+        for match in _TYPE_PATTERN.finditer(masked):
+            brace = masked.find('{', match.end())
+            semicolon = masked.find(';', match.end())
+            if match.group(1) == 'type' and semicolon != -1 and (brace == -1 or semicolon < brace):
+                types.append(content[match.start():semicolon + 1])
+            elif brace != -1:
+                end = find_closing(masked, brace)
+                types.append(content[match.start():end + 1 if end != -1 else len(content)])
+        return types
+
+    def _extract_functions(self, content: str, masked: str) -> List[Dict[str, Any]]:
+        """Return exported functions and typed constants such as functional guards"""
+        functions = []
+        for match in _EXPORTED_CONST_PATTERN.finditer(masked):
+            if match.group(1).isupper():
+                continue
+            functions.append({"name": match.group(1), "type": _clean(match.group(2)), "params": None})
+        for match in _EXPORTED_FUNCTION_PATTERN.finditer(masked):
+            params_start = match.end() - 1
+            params_end = find_closing(masked, params_start, '(', ')')
+            functions.append({
+                "name": match.group(1),
+                "type": None,
+                "params": _clean(content[params_start + 1:params_end]) or '',
+            })
+        return functions
+
+    def summarize(self, metadata: Dict[str, Any], file_path: Optional[str] = None) -> str:
+        """Render metadata as a compact TypeScript-like declaration listing"""
+        lines = []
+        if file_path:
+            lines.append(f"// {file_path} (summary)")
+        lines.extend(metadata.get("types", []))
+        for function in metadata.get("functions", []):
+            if function["params"] is not None:
+                lines.append(f"export function {function['name']}({function['params']});")
+            else:
+                type_hint = f": {function['type']}" if function["type"] else ""
+                lines.append(f"export const {function['name']}{type_hint};")
+
+        for cls in metadata.get("classes", []):
+            decorator = cls.get("decorator")
+            if decorator:
+                properties = ', '.join(f"{key}: {value}" for key, value in decorator["properties"].items())
+                lines.append(f"@{decorator['name']}({{ {properties} }})" if properties else f"@{decorator['name']}()")
+
+            header = f"export class {cls['name']}"
+            if cls.get("extends"):
+                header += f" extends {cls['extends']}"
+            if cls.get("implements"):
+                header += f" implements {', '.join(cls['implements'])}"
+            lines.append(header + " {")
+
+            for item in cls["inputs"]:
+                if item["signal"]:
+                    function = ("model" if item.get("model") else "input") + (".required" if item["required"] else "")
+                    type_args = f"<{item['type']}>" if item["type"] else ""
+                    lines.append(f"  {item['name']} = {function}{type_args}();")
+                else:
+                    type_hint = f": {item['type']}" if item["type"] else ""
+                    lines.append(f"  @Input() {item['name']}{type_hint};")
+            for item in cls["outputs"]:
+                type_args = f"<{item['type']}>" if item["type"] else ""
+                if item["signal"]:
+                    lines.append(f"  {item['name']} = output{type_args}();")
+                else:
+                    lines.append(f"  @Output() {item['name']}: EventEmitter{type_args};")
+
+            constructor_params = [dep for dep in cls["dependencies"] if dep["via"] == "constructor"]
+            for dep in cls["dependencies"]:
+                if dep["via"] == "inject":
+                    lines.append(f"  {dep['name']} = inject({dep['type']});")
+            if constructor_params:
+                params = ', '.join(
+                    f"{dep['name']}: {dep['type']}" if dep["type"] else dep["name"] for dep in constructor_params
+                )
+                lines.append(f"  constructor({params});")
+
+            for method in cls["methods"]:
+                prefix = ''.join([
+                    "static " if method["static"] else "",
+                    "async " if method["async"] else "",
+                    f"{method['accessor']} " if method["accessor"] else "",
+                ])
+                returns = f": {method['returns']}" if method["returns"] else ""
+                lines.append(f"  {prefix}{method['name']}({method['params']}){returns};")
+            lines.append("}")
+
+        return '\n'.join(lines)
+
+
+def primary_class(metadata: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Return the main class described by ``metadata`` (decorated classes first)"""
+    classes = metadata.get("classes", [])
+    return classes[0] if classes else None
@@ -0,0 +1,182 @@
+"""
+Prometheus-compatible counters and histograms
+"""
+
+import os
+import threading
+from typing import TYPE_CHECKING, Dict, List, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; covers fast cache hits up to slow LLM calls and full test runs
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(tuple(str(labels.get(name, "")) for name in self.labelnames), 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, key)} {_number(value)}" for key, value in values]
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            # bucket counts, then sum and count
+            state = self._values.setdefault(key, [0] * len(self.buckets) + [0.0, 0])
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def count(self, **labels: str) -> int:
+        state = self._values.get(tuple(str(labels.get(name, "")) for name in self.labelnames))
+        return state[-1] if state else 0
+
+    def samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            values = sorted((key, list(state)) for key, state in self._values.items())
+        for key, state in values:
+            for bound, count in zip(self.buckets, state):
+                bound_label = 'le="%s"' % _number(bound)
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, bound_label)} {count}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(state[-2])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {state[-1]}")
+        return lines
+
+
+class Registry:
+    """Collection of metrics rendered in the Prometheus text exposition format"""
+
+    def __init__(self):
+        self.metrics = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path: str) -> None:
+        """Write atomically, as expected by the node_exporter textfile collector"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'w') as f:
+            f.write(self.render())
+        os.replace(temporary, path)
+
+
+def start_metrics_server(registry: Registry, host: str = "127.0.0.1", port: int = 9464) -> "ThreadingHTTPServer":
+    """Serve ``/metrics`` from a daemon thread, for long-running modes"""
+    # Imported here so that one-shot runs do not pay for the HTTP stack
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            payload = registry.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+REGISTRY = Registry()
+
+COMPONENTS = REGISTRY.counter(
+    "angular_tester_components_total", "Components processed, by result", ["result"])
+LLM_REQUESTS = REGISTRY.counter(
+    "angular_tester_llm_requests_total", "LLM API requests, by outcome", ["outcome"])
+LLM_LATENCY = REGISTRY.histogram(
+    "angular_tester_llm_request_seconds", "LLM API request latency")
+LLM_CALLS_AVOIDED = REGISTRY.counter(
+    "angular_tester_llm_calls_avoided_total", "Trivial artifacts generated without calling the LLM")
+TOKENS = REGISTRY.counter(
+    "angular_tester_tokens_total", "LLM tokens (estimated when the API does not report usage)", ["kind"])
+RETRIES = REGISTRY.counter(
+    "angular_tester_retries_total", "Spec regenerations with feedback, by cause", ["cause"])
+FALLBACKS = REGISTRY.counter(
+    "angular_tester_basic_fallbacks_total", "Specs generated from the basic template instead of the LLM", ["reason"])
+CACHE_REQUESTS = REGISTRY.counter(
+    "angular_tester_cache_requests_total", "Cache lookups, by cache and result", ["cache", "result"])
+TEST_RUN_SECONDS = REGISTRY.histogram(
+    "angular_tester_test_run_seconds", "Duration of ng test runs", ["coverage"])
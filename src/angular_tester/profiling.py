@@ -0,0 +1,96 @@
+"""
+Phase timing spans for --profile
+"""
+
+import os
+import math
+import json
+import time
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, List, Optional
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+class Profiler:
+    """Records named spans (scan, context, prompt, llm, ...) per component and thread"""
+
+    enabled = True
+
+    def __init__(self):
+        self.events: List[Dict[str, Any]] = []
+        self.origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, component: Optional[str] = None, **args: Any):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, started, component, **args)
+
+    def record(self, name: str, started: float, component: Optional[str] = None,
+               finished: Optional[float] = None, **args: Any) -> None:
+        """Record a span from ``started`` (a ``time.perf_counter`` value) to ``finished`` or now"""
+        finished = time.perf_counter() if finished is None else finished
+        if component:
+            args["component"] = component
+        event = {"name": name, "start": started - self.origin, "duration": finished - started,
+                 "thread": threading.get_ident(), "args": args}
+        with self._lock:
+            self.events.append(event)
+
+    def phase_stats(self) -> Dict[str, Dict[str, float]]:
+        """Count, p50, p95, max and total seconds per span name"""
+        durations: Dict[str, List[float]] = {}
+        for event in self.events:
+            durations.setdefault(event["name"], []).append(event["duration"])
+        return {
+            name: {"count": len(values), "p50": percentile(values, 0.5), "p95": percentile(values, 0.95),
+                   "max": max(values), "total": sum(values)}
+            for name, values in durations.items()
+        }
+
+    def summary(self) -> str:
+        lines = [f"{'phase':<12} {'count':>6} {'p50':>9} {'p95':>9} {'max':>9} {'total':>9}"]
+        for name, stats in sorted(self.phase_stats().items(), key=lambda item: -item[1]["total"]):
+            lines.append(f"{name:<12} {stats['count']:>6} {stats['p50']:>8.3f}s {stats['p95']:>8.3f}s "
+                         f"{stats['max']:>8.3f}s {stats['total']:>8.3f}s")
+        return '\n'.join(lines)
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Events in Chrome trace-event format (chrome://tracing, Perfetto)"""
+        pid = os.getpid()
+        return {"traceEvents": [
+            {"name": event["name"], "cat": "angular-tester", "ph": "X", "pid": pid, "tid": event["thread"],
+             "ts": round(event["start"] * 1e6), "dur": round(event["duration"] * 1e6), "args": event["args"]}
+            for event in self.events
+        ], "displayTimeUnit": "ms"}
+
+    def write_trace(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.chrome_trace(), f)
+
+
+class _DisabledProfiler:
+    """Stand-in used when profiling is off; spans cost one method call"""
+
+    enabled = False
+    _span = nullcontext()
+
+    def span(self, name: str, component: Optional[str] = None, **args: Any):
+        return self._span
+
+    def record(self, name: str, started: float, component: Optional[str] = None,
+               finished: Optional[float] = None, **args: Any) -> None:
+        pass
+
+
+DISABLED = _DisabledProfiler()
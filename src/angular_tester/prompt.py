@@ -0,0 +1,51 @@
+"""
+Size-capped prompt assembly
+"""
+
+import io
+from typing import List, Optional
+
+
+# Identical for every component, so it can form a cached prompt prefix
+PROMPT_INSTRUCTIONS = """
+            Generate comprehensive unit tests for the following Angular component.
+            The tests should follow Angular testing best practices and include:
+            1. Component creation test
+            2. Input/output tests if applicable
+            3. Method testing
+            4. DOM interaction tests if applicable
+            5. Service mocking where needed
+            
+            """
+
+
+class PromptBuffer:
+    """Accumulates prompt sections in one buffer, up to ``max_chars``.
+
+    Required sections are always written. Optional sections (related
+    files) are skipped once they no longer fit, keeping ``reserve``
+    characters free for the closing sections, and are listed in
+    ``omitted``.
+    """
+
+    def __init__(self, max_chars: Optional[int] = None, reserve: int = 0):
+        self._buffer = io.StringIO()
+        self.size = 0
+        self.max_chars = max_chars
+        self.reserve = reserve
+        self.omitted: List[str] = []
+
+    def write(self, text: str) -> None:
+        self._buffer.write(text)
+        self.size += len(text)
+
+    def write_optional(self, text: str, label: str) -> bool:
+        """Write ``text`` if it fits under the cap, otherwise record ``label`` as omitted"""
+        if self.max_chars is not None and self.size + len(text) + self.reserve > self.max_chars:
+            self.omitted.append(label)
+            return False
+        self.write(text)
+        return True
+
+    def getvalue(self) -> str:
+        return self._buffer.getvalue()
@@ -0,0 +1,213 @@
+"""
+Test runner backends: Karma, Jest, Vitest and Angular's unit-test builder
+"""
+
+import os
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+from .karma import load_spec_results, write_karma_wrapper
+
+
+# Coverage reports read by the coverage gate, shard merging and coverage-guided mode
+COVERAGE_REPORTERS = ["json-summary", "json", "text-summary"]
+
+# Test builders/executors in angular.json or project.json, by backend
+BUILDER_RUNNERS = {
+    "@angular/build:unit-test": "angular",
+    "@angular-builders/jest:run": "jest",
+    "@nx/jest:jest": "jest",
+    "@nrwl/jest:jest": "jest",
+    "@analogjs/vitest-angular:test": "vitest",
+    "@analogjs/platform:vitest": "vitest",
+    "@nx/vite:test": "vitest",
+}
+
+
+def load_jest_results(results_file: str) -> Optional[List[Dict[str, Any]]]:
+    """Convert a Jest ``--json`` report (also written by Vitest's json reporter) to per-`it` records"""
+    try:
+        with open(results_file, 'r') as f:
+            report = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Per-spec results not available: {str(e)}")
+        return None
+    records = []
+    for test_file in report.get("testResults", []):
+        for assertion in test_file.get("assertionResults", []):
+            records.append({
+                "file": test_file.get("name"),
+                "suite": assertion.get("ancestorTitles", []),
+                "description": assertion.get("title", ""),
+                "success": assertion.get("status") == "passed",
+                "skipped": assertion.get("status") in ("pending", "skipped", "todo", "disabled"),
+                "time": assertion.get("duration") or 0,
+                "log": assertion.get("failureMessages", []),
+            })
+    return records
+
+
+def find_config(directory: str, prefix: str) -> Optional[str]:
+    """First file in ``directory`` whose name starts with ``prefix`` (e.g. ``jest.config.``)"""
+    try:
+        names = sorted(os.listdir(directory or '.'))
+    except OSError:
+        return None
+    for name in names:
+        if name.startswith(prefix):
+            return os.path.join(directory, name)
+    return None
+
+
+class SpecRunner(ABC):
+    """Builds the test command of one backend and reads its per-spec results.
+
+    Every backend writes ``coverage-summary.json`` and ``coverage-final.json``
+    under ``coverage/`` (``coverage/<project>`` in workspaces).
+    """
+
+    name = ""
+    # Launches a browser, so a Chrome/Chromium binary is required
+    needs_browser = False
+    # Added to the prompt instructions so generated specs use the runner's APIs
+    conventions = ""
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+
+    @abstractmethod
+    def command(self, spec_files: List[str], code_coverage: bool, results_file: Optional[str],
+                cache_dir: str, project: Optional[Dict] = None) -> List[str]:
+        """Command running ``spec_files`` (all specs if empty)"""
+
+    def load_results(self, results_file: str) -> Optional[List[Dict[str, Any]]]:
+        return None
+
+    @staticmethod
+    def coverage_dir(project: Optional[Dict]) -> str:
+        return os.path.join('coverage', project['name']) if project else 'coverage'
+
+
+class KarmaRunner(SpecRunner):
+    """`ng test` with Karma and ChromeHeadless, through a wrapping Karma config"""
+
+    name = "karma"
+    needs_browser = True
+
+    def command(self, spec_files, code_coverage, results_file, cache_dir, project=None):
+        command = ['ng', 'test', '--browsers=ChromeHeadless', '--watch=false']
+        if project:
+            command.insert(2, project['name'])
+        if code_coverage:
+            command.append('--code-coverage')
+        for spec_file in spec_files:
+            command.append(f'--include={os.path.relpath(spec_file)}')
+        # Inject the JSON reporter through a wrapping Karma config
+        if results_file:
+            base_config = self.config.get('karma_config', 'karma.conf.js')
+            wrapper = write_karma_wrapper(cache_dir, base_config if os.path.exists(base_config) else None, results_file)
+            command.append(f'--karma-config={wrapper}')
+        return command
+
+    def load_results(self, results_file):
+        return load_spec_results(results_file)
+
+
+class JestRunner(SpecRunner):
+    """Jest with jest-preset-angular, run directly without the Angular CLI"""
+
+    name = "jest"
+    conventions = ("The tests run with Jest (jest-preset-angular): use jest.fn() and jest.spyOn() "
+                   "for mocks instead of Jasmine spies.")
+
+    def command(self, spec_files, code_coverage, results_file, cache_dir, project=None):
+        command = ['npx', 'jest', '--ci']
+        jest_config = self.config.get('jest_config')
+        if not jest_config and project and project['root']:
+            # Nx keeps one Jest config per project
+            jest_config = find_config(project['root'], "jest.config.")
+        if jest_config:
+            command.append(f'--config={jest_config}')
+        if code_coverage:
+            command += ['--coverage', f'--coverageDirectory={self.coverage_dir(project)}']
+            command += [f'--coverageReporters={reporter}' for reporter in COVERAGE_REPORTERS]
+        if results_file:
+            command += ['--json', f'--outputFile={results_file}']
+        command += [os.path.relpath(spec_file) for spec_file in spec_files]
+        return command
+
+    def load_results(self, results_file):
+        return load_jest_results(results_file)
+
+
+class VitestRunner(SpecRunner):
+    """Vitest (e.g. with @analogjs/vite-plugin-angular), run directly"""
+
+    name = "vitest"
+    conventions = ("The tests run with Vitest: use vi.fn() and vi.spyOn() "
+                   "for mocks instead of Jasmine spies.")
+
+    def command(self, spec_files, code_coverage, results_file, cache_dir, project=None):
+        command = ['npx', 'vitest', 'run']
+        if project and project['root']:
+            command.append(f'--root={project["root"]}')
+        if code_coverage:
+            command += ['--coverage.enabled',
+                        f'--coverage.reportsDirectory={os.path.abspath(self.coverage_dir(project))}']
+            command += [f'--coverage.reporter={reporter}' for reporter in COVERAGE_REPORTERS]
+        if results_file:
+            command += ['--reporter=default', '--reporter=json', f'--outputFile.json={os.path.abspath(results_file)}']
+        command += [os.path.abspath(spec_file) for spec_file in spec_files]
+        return command
+
+    def load_results(self, results_file):
+        return load_jest_results(results_file)
+
+
+class AngularUnitTestRunner(SpecRunner):
+    """`ng test` with the @angular/build:unit-test builder (Vitest on esbuild).
+
+    The builder has no option for a results file, so failing specs are not
+    reported individually and are not regenerated.
+    """
+
+    name = "angular"
+    conventions = VitestRunner.conventions
+
+    def command(self, spec_files, code_coverage, results_file, cache_dir, project=None):
+        command = ['ng', 'test', '--watch=false']
+        if project:
+            command.insert(2, project['name'])
+        if code_coverage:
+            command.append('--coverage')
+            command += [f'--coverage-reporters={reporter}' for reporter in COVERAGE_REPORTERS]
+        for spec_file in spec_files:
+            command.append(f'--include={os.path.relpath(spec_file)}')
+        return command
+
+
+RUNNERS = {runner.name: runner for runner in (KarmaRunner, JestRunner, VitestRunner, AngularUnitTestRunner)}
+
+
+def detect_runner(project_dir: str = ".", project: Optional[Dict] = None) -> str:
+    """Backend name from the test builder of ``project`` or the config files in ``project_dir``"""
+    target = (project or {}).get("test") or {}
+    builder = target.get("builder") or target.get("executor")
+    if builder in BUILDER_RUNNERS:
+        return BUILDER_RUNNERS[builder]
+    directory = os.path.join(project_dir, project['root']) if project and project['root'] else project_dir
+    for prefix, runner in (("vitest.config.", "vitest"), ("jest.config.", "jest")):
+        if find_config(directory, prefix):
+            return runner
+    return "karma"
+
+
+def create_runner(config: Dict[str, Any], project: Optional[Dict] = None) -> SpecRunner:
+    """The backend selected by ``test_runner`` ("auto" detects it)"""
+    name = config.get('test_runner', 'karma')
+    if name == 'auto':
+        name = detect_runner('.', project)
+    if name not in RUNNERS:
+        raise ValueError(f"Unknown test_runner '{name}', expected one of: auto, {', '.join(RUNNERS)}")
+    return RUNNERS[name](config)
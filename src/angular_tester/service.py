@@ -0,0 +1,223 @@
+"""
+Long-running HTTP service that keeps an AngularTester warm between jobs
+"""
+
+import json
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+from . import metrics
+from .environment import LazyModule
+from .karma import failure_message
+from .watch import ImportGraph
+
+
+requests = LazyModule('requests')
+
+JOB_TYPES = ("generate", "test", "coverage")
+
+# Finished jobs kept for status queries
+MAX_FINISHED_JOBS = 256
+
+
+class QueueFull(Exception):
+    """Raised when a job is submitted while the queue is at capacity"""
+
+
+class JobService:
+    """Runs generate/test/coverage jobs on a bounded worker pool.
+
+    The configuration, metadata cache, import graph and LLM connection pool
+    live as long as the service. Each job works on a session of the shared
+    tester, so generation jobs run concurrently; test and coverage jobs share
+    the project's Karma setup and coverage directory and are serialized.
+    """
+
+    def __init__(self, tester, directory: str, workers: int = 2, queue_size: int = 32):
+        self.tester = tester
+        self.directory = directory
+        self.queue_size = queue_size
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self._lock = threading.Lock()
+        self._test_lock = threading.Lock()
+        self._graph: Optional[ImportGraph] = None
+
+        tester.open_example_index(directory)
+
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+        tester.http_session = requests.Session()
+        tester.http_session.mount('http://', adapter)
+        tester.http_session.mount('https://', adapter)
+
+    @property
+    def graph(self) -> ImportGraph:
+        """Import graph of the served directory, built on first use"""
+        with self._lock:
+            if self._graph is None:
+                self._graph = ImportGraph(lambda component_file: self.tester.collect_related_files(component_file).keys(),
+                                          self.tester.is_component_file)
+                for component_file in self.tester.find_component_files(self.directory):
+                    self._graph.update(component_file)
+            return self._graph
+
+    def pending(self) -> int:
+        with self._lock:
+            return self._pending_locked()
+
+    def _pending_locked(self) -> int:
+        # Callers hold self._lock; submit and evictions mutate self.jobs
+        return sum(1 for job in self.jobs.values() if job["status"] in ("queued", "running"))
+
+    def submit(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue a job and return its record"""
+        if request.get("type") not in JOB_TYPES:
+            raise ValueError(f"Unknown job type: {request.get('type')!r}, expected one of {', '.join(JOB_TYPES)}")
+        with self._lock:
+            if self._pending_locked() >= self.queue_size:
+                raise QueueFull(f"Job queue is full ({self.queue_size} jobs)")
+            job = {"id": uuid.uuid4().hex, "type": request["type"], "status": "queued",
+                   "submitted": time.time(), "result": None, "error": None}
+            self.jobs[job["id"]] = job
+            finished = [job_id for job_id, entry in self.jobs.items() if entry["status"] in ("done", "failed")]
+            for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+                del self.jobs[job_id]
+            record = dict(job)
+        self.executor.submit(self._execute, job, request)
+        return record
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Snapshot of a job record; workers keep updating the live one"""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job else None
+
+    def _update(self, job: Dict[str, Any], **fields: Any) -> None:
+        with self._lock:
+            job.update(fields)
+
+    def _execute(self, job: Dict[str, Any], request: Dict[str, Any]) -> None:
+        self._update(job, status="running")
+        session = self.tester.session()
+        outcome: Dict[str, Any] = {"status": "failed"}
+        try:
+            handler = getattr(self, f"_run_{job['type']}")
+            outcome = {"result": handler(session, request), "status": "done"}
+        except Exception as e:
+            outcome = {"error": str(e), "status": "failed"}
+        finally:
+            if getattr(session, 'history', None) is not None:
+                session.history.close()
+            session.write_metrics()
+            # Status and finish time change together, so a finished job always has both
+            self._update(job, finished=time.time(), **outcome)
+
+    def _run_generate(self, session, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate specs for ``files``, for the components affected by ``changed``, or for all"""
+        if request.get("files"):
+            component_files = list(request["files"])
+        elif request.get("changed"):
+            graph = self.graph
+            with self._lock:
+                component_files = graph.apply(request["changed"])
+        else:
+            component_files = sorted(self.graph.closures)
+        success = session._process_all(component_files, self.directory)
+        session.save_history(self.directory)
+        return {"success": success, "components": component_files, "specs": sorted(session.written_specs)}
+
+    def _run_test(self, session, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Run ``specs`` (or the whole suite), with coverage unless disabled"""
+        with self._test_lock:
+            success = session.run_tests(spec_files=request.get("specs") or None,
+                                        code_coverage=request.get("coverage", True))
+        failed = [failure_message(result) for result in getattr(session, 'spec_results', None) or []
+                  if not result.get("success") and not result.get("skipped")]
+        return {"success": success, "failed": failed}
+
+    def _run_coverage(self, session, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Report the coverage of the last test run against the threshold"""
+        with self._test_lock:
+            coverage = session.get_coverage_report()
+        threshold = getattr(session, 'coverage_threshold', 80)
+        return {"coverage": coverage, "threshold": threshold,
+                "success": coverage is not None and coverage >= threshold}
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=True)
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    """JSON API: POST /jobs, GET /jobs/<id>, GET /health, plus GET /metrics"""
+
+    service: JobService = None
+
+    def _send(self, status: int, body: Any) -> None:
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path == "/metrics":
+            payload = metrics.REGISTRY.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header("Content-Type", metrics.CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        elif self.path == "/health":
+            self._send(200, {"status": "ok", "pending": self.service.pending()})
+        elif self.path.startswith("/jobs/"):
+            job = self.service.status(self.path[len("/jobs/"):])
+            if job:
+                self._send(200, job)
+            else:
+                self._send(404, {"error": "Unknown job"})
+        else:
+            self._send(404, {"error": "Not found"})
+
+    def do_POST(self):
+        if self.path != "/jobs":
+            self._send(404, {"error": "Not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            job = self.service.submit(request)
+        except QueueFull as e:
+            self._send(503, {"error": str(e)})
+        except ValueError as e:
+            self._send(400, {"error": str(e)})
+        else:
+            self._send(202, job)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(service: JobService, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    """Create the HTTP server for ``service`` (call ``serve_forever`` to run it)"""
+    handler = type("BoundServiceHandler", (ServiceHandler,), {"service": service})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def serve(tester, directory: str, host: str, port: int, workers: int, queue_size: int) -> bool:
+    """Serve jobs until interrupted"""
+    service = JobService(tester, directory, workers, queue_size)
+    server = make_server(service, host, port)
+    print(f"Serving {directory} on http://{host}:{server.server_address[1]} ({workers} workers)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Shutting down")
+    finally:
+        server.server_close()
+        service.shutdown()
+    return True
@@ -0,0 +1,145 @@
+"""
+Deterministic partitioning of components across CI shards
+"""
+
+import os
+import json
+import argparse
+from typing import Any, Dict, List, Optional, Tuple
+
+from .coverage import coverage_percentage, merge_coverage_final, summarize_coverage_final
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """Parse a 1-based ``i/N`` shard specification (an argparse ``type``, so its errors are shown as is)"""
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid shard '{value}', expected i/N (e.g. 1/4)")
+    if count < 1 or not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"Invalid shard '{value}', index must be between 1 and {max(count, 1)}")
+    return index, count
+
+
+def assign_shards(files: List[str], count: int, weights: Optional[Dict[str, float]] = None) -> List[List[str]]:
+    """Split ``files`` into ``count`` shards.
+
+    Without weights, the sorted list is dealt round-robin. With weights
+    (expected cost per file), files are placed longest-first on the least
+    loaded shard. Files without history get the median known weight. The
+    result only depends on the inputs, so every shard computes the same
+    assignment, provided all shards see the same weights.
+    """
+    ordered = sorted(files)
+    shards: List[List[str]] = [[] for _ in range(count)]
+    names = set(files)
+    known = sorted(weight for name, weight in (weights or {}).items() if name in names)
+    if not known:
+        for position, name in enumerate(ordered):
+            shards[position % count].append(name)
+        return shards
+
+    default_weight = known[len(known) // 2]
+    loads = [0.0] * count
+    for name in sorted(ordered, key=lambda item: (-weights.get(item, default_weight), item)):
+        target = min(range(count), key=lambda shard: (loads[shard], shard))
+        shards[target].append(name)
+        loads[target] += weights.get(name, default_weight)
+    return [sorted(shard) for shard in shards]
+
+
+def select_shard(files: List[str], directory: str, shard: Tuple[int, int],
+                 weights: Optional[Dict[str, float]] = None) -> List[str]:
+    """Return the files of ``directory`` that belong to ``shard``.
+
+    Files are keyed by their path relative to ``directory`` so the
+    assignment is the same on every machine regardless of checkout location.
+    """
+    by_relative = {os.path.relpath(file_path, directory): file_path for file_path in files}
+    index, count = shard
+    selected = assign_shards(list(by_relative), count, weights)[index - 1]
+    return [by_relative[name] for name in selected]
+
+
+def shard_results_path(cache_dir: str, shard: Tuple[int, int]) -> str:
+    return os.path.join(cache_dir, f"shard-{shard[0]}-of-{shard[1]}.json")
+
+
+def write_shard_results(path: str, results: Dict[str, Any]) -> None:
+    """Write a shard's result file for a later merge"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(results, f)
+
+
+def check_partition(results: List[Dict[str, Any]]) -> bool:
+    """Whether the shards processed disjoint parts that together cover every component.
+
+    Shards whose timing histories differ compute different partitions, which
+    silently drops or duplicates components.
+    """
+    owners: Dict[str, List[int]] = {}
+    for result in results:
+        for name in result.get("components", []):
+            owners.setdefault(name, []).append(result["shard"][0])
+    overlapping = sorted(name for name, shards in owners.items() if len(shards) > 1)
+    if overlapping:
+        print(f"Components processed by more than one shard: {', '.join(overlapping)}")
+    expected = set()
+    for result in results:
+        expected.update(result.get("all_components", []))
+    missing = sorted(expected - set(owners))
+    if missing:
+        print(f"Components not processed by any shard: {', '.join(missing)}")
+    if overlapping or missing:
+        print("Shards disagree on the partition; make sure every job restores the same history.sqlite")
+        return False
+    return True
+
+
+def merge_shard_results(result_files: List[str], threshold: float, metric: str = "lines") -> bool:
+    """Combine per-shard results and coverage into a single gate decision"""
+    results = []
+    for result_file in result_files:
+        try:
+            with open(result_file, 'r') as f:
+                results.append(json.load(f))
+        except (OSError, ValueError) as e:
+            print(f"Could not read shard results {result_file}: {str(e)}")
+            return False
+    if not results:
+        print("No shard results to merge")
+        return False
+
+    counts = {result["shard"][1] for result in results}
+    if len(counts) != 1:
+        print(f"Shard results come from different shard counts: {sorted(counts)}")
+        return False
+    count = counts.pop()
+    missing = sorted(set(range(1, count + 1)) - {result["shard"][0] for result in results})
+    if missing:
+        print(f"Missing results for shards: {', '.join(f'{index}/{count}' for index in missing)}")
+        return False
+
+    if not check_partition(results):
+        return False
+
+    success = True
+    for result in sorted(results, key=lambda item: item["shard"][0]):
+        label = f"{result['shard'][0]}/{count}"
+        status = "ok" if result.get("processed") and result.get("tests_passed") else "FAILED"
+        print(f"Shard {label}: {len(result.get('components', []))} components, {status}")
+        if status != "ok":
+            success = False
+
+    reports = [result["coverage"] for result in results if result.get("coverage")]
+    if not reports:
+        print("No coverage data in shard results")
+        return False
+    summary = summarize_coverage_final(merge_coverage_final(reports))
+    coverage = coverage_percentage(summary, metric)
+    print(f"Merged coverage ({metric}): {coverage}%")
+    if coverage is None or coverage < threshold:
+        print(f"Coverage is below threshold of {threshold}%")
+        success = False
+    return success
@@ -0,0 +1,275 @@
+"""
+Compiled spec templates with loops and conditionals over component metadata
+
+Besides ``{{variable}}`` (dotted names such as ``{{input.type}}`` are
+allowed), templates support ``{{#each list}}...{{/each}}``,
+``{{#if value}}...{{else}}...{{/if}}`` and ``{{#unless value}}...{{/unless}}``.
+Inside ``each`` the item's fields are looked up first, then the enclosing
+scopes; ``{{this}}``, ``{{@index}}``, ``{{@first}}`` and ``{{@last}}`` refer to
+the current item and its position. Block tags alone on a line do not leave
+an empty line behind. Names that no scope defines are left as written, so
+Angular interpolation such as ``{{ value }}`` in inline templates survives.
+"""
+
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .metadata import primary_class
+
+
+_TAG_PATTERN = re.compile(r'\{\{\s*(?:([#/])\s*(each|if|unless)\b\s*([\w.@]*)|(else)|([\w@][\w.@]*))\s*\}\}')
+_IMPORT_PATTERN = re.compile(r'import\s*(?:type\s+)?\{([^}]*)\}\s*from\s*[\'"]([^\'"]+)[\'"]')
+
+# Sample input values by declared type
+_SAMPLE_VALUES = {"string": "'test'", "number": "1", "boolean": "true", "Date": "new Date()"}
+
+# Compiled templates by source; custom templates are compiled once per process
+_COMPILED: Dict[str, 'Template'] = {}
+
+Node = Callable[[List[Dict[str, Any]], List[str]], None]
+
+
+class TemplateError(ValueError):
+    """A template with unbalanced or mismatched block tags"""
+
+
+# Returned for names that no scope defines
+_MISSING = object()
+
+
+def _lookup(scopes: List[Dict[str, Any]], name: str) -> Any:
+    """Resolve a dotted name from the innermost scope outwards (``_MISSING`` if no scope has it)"""
+    head, _, rest = name.partition('.')
+    for scope in reversed(scopes):
+        if head in scope:
+            value = scope[head]
+            break
+    else:
+        return _MISSING
+    for part in rest.split('.') if rest else []:
+        value = value.get(part, "") if isinstance(value, dict) else getattr(value, part, "")
+    return value
+
+
+def _text(value: Any) -> str:
+    if value is None or value is _MISSING:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _variable(name: str, raw: str) -> Node:
+    def render(scopes, out):
+        value = _lookup(scopes, name)
+        # Unknown names are kept, e.g. Angular interpolation in an inline template
+        out.append(raw if value is _MISSING else _text(value))
+    return render
+
+
+def _literal(text: str) -> Node:
+    def render(scopes, out):
+        out.append(text)
+    return render
+
+
+def _sequence(nodes: List[Node]) -> Node:
+    def render(scopes, out):
+        for node in nodes:
+            node(scopes, out)
+    return render
+
+
+def _each(name: str, body: Node, otherwise: Node) -> Node:
+    def render(scopes, out):
+        items = _lookup(scopes, name)
+        if items is _MISSING:
+            items = None
+        if isinstance(items, dict):
+            items = list(items.values())
+        if not items:
+            otherwise(scopes, out)
+            return
+        last = len(items) - 1
+        for index, item in enumerate(items):
+            scope = dict(item) if isinstance(item, dict) else {}
+            scope.update({"this": item, "@index": index, "@first": index == 0, "@last": index == last})
+            scopes.append(scope)
+            try:
+                body(scopes, out)
+            finally:
+                scopes.pop()
+    return render
+
+
+def _conditional(name: str, body: Node, otherwise: Node, negate: bool) -> Node:
+    def render(scopes, out):
+        value = _lookup(scopes, name)
+        if (value is not _MISSING and bool(value)) != negate:
+            body(scopes, out)
+        else:
+            otherwise(scopes, out)
+    return render
+
+
+def _tokenize(source: str) -> List[Tuple[str, ...]]:
+    """Split a template into text and tag tokens, dropping the lines of standalone block tags"""
+    tokens = []
+    position = 0
+    for match in _TAG_PATTERN.finditer(source):
+        start, end = match.start(), match.end()
+        if match.group(5) is None:
+            line_start = source.rfind('\n', 0, start) + 1
+            line_end = source.find('\n', end)
+            line_end = len(source) if line_end == -1 else line_end
+            if not source[line_start:start].strip() and not source[end:line_end].strip():
+                start = max(line_start, position)
+                end = min(line_end + 1, len(source))
+        if start > position:
+            tokens.append(("text", source[position:start]))
+        if match.group(1):
+            tokens.append((match.group(1), match.group(2), match.group(3)))
+        elif match.group(4):
+            tokens.append(("else",))
+        else:
+            tokens.append(("var", match.group(5), match.group(0)))
+        position = max(position, end)
+    if position < len(source):
+        tokens.append(("text", source[position:]))
+    return tokens
+
+
+class Template:
+    """A template compiled into a tree of render closures"""
+
+    def __init__(self, source: str):
+        self.source = source
+        self._render = self._compile(_tokenize(source))
+
+    def _compile(self, tokens: List[Tuple[str, ...]]) -> Node:
+        # Each open block is (tag, name, nodes before else, nodes after else or None)
+        stack: List[Tuple[str, str, List[Node], Optional[List[Node]]]] = []
+        nodes: List[Node] = []
+        for token in tokens:
+            kind = token[0]
+            if kind == "text":
+                nodes.append(_literal(token[1]))
+            elif kind == "var":
+                nodes.append(_variable(token[1], token[2]))
+            elif kind == "#":
+                if not token[2]:
+                    raise TemplateError(f"{{{{#{token[1]}}}}} needs a variable name")
+                stack.append((token[1], token[2], nodes, None))
+                nodes = []
+            elif kind == "else":
+                if not stack or stack[-1][3] is not None:
+                    raise TemplateError("{{else}} outside of a block")
+                tag, name, outer, _ = stack.pop()
+                stack.append((tag, name, outer, nodes))
+                nodes = []
+            else:
+                if not stack or stack[-1][0] != token[1]:
+                    raise TemplateError(f"Unexpected {{{{/{token[1]}}}}}")
+                tag, name, outer, before_else = stack.pop()
+                body, otherwise = (nodes, []) if before_else is None else (before_else, nodes)
+                if tag == "each":
+                    node = _each(name, _sequence(body), _sequence(otherwise))
+                else:
+                    node = _conditional(name, _sequence(body), _sequence(otherwise), tag == "unless")
+                outer.append(node)
+                nodes = outer
+        if stack:
+            raise TemplateError(f"Unclosed {{{{#{stack[-1][0]} {stack[-1][1]}}}}}")
+        return _sequence(nodes)
+
+    def render(self, context: Dict[str, Any]) -> str:
+        out: List[str] = []
+        self._render([context], out)
+        return "".join(out)
+
+
+def compile_template(source: str) -> Template:
+    """Compiled template for ``source``, reused for identical sources"""
+    template = _COMPILED.get(source)
+    if template is None:
+        template = Template(source)
+        _COMPILED[source] = template
+    return template
+
+
+def render_template(source: str, context: Dict[str, Any]) -> str:
+    return compile_template(source).render(context)
+
+
+def sample_value(type_name: Optional[str]) -> str:
+    """A TypeScript literal usable as a value of ``type_name``"""
+    type_name = (type_name or "").replace(" ", "")
+    if type_name.endswith("[]") or type_name.startswith(("Array<", "ReadonlyArray<")):
+        return "[]"
+    for part in type_name.split("|"):
+        if part in _SAMPLE_VALUES:
+            return _SAMPLE_VALUES[part]
+        if part.startswith(("'", '"')):
+            return part
+    return "{} as any"
+
+
+def import_paths(content: str) -> Dict[str, str]:
+    """Module specifier of every name imported with ``import { ... } from``"""
+    paths = {}
+    for names, path in _IMPORT_PATTERN.findall(content):
+        for name in names.split(','):
+            name = name.split(' as ')[-1].strip()
+            if name:
+                paths[name] = path
+    return paths
+
+
+def build_context(metadata: Dict[str, Any], content: str, related_classes: Dict[str, Dict[str, Any]],
+                  **variables: Any) -> Dict[str, Any]:
+    """Template variables for a component.
+
+    ``related_classes`` maps class names found in related files to their
+    metadata; it supplies the public methods of injected services so that
+    mock providers can stub them. ``variables`` (e.g. ``component_name``)
+    are added as is.
+    """
+    cls = primary_class(metadata) or {}
+    decorator = (cls.get("decorator") or {}).get("properties", {})
+    paths = import_paths(content)
+
+    inputs = [dict(item, sample=sample_value(item.get("type"))) for item in cls.get("inputs", [])]
+    services = []
+    for dependency in cls.get("dependencies", []):
+        service_type = (dependency.get("type") or "").split("<")[0]
+        if not service_type:
+            continue
+        service = related_classes.get(service_type) or {}
+        methods = [method["name"] for method in service.get("methods", [])
+                   if not method["accessor"] and not method["static"]]
+        mock = "mock" + service_type
+        services.append({
+            "name": dependency["name"],
+            "type": service_type,
+            "via": dependency["via"],
+            "path": paths.get(service_type, ""),
+            "mock": mock,
+            "methods": [{"name": name} for name in methods],
+            "method_names": ", ".join(f"'{name}'" for name in methods),
+            "provider": f"{{ provide: {service_type}, useValue: {mock} }}",
+        })
+    methods = [dict(method, arity=len([p for p in method["params"].split(",") if p.strip()]))
+               for method in cls.get("methods", []) if not method["accessor"] and not method["static"]]
+
+    context = {
+        "class_name": cls.get("name", ""),
+        "kind": cls.get("kind") or "",
+        "selector": (decorator.get("selector") or "").strip("'\""),
+        "standalone": decorator.get("standalone") != "false",
+        "inputs": inputs,
+        "outputs": list(cls.get("outputs", [])),
+        "services": services,
+        "methods": methods,
+    }
+    context.update(variables)
+    return context
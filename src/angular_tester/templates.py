@@ -0,0 +1,141 @@
+"""
+Built-in spec templates for each kind of Angular artifact
+
+Templates use the same ``{{component_name}}``, ``{{file_name}}`` and
+``{{imports}}`` placeholders as ``custom_templates`` in the configuration,
+and are rendered by the same engine (see ``template_engine``).
+"""
+
+from typing import Dict
+
+
+COMPONENT_TEMPLATE = """import { ComponentFixture, TestBed } from '@angular/core/testing';
+{{imports}}
+
+describe('{{component_name}}', () => {
+  let component: {{component_name}};
+  let fixture: ComponentFixture<{{component_name}}>;
+
+  beforeEach(async () => {
+    await TestBed.configureTestingModule({
+      imports: [{{component_name}}]
+    })
+    .compileComponents();
+
+    fixture = TestBed.createComponent({{component_name}});
+    component = fixture.componentInstance;
+    fixture.detectChanges();
+  });
+
+  it('should create', () => {
+    expect(component).toBeTruthy();
+  });
+});"""
+
+SERVICE_TEMPLATE = """import { TestBed } from '@angular/core/testing';
+{{imports}}
+
+describe('{{component_name}}', () => {
+  let service: {{component_name}};
+
+  beforeEach(() => {
+    TestBed.configureTestingModule({
+      providers: [{{component_name}}]
+    });
+    service = TestBed.inject({{component_name}});
+  });
+
+  it('should be created', () => {
+    expect(service).toBeTruthy();
+  });
+});"""
+
+PIPE_TEMPLATE = """import { TestBed } from '@angular/core/testing';
+{{imports}}
+
+describe('{{component_name}}', () => {
+  let pipe: {{component_name}};
+
+  beforeEach(() => {
+    TestBed.configureTestingModule({
+      providers: [{{component_name}}]
+    });
+    pipe = TestBed.inject({{component_name}});
+  });
+
+  it('should create an instance', () => {
+    expect(pipe).toBeTruthy();
+  });
+});"""
+
+DIRECTIVE_TEMPLATE = """import { ElementRef } from '@angular/core';
+import { TestBed } from '@angular/core/testing';
+{{imports}}
+
+describe('{{component_name}}', () => {
+  let directive: {{component_name}};
+
+  beforeEach(() => {
+    TestBed.configureTestingModule({
+      providers: [
+        {{component_name}},
+        { provide: ElementRef, useValue: new ElementRef(document.createElement('div')) }
+      ]
+    });
+    directive = TestBed.inject({{component_name}});
+  });
+
+  it('should create an instance', () => {
+    expect(directive).toBeTruthy();
+  });
+});"""
+
+GUARD_TEMPLATE = """import { TestBed } from '@angular/core/testing';
+{{imports}}
+
+describe('{{component_name}}', () => {
+  let guard: {{component_name}};
+
+  beforeEach(() => {
+    TestBed.configureTestingModule({
+      providers: [{{component_name}}]
+    });
+    guard = TestBed.inject({{component_name}});
+  });
+
+  it('should be created', () => {
+    expect(guard).toBeTruthy();
+  });
+});"""
+
+# Functional guards (``export const authGuard: CanActivateFn = ...``) are
+# exercised through an injection context rather than TestBed.inject
+FUNCTIONAL_GUARD_TEMPLATE = """import { TestBed } from '@angular/core/testing';
+import { {{guard_type}} } from '@angular/router';
+{{imports}}
+
+describe('{{component_name}}', () => {
+  const executeGuard: {{guard_type}} = (...guardParameters) =>
+      TestBed.runInInjectionContext(() => {{component_name}}(...guardParameters));
+
+  beforeEach(() => {
+    TestBed.configureTestingModule({});
+  });
+
+  it('should be created', () => {
+    expect(executeGuard).toBeTruthy();
+  });
+});"""
+
+BASIC_TEMPLATES: Dict[str, str] = {
+    "component": COMPONENT_TEMPLATE,
+    "service": SERVICE_TEMPLATE,
+    "pipe": PIPE_TEMPLATE,
+    "directive": DIRECTIVE_TEMPLATE,
+    "guard": GUARD_TEMPLATE,
+}
+
+
+def get_basic_template(kind: str) -> str:
+    """Return the built-in template for an artifact kind (components by default)"""
+    return BASIC_TEMPLATES.get(kind, COMPONENT_TEMPLATE)
@@ -0,0 +1,105 @@
+"""
+Incremental TypeScript pre-flight check of generated spec files
+"""
+
+import os
+import re
+import json
+import subprocess
+from typing import Any, Dict, List, Optional
+
+
+_DIAGNOSTIC_PATTERN = re.compile(r'^(.+?)\((\d+),(\d+)\): error (TS\d+): (.*)$', re.MULTILINE)
+_JSON_COMMENT_PATTERN = re.compile(r'("(?:\\.|[^"\\])*")|//[^\n]*|/\*.*?\*/', re.DOTALL)
+_TRAILING_COMMA_PATTERN = re.compile(r',(\s*[}\]])')
+
+
+def load_tsconfig(path: str) -> Dict[str, Any]:
+    """Load a tsconfig file, which may contain comments and trailing commas"""
+    with open(path, 'r') as f:
+        text = f.read()
+    text = _JSON_COMMENT_PATTERN.sub(lambda match: match.group(1) or '', text)
+    text = _TRAILING_COMMA_PATTERN.sub(r'\1', text)
+    return json.loads(text)
+
+
+class SpecTypeChecker:
+    """Type-checks a set of spec files with ``tsc --noEmit`` before Karma runs.
+
+    A derived tsconfig restricts compilation to the given specs (plus the
+    global declaration files of the spec tsconfig) and keeps a
+    ``.tsbuildinfo`` file in the cache directory, so repeated checks only
+    re-analyse what changed.
+    """
+
+    def __init__(self, project_dir: str = ".", tsconfig: str = "tsconfig.spec.json",
+                 cache_dir: str = ".angular-tester", timeout: int = 120):
+        self.project_dir = os.path.abspath(project_dir)
+        self.tsconfig = os.path.join(self.project_dir, tsconfig)
+        self.cache_dir = os.path.join(self.project_dir, cache_dir)
+        self.timeout = timeout
+
+    def write_preflight_config(self, spec_files: List[str]) -> str:
+        """Write the derived tsconfig for ``spec_files`` and return its path"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        base_config = load_tsconfig(self.tsconfig)
+        # Keep global typings (e.g. src/**/*.d.ts) that specs may rely on
+        declarations = [
+            os.path.join(os.path.dirname(self.tsconfig), pattern)
+            for pattern in base_config.get("include", []) if pattern.endswith(".d.ts")
+        ]
+
+        preflight_config = {
+            "extends": self.tsconfig,
+            "compilerOptions": {
+                "noEmit": True,
+                "incremental": True,
+                "tsBuildInfoFile": os.path.join(self.cache_dir, "preflight.tsbuildinfo"),
+            },
+            "files": [os.path.abspath(spec_file) for spec_file in spec_files],
+            "include": declarations,
+        }
+        config_path = os.path.join(self.cache_dir, "tsconfig.preflight.json")
+        with open(config_path, 'w') as f:
+            json.dump(preflight_config, f, indent=2)
+        return config_path
+
+    def check(self, spec_files: List[str]) -> Optional[Dict[str, List[str]]]:
+        """Type-check ``spec_files`` and return their errors keyed by spec path.
+
+        Returns None when the check cannot run (no TypeScript compiler or no
+        spec tsconfig), in which case callers should carry on without it.
+        """
+        if not spec_files or not os.path.exists(self.tsconfig):
+            return None
+
+        config_path = self.write_preflight_config(spec_files)
+        try:
+            result = subprocess.run(
+                ['npx', '--no-install', 'tsc', '-p', config_path, '--pretty', 'false'],
+                cwd=self.project_dir,
+                capture_output=True,
+                text=True,
+                timeout=self.timeout
+            )
+        except (FileNotFoundError, subprocess.TimeoutExpired) as e:
+            print(f"TypeScript pre-flight check unavailable: {str(e)}")
+            return None
+
+        errors = self.parse_diagnostics(result.stdout + result.stderr, spec_files)
+        if result.returncode != 0 and not errors and "error TS" not in result.stdout:
+            # tsc itself failed to start (e.g. not installed in node_modules)
+            print(f"TypeScript pre-flight check failed to run: {result.stderr.strip() or result.stdout.strip()}")
+            return None
+        return errors
+
+    def parse_diagnostics(self, output: str, spec_files: List[str]) -> Dict[str, List[str]]:
+        """Group tsc diagnostics by spec file, ignoring errors in other files"""
+        specs = {os.path.abspath(spec_file): spec_file for spec_file in spec_files}
+        errors: Dict[str, List[str]] = {}
+        for match in _DIAGNOSTIC_PATTERN.finditer(output):
+            file_path = os.path.abspath(os.path.join(self.project_dir, match.group(1).strip()))
+            if file_path in specs:
+                message = f"line {match.group(2)}: {match.group(4)} {match.group(5)}"
+                errors.setdefault(specs[file_path], []).append(message)
+        return errors
@@ -0,0 +1,111 @@
+"""
+Background warm-up of the Angular test build
+"""
+
+import os
+import re
+import threading
+import subprocess
+from typing import Dict, List, Optional
+
+
+# Forces Angular's persistent build cache on, including on CI where it is
+# disabled by default, so the warm-up and the real run share `.angular/cache`
+CACHE_ENVIRONMENT = {"NG_PERSISTENT_BUILD_CACHE": "1"}
+
+# Output of `ng test` once the test bundle is compiled (esbuild, webpack) or,
+# failing that, once Karma starts executing specs
+BUILD_DONE_PATTERN = re.compile(r'bundle generation complete|Build at:|Connected on socket|Executed \d+ of \d+')
+
+
+def build_environment(chrome_bin: Optional[str] = None) -> Dict[str, str]:
+    """Environment for `ng test` processes that should share the build cache
+
+    ``chrome_bin`` is exported as ``CHROME_BIN`` for Karma's Chrome launcher.
+    """
+    env = os.environ.copy()
+    env.update(CACHE_ENVIRONMENT)
+    if chrome_bin:
+        env['CHROME_BIN'] = chrome_bin
+    return env
+
+
+class BuildWarmer:
+    """Runs a throwaway `ng test` build while specs are still being generated.
+
+    Generation mostly waits on the network, so compiling the application,
+    vendor bundles and existing specs in the meantime populates the
+    persistent build cache. ``command`` should be the real run's command,
+    since coverage instrumentation changes what gets built. The process is
+    stopped as soon as the build is done, before the existing suite runs in
+    the browser, so the real test run only pays an incremental compile.
+    """
+
+    def __init__(self, command: List[str], cwd: str = ".", chrome_bin: Optional[str] = None):
+        self.command = command
+        self.cwd = cwd
+        self.chrome_bin = chrome_bin
+        self.process: Optional[subprocess.Popen] = None
+        # Set once the build is done or the process has exited
+        self.built = threading.Event()
+        self.stopped = False
+
+    def start(self) -> bool:
+        """Start the warm-up in the background; returns False if it could not start"""
+        try:
+            self.process = subprocess.Popen(
+                self.command,
+                cwd=self.cwd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                env=build_environment(self.chrome_bin)
+            )
+        except OSError as e:
+            print(f"Could not start build warm-up: {str(e)}")
+            self.process = None
+            return False
+        threading.Thread(target=self._watch_output, daemon=True).start()
+        return True
+
+    def _watch_output(self) -> None:
+        """Stop the process once the build is done instead of letting it run the suite"""
+        try:
+            for line in self.process.stdout:
+                if BUILD_DONE_PATTERN.search(line):
+                    self.built.set()
+                    self.cancel()
+                    break
+            # End of output: reap the process so its exit code is known
+            self.process.wait(timeout=10)
+        except (OSError, ValueError, subprocess.TimeoutExpired):
+            pass
+        finally:
+            self.built.set()
+
+    @property
+    def running(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def wait(self, timeout: float) -> Optional[int]:
+        """Wait until the warm-up build is done, stopping it after ``timeout`` seconds.
+
+        Returns the exit code if the process ended on its own before the build
+        was done (e.g. a compile error), None otherwise.
+        """
+        if self.process is None:
+            return None
+        if not self.built.wait(timeout):
+            print("Build warm-up did not finish in time, stopping it")
+        self.cancel()
+        return None if self.stopped else self.process.poll()
+
+    def cancel(self) -> None:
+        """Stop the warm-up if it is still running"""
+        if self.running:
+            self.stopped = True
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
@@ -0,0 +1,169 @@
+"""
+File watching for the interactive --watch mode
+"""
+
+import os
+import time
+import threading
+from typing import Callable, Dict, Iterable, List, Set, Tuple
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # optional dependency, polling is used without it
+    Observer = None
+
+
+def is_watched(path: str, test_suffix: str = ".spec.ts") -> bool:
+    """Whether a change to ``path`` can affect generated specs.
+
+    Specs are excluded so that the specs written by a cycle do not trigger
+    the next one.
+    """
+    return path.endswith('.ts') and not path.endswith(test_suffix) and not path.endswith('.d.ts')
+
+
+def snapshot(directory: str, test_suffix: str = ".spec.ts") -> Dict[str, Tuple[int, int]]:
+    """Modification time and size of every watched file under ``directory``"""
+    files = {}
+    for root, dirs, names in os.walk(directory):
+        dirs[:] = [name for name in dirs if name != 'node_modules' and not name.startswith('.')]
+        for name in names:
+            path = os.path.join(root, name)
+            if not is_watched(path, test_suffix):
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files[os.path.normpath(path)] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+
+def changed_paths(before: Dict[str, Tuple[int, int]], after: Dict[str, Tuple[int, int]]) -> Set[str]:
+    """Paths added, removed or modified between two snapshots"""
+    return {path for path in set(before) | set(after) if before.get(path) != after.get(path)}
+
+
+class PollingWatcher:
+    """Detects changes by comparing directory snapshots"""
+
+    def __init__(self, directory: str, test_suffix: str = ".spec.ts"):
+        self.directory = directory
+        self.test_suffix = test_suffix
+        self.state = snapshot(directory, test_suffix)
+
+    def poll(self) -> Set[str]:
+        current = snapshot(self.directory, self.test_suffix)
+        changes = changed_paths(self.state, current)
+        self.state = current
+        return changes
+
+    def stop(self) -> None:
+        pass
+
+
+class WatchdogWatcher:
+    """Collects native filesystem events (inotify on Linux) through watchdog"""
+
+    def __init__(self, directory: str, test_suffix: str = ".spec.ts"):
+        self.test_suffix = test_suffix
+        self._changes: Set[str] = set()
+        self._lock = threading.Lock()
+
+        watcher = self
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if event.is_directory:
+                    return
+                watcher._add(event.src_path)
+                watcher._add(getattr(event, 'dest_path', '') or '')
+
+        self.observer = Observer()
+        self.observer.schedule(Handler(), directory, recursive=True)
+        self.observer.start()
+
+    def _add(self, path: str) -> None:
+        if path and is_watched(path, self.test_suffix) and 'node_modules' not in path.split(os.sep):
+            with self._lock:
+                self._changes.add(os.path.normpath(path))
+
+    def poll(self) -> Set[str]:
+        with self._lock:
+            changes, self._changes = self._changes, set()
+        return changes
+
+    def stop(self) -> None:
+        self.observer.stop()
+        self.observer.join()
+
+
+def create_watcher(directory: str, test_suffix: str = ".spec.ts"):
+    """Use native events when watchdog is installed, polling otherwise"""
+    if Observer is not None:
+        try:
+            return WatchdogWatcher(directory, test_suffix)
+        except OSError as e:
+            print(f"Native file watching unavailable ({str(e)}), falling back to polling")
+    return PollingWatcher(directory, test_suffix)
+
+
+def wait_for_changes(watcher, interval: float, debounce: float,
+                     sleep: Callable[[float], None] = time.sleep) -> Set[str]:
+    """Block until files change, then until they stay quiet for ``debounce`` seconds.
+
+    Editors and formatters often write a file several times in a row (or
+    several files at once); these are all returned as one batch.
+    """
+    changes: Set[str] = set()
+    while not changes:
+        sleep(interval)
+        changes = watcher.poll()
+    while True:
+        sleep(debounce)
+        more = watcher.poll()
+        if not more:
+            return changes
+        changes |= more
+
+
+class ImportGraph:
+    """In-memory map from each component to the local files it imports, transitively.
+
+    Closures are computed once and only recomputed for components affected
+    by a change, so a cycle costs work proportional to the change.
+    ``is_component`` decides which added files are tracked as components.
+    """
+
+    def __init__(self, closure: Callable[[str], Iterable[str]],
+                 is_component: Callable[[str], bool] = lambda path: path.endswith('.component.ts')):
+        self.closure = closure
+        self.is_component = is_component
+        self.closures: Dict[str, Set[str]] = {}
+
+    def update(self, component_file: str) -> None:
+        key = os.path.normpath(component_file)
+        self.closures[key] = {os.path.normpath(path) for path in self.closure(component_file)} | {key}
+
+    def remove(self, component_file: str) -> None:
+        self.closures.pop(os.path.normpath(component_file), None)
+
+    def apply(self, changes: Iterable[str]) -> List[str]:
+        """Track added and removed components, then refresh and return the affected ones"""
+        changes = [os.path.normpath(path) for path in changes]
+        for path in changes:
+            if not os.path.exists(path):
+                self.remove(path)
+            elif self.is_component(path):
+                self.update(path)
+        affected = self.affected(changes)
+        # Edits may have added or removed imports
+        for component_file in affected:
+            self.update(component_file)
+        return affected
+
+    def affected(self, changes: Iterable[str]) -> List[str]:
+        """Components whose import closure contains one of ``changes``"""
+        changes = {os.path.normpath(path) for path in changes}
+        return sorted(component for component, files in self.closures.items() if files & changes)
@@ -0,0 +1,83 @@
+"""
+Discovery of the projects of an Angular CLI or Nx workspace
+"""
+
+import os
+import json
+from typing import Any, Dict, List, Optional
+
+
+# Directories that never contain workspace projects
+SKIPPED_DIRS = {"node_modules", "dist", ".angular", ".nx", ".git", "coverage", "tmp"}
+
+
+def _load_json(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _project(name: str, definition: Dict[str, Any], root: str, workspace_root: str) -> Dict[str, Any]:
+    """Normalize an angular.json or project.json definition"""
+    project_root = definition.get("root", root) or ""
+    targets = definition.get("architect") or definition.get("targets") or {}
+    return {
+        "name": name,
+        "root": project_root,
+        "source_root": os.path.join(workspace_root, definition.get("sourceRoot") or os.path.join(project_root, "src")),
+        "type": definition.get("projectType", "application"),
+        "test": targets.get("test"),
+    }
+
+
+def discover_projects(workspace_root: str = ".") -> List[Dict[str, Any]]:
+    """Projects declared in ``angular.json`` and in Nx ``project.json`` files, sorted by name.
+
+    ``angular.json`` entries may be inline definitions or, in older Nx
+    workspaces, paths to a directory holding a ``project.json``. A project
+    defined in both places is taken from ``angular.json``.
+    """
+    projects: Dict[str, Dict[str, Any]] = {}
+    angular_json = _load_json(os.path.join(workspace_root, "angular.json")) or {}
+    for name, definition in (angular_json.get("projects") or {}).items():
+        if isinstance(definition, str):
+            root = definition
+            definition = _load_json(os.path.join(workspace_root, root, "project.json")) or {}
+            projects[name] = _project(name, definition, root, workspace_root)
+        elif isinstance(definition, dict):
+            projects[name] = _project(name, definition, "", workspace_root)
+
+    for current, dirs, files in os.walk(workspace_root):
+        dirs[:] = sorted(d for d in dirs if d not in SKIPPED_DIRS and not d.startswith('.'))
+        if "project.json" not in files:
+            continue
+        definition = _load_json(os.path.join(current, "project.json"))
+        if not definition:
+            continue
+        root = os.path.relpath(current, workspace_root)
+        name = definition.get("name") or os.path.basename(os.path.abspath(current))
+        if name not in projects:
+            projects[name] = _project(name, definition, "" if root == "." else root, workspace_root)
+    return [projects[name] for name in sorted(projects)]
+
+
+def select_projects(projects: List[Dict[str, Any]], names: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Projects with a test target, limited to ``names`` when given"""
+    return [project for project in projects
+            if project["test"] and (not names or project["name"] in names)]
+
+
+def format_report(reports: List[Dict[str, Any]]) -> str:
+    """Table of per-project results"""
+    lines = [f"{'project':<30} {'specs':>6} {'tests':>6} {'coverage':>9} {'threshold':>9} {'result':>7}"]
+    for report in reports:
+        coverage = f"{report['coverage']:.1f}%" if report["coverage"] is not None else "-"
+        lines.append(
+            f"{report['project']:<30} {report['specs']:>6} {'ok' if report['tests_passed'] else 'fail':>6} "
+            f"{coverage:>9} {report['threshold']:>8}% {'pass' if report['passed'] else 'FAIL':>7}"
+        )
+    passed = sum(1 for report in reports if report["passed"])
+    lines.append(f"{passed}/{len(reports)} projects passed")
+    return "\n".join(lines)
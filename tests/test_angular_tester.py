@@ -100,9 +100,10 @@ class TestAngularTester:
         assert "describe(" in result
         assert "ComponentFixture" in result
 
+    @patch("angular_tester.main.probe_environment", return_value={"browser": "/usr/bin/chromium", "cached": True})
     @patch("angular_tester.main.os.path.exists")
     @patch("angular_tester.main.subprocess.run")
-    def test_run_tests_success(self, mock_subprocess, mock_exists):
+    def test_run_tests_success(self, mock_subprocess, mock_exists, mock_probe):
         tester = AngularTester.__new__(AngularTester)
         mock_exists.return_value = True
         
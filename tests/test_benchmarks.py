@@ -0,0 +1,51 @@
+import pytest
+import os
+import sys
+import argparse
+import urllib.request
+import urllib.error
+
+# Add src and benchmarks directories to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from run_benchmarks import compare, run_benchmarks
+from stub_llm import StubLLMServer
+from workspace import generate_workspace
+
+
+class TestBenchmarkSuite:
+    """Smoke tests for the benchmark tooling"""
+
+    def test_generate_workspace(self, tmp_path):
+        """Test that components import the top layer of shared services"""
+        counts = generate_workspace(str(tmp_path), components=25, fan_out=2, depth=2, per_directory=10)
+        assert counts == {"components": 25, "shared": 20}
+        component = tmp_path / "src" / "app" / "feature-2" / "item-24" / "item-24.component.ts"
+        content = component.read_text()
+        assert content.count("from '../../shared/layer1/") == 2
+        assert "export class Item24Component" in content
+
+    def test_stub_llm_errors(self):
+        """Test that the stub server fails the configured fraction of requests"""
+        with StubLLMServer(error_rate=1.0) as stub:
+            request = urllib.request.Request(stub.url, data=b'{"prompt": "x"}', method="POST")
+            with pytest.raises(urllib.error.HTTPError) as error:
+                urllib.request.urlopen(request)
+            assert error.value.code == 500
+            assert stub.requests == 1
+
+    def test_run_small_benchmark(self, tmp_path, monkeypatch):
+        """Test a complete benchmark run on a tiny workspace"""
+        monkeypatch.chdir(tmp_path)
+        # run_benchmarks points LLM_API_URL at the stub server
+        monkeypatch.setenv("LLM_API_URL", "")
+        args = argparse.Namespace(components=10, fan_out=2, depth=2, sample=5, latency=0.0,
+                                  error_rate=0.5, concurrency=2, seed=1)
+        results = run_benchmarks(args, str(tmp_path / "workspace"))
+        assert [result["phase"] for result in results] == ["scan", "context", "prompt", "process"]
+        assert results[-1]["llm_requests"] == 10
+        assert len(list((tmp_path / "workspace").rglob("*.component.spec.ts"))) == 10
+
+        baseline = {"scan": {"throughput": results[0]["throughput"] * 10, "peak_mb": 1000}}
+        assert len(compare(results, baseline, 0.25)) == 1
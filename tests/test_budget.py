@@ -0,0 +1,96 @@
+import pytest
+import os
+import sys
+import json
+from unittest.mock import MagicMock
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from angular_tester.main import AngularTester
+from angular_tester.budget import TokenBudget, rank_by_gain
+
+
+COMPONENT = """
+@Component({ selector: 'app-%s', template: '' })
+export class %sComponent {
+  @Input() value = 0;
+  save() { return this.value; }
+}
+"""
+
+
+class TestTokenBudget:
+    """Tests for the token budget and gain-per-token ranking"""
+
+    def test_rank_by_gain(self):
+        """Test that free components come first, then the best gain per token"""
+        estimates = {
+            "a": {"gain": 10, "cost": 1000},
+            "b": {"gain": 10, "cost": 100},
+            "c": {"gain": 1, "cost": 0},
+            "d": {"gain": 0, "cost": 50},
+        }
+        assert rank_by_gain(estimates) == ["c", "b", "a", "d"]
+
+    def test_reserve_and_spend(self):
+        """Test that reservations which do not fit are skipped and recorded"""
+        budget = TokenBudget(1000)
+        assert budget.reserve("a", 600)
+        assert not budget.reserve("b", 600)
+        budget.spend(300)
+        budget.release("a")
+        assert budget.reserve("c", 600)
+        assert budget.skipped == ["b"]
+
+        budget.spend(800)
+        assert budget.allows("c")
+        assert not budget.allows("d")
+
+
+class TestBudgetScheduling:
+    """Tests for processing components within a token budget"""
+
+    def _project(self, tmp_path, monkeypatch, limit):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "src").mkdir()
+        for name in ("Small", "Large"):
+            (tmp_path / "src" / f"{name.lower()}.component.ts").write_text(COMPONENT % (name.lower(), name))
+        # The large component's file is mostly covered already
+        (tmp_path / "coverage").mkdir()
+        (tmp_path / "coverage" / "coverage-final.json").write_text(json.dumps({
+            "src/large.component.ts": {"s": {"0": 1, "1": 0}, "statementMap": {
+                "0": {"start": {"line": 1}, "end": {"line": 1}}, "1": {"start": {"line": 2}, "end": {"line": 2}}
+            }, "b": {}, "branchMap": {}, "f": {}},
+        }))
+        tester = AngularTester.__new__(AngularTester)
+        tester.llm_api_url = "https://test.api.com"
+        tester.coverage_threshold = 80
+        tester.config = {"token_budget": limit, "max_tokens": 500, "typecheck_specs": False,
+                         "journal": False, "history": False, "few_shot_examples": 0}
+        return tester
+
+    def test_budget_skips_lowest_gain_per_token(self, tmp_path, monkeypatch, capsys):
+        """Test that the component with the least expected gain is skipped and reported"""
+        tester = self._project(tmp_path, monkeypatch, limit=700)
+
+        def generate(component_file, feedback):
+            tester.token_budget.spend(500)
+            return "describe('X', () => { it('works', () => {}); });"
+        tester.generate_test_content = MagicMock(side_effect=generate)
+
+        assert tester.process_components("src")
+
+        tester.generate_test_content.assert_called_once_with("src/small.component.ts", None)
+        assert tester.token_budget.skipped == ["src/large.component.ts"]
+        output = capsys.readouterr().out
+        assert "Skipped 1 components" in output
+        assert "src/large.component.ts" in output
+
+    def test_generation_charges_reported_usage(self, tmp_path, monkeypatch):
+        """Test that the tokens reported by the API are charged to the budget"""
+        tester = self._project(tmp_path, monkeypatch, limit=10000)
+        tester.token_budget = TokenBudget(10000)
+        tester._spend_tokens({"prompt_tokens": 120, "completion_tokens": 80}, "x" * 4000, "")
+        tester._spend_tokens(None, "x" * 400, "y" * 400)
+        assert tester.token_budget.spent == 400
@@ -0,0 +1,128 @@
+import pytest
+import os
+import sys
+from unittest.mock import patch, MagicMock
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from angular_tester.main import AngularTester
+from angular_tester.classifier import artifact_kind, complexity, is_trivial
+from angular_tester.config import ConfigManager
+from angular_tester.metadata import MetadataExtractor
+
+
+SHELL_COMPONENT = """
+@Component({ selector: 'app-footer', template: '<footer>Footer</footer>' })
+export class FooterComponent {}
+"""
+
+FUNCTIONAL_GUARD = """
+export const authGuard: CanActivateFn = (route, state) => {
+  return inject(AuthService).isLoggedIn();
+};
+"""
+
+
+class TestClassifier:
+    """Tests for artifact classification"""
+
+    def setup_method(self):
+        self.extractor = MetadataExtractor()
+
+    def test_artifact_kind(self):
+        """Test kind detection from decorators, guard types and file names"""
+        pipe = self.extractor.extract("@Pipe({ name: 'x' })\nexport class XPipe { transform(v: string) { return v; } }")
+        class_guard = self.extractor.extract("@Injectable()\nexport class AuthGuard implements CanActivate { canActivate() { return true; } }")
+
+        assert artifact_kind("x.pipe.ts", pipe) == "pipe"
+        assert artifact_kind("auth.guard.ts", class_guard) == "guard"
+        assert artifact_kind("auth.guard.ts", self.extractor.extract(FUNCTIONAL_GUARD)) == "guard"
+        assert artifact_kind("other.directive.ts", self.extractor.extract("")) == "directive"
+
+    def test_is_trivial(self):
+        """Test that only members-free decorated classes are trivial"""
+        with_input = "@Component({})\nexport class A { @Input() name: string = ''; }"
+        with_method = "@Component({})\nexport class A { ngOnInit(): void {} }"
+
+        assert is_trivial(self.extractor.extract(SHELL_COMPONENT))
+        assert not is_trivial(self.extractor.extract(with_input))
+        assert not is_trivial(self.extractor.extract(with_method))
+        assert not is_trivial(self.extractor.extract(FUNCTIONAL_GUARD))
+
+
+class TestTrivialRouting:
+    """Tests for skipping the LLM for trivial artifacts"""
+
+    def _write(self, tmp_path, name, content):
+        path = tmp_path / name
+        path.write_text(content)
+        return str(path)
+
+    @patch("angular_tester.main.requests.post")
+    def test_trivial_component_skips_llm(self, mock_post, tmp_path):
+        """Test that trivial components are rendered locally and counted"""
+        tester = AngularTester.__new__(AngularTester)
+        tester.llm_api_url = "https://test.api.com"
+        component_file = self._write(tmp_path, "footer.component.ts", SHELL_COMPONENT)
+
+        result = tester.generate_test_content(component_file)
+
+        mock_post.assert_not_called()
+        assert tester.llm_calls_avoided == 1
+        assert "TestBed.createComponent(FooterComponent)" in result
+        assert "import { FooterComponent } from './footer.component';" in result
+
+    @patch("angular_tester.main.requests.post")
+    def test_trivial_routing_can_be_disabled(self, mock_post, tmp_path):
+        """Test that the LLM is still called when routing is disabled"""
+        tester = AngularTester.__new__(AngularTester)
+        tester.llm_api_url = "https://test.api.com"
+        tester.config = {"skip_llm_for_trivial": False}
+        component_file = self._write(tmp_path, "footer.component.ts", SHELL_COMPONENT)
+        mock_post.return_value = MagicMock(status_code=500, text="error")
+
+        tester.generate_test_content(component_file)
+        mock_post.assert_called_once()
+
+    def test_basic_test_content_per_kind(self, tmp_path):
+        """Test that the basic template matches the artifact kind"""
+        tester = AngularTester.__new__(AngularTester)
+        service_file = self._write(tmp_path, "data.service.ts", "@Injectable({ providedIn: 'root' })\nexport class DataService {}")
+        guard_file = self._write(tmp_path, "auth.guard.ts", FUNCTIONAL_GUARD)
+
+        service_spec = tester.generate_basic_test_content(service_file)
+        guard_spec = tester.generate_basic_test_content(guard_file)
+
+        assert "service = TestBed.inject(DataService);" in service_spec
+        assert "ComponentFixture" not in service_spec
+        assert "const executeGuard: CanActivateFn" in guard_spec
+        assert "import { authGuard } from './auth.guard';" in guard_spec
+
+    @patch("angular_tester.main.requests.post")
+    def test_routing_rules_pick_model_and_budget(self, mock_post, tmp_path):
+        """Test that a small component is sent to the routed endpoint with a short budget"""
+        tester = AngularTester.__new__(AngularTester)
+        tester.llm_api_url = "https://test.api.com"
+        tester.config_manager = ConfigManager()
+        tester.config_manager.config.update({
+            "skip_llm_for_trivial": False,
+            "routing_rules": [{"when": {"max_loc": 10}, "llm_api_url": "https://small.api.com",
+                               "model": "small", "max_tokens": 500}],
+        })
+        tester.config = tester.config_manager.config
+        component_file = self._write(tmp_path, "footer.component.ts", SHELL_COMPONENT)
+        mock_post.return_value = MagicMock(status_code=500, text="error")
+
+        tester.generate_test_content(component_file)
+
+        assert mock_post.call_args[0][0] == "https://small.api.com"
+        request = mock_post.call_args[1]["json"]
+        assert (request["model"], request["max_tokens"], request["temperature"]) == ("small", 500, 0.3)
+
+    def test_complexity(self):
+        """Test the size measures used for routing"""
+        extractor = MetadataExtractor()
+        source = "@Component({ selector: 'x' })\nexport class XComponent {\n\n  @Input() name = '';\n  save() {}\n}"
+        measures = complexity(extractor.extract(source), source)
+        assert measures == {"loc": 5, "inputs": 1, "outputs": 0, "dependencies": 0, "methods": 1}
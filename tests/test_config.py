@@ -92,4 +92,110 @@ class TestConfigManager:
         
         # Test non-existing value with default
         unknown = config_manager.get('unknown_key', 'default_value')
-        assert unknown == 'default_value'
\ No newline at end of file
+        assert unknown == 'default_value'
+    
+    def test_route_by_complexity(self):
+        """Test that the first matching routing rule overrides the global LLM settings"""
+        config_manager = ConfigManager()
+        config_manager.config["routing_rules"] = [
+            {"when": {"max_loc": 40, "max_methods": 2}, "model": "small", "max_tokens": 600},
+            {"when": {"min_dependencies": 3}, "llm_api_url": "https://large.api.com", "temperature": 0.1},
+        ]
+        
+        small = config_manager.route({"loc": 20, "methods": 1})
+        large = config_manager.route({"loc": 900, "methods": 30, "dependencies": 5})
+        default = config_manager.route({"loc": 100, "methods": 1, "dependencies": 1})
+        
+        assert small == {"llm_api_url": None, "model": "small", "max_tokens": 600, "temperature": 0.3}
+        assert large == {"llm_api_url": "https://large.api.com", "model": None, "max_tokens": 2000, "temperature": 0.1}
+        assert default == {"llm_api_url": None, "model": None, "max_tokens": 2000, "temperature": 0.3}
+
+
+class TestHierarchicalConfig:
+    """Tests for per-directory config files and precompiled file patterns"""
+
+    def _write(self, directory, name, data):
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / name).write_text(json.dumps(data))
+
+    def test_nested_configs_override_root(self, tmp_path):
+        """Test that config files below the root override it for the files below them"""
+        self._write(tmp_path, ".angulartesterrc", {"max_tokens": 3000, "custom_templates": {"service": "root"}})
+        self._write(tmp_path / "libs" / "ui", ".angulartesterrc.json",
+                    {"test_file_suffix": ".test.ts", "custom_templates": {"CardComponent": "card"}})
+        config_manager = ConfigManager()
+        config_manager.load_config(str(tmp_path))
+
+        root = config_manager.config_for(str(tmp_path / "apps" / "app.component.ts"))
+        nested = config_manager.config_for(str(tmp_path / "libs" / "ui" / "card" / "card.component.ts"))
+
+        assert root is config_manager.config and root["test_file_suffix"] == ".spec.ts"
+        assert nested["test_file_suffix"] == ".test.ts" and nested["max_tokens"] == 3000
+        assert nested["custom_templates"] == {"service": "root", "CardComponent": "card"}
+        assert config_manager.config_for(str(tmp_path / "libs" / "ui" / "card" / "x.ts")) is nested
+
+    def test_nested_configs_read_once(self, tmp_path):
+        """Test that resolved configs are cached per directory"""
+        self._write(tmp_path / "lib", ".angulartesterrc", {"max_tokens": 100})
+        config_manager = ConfigManager()
+        config_manager.load_config(str(tmp_path))
+        with patch("angular_tester.config.os.listdir", wraps=os.listdir) as listdir:
+            for index in range(50):
+                config_manager.config_for(str(tmp_path / "lib" / f"c{index}.component.ts"))
+        assert listdir.call_count == 1
+
+    def test_yaml_config(self, tmp_path):
+        """Test that YAML config files are parsed as YAML"""
+        (tmp_path / ".angulartesterrc.yaml").write_text("coverage_threshold: 95\nincluded_files:\n  - '*.pipe.ts'\n")
+        config = ConfigManager().load_config(str(tmp_path))
+        assert config["coverage_threshold"] == 95
+        assert config["included_files"] == ["*.pipe.ts"]
+
+    def test_included_and_excluded_files(self, tmp_path):
+        """Test that each layer's patterns apply to the files below it"""
+        self._write(tmp_path, ".angulartesterrc", {"included_files": ["*.component.ts", "*.service.ts"],
+                                                  "excluded_files": ["legacy/**", "/src/generated.service.ts"]})
+        self._write(tmp_path / "libs" / "ui", ".angulartesterrc", {"excluded_files": ["*.service.ts"]})
+        config_manager = ConfigManager()
+        config_manager.load_config(str(tmp_path))
+
+        assert config_manager.is_included(str(tmp_path / "src" / "user.service.ts"))
+        assert config_manager.is_included(str(tmp_path / "src" / "app" / "user.component.ts"))
+        assert not config_manager.is_included(str(tmp_path / "src" / "user.pipe.ts"))
+        assert not config_manager.is_included(str(tmp_path / "src" / "legacy" / "old.component.ts"))
+        assert not config_manager.is_included(str(tmp_path / "src" / "generated.service.ts"))
+        assert config_manager.is_included(str(tmp_path / "app" / "src" / "generated.service.ts"))
+        assert not config_manager.is_included(str(tmp_path / "libs" / "ui" / "button.service.ts"))
+        assert config_manager.is_included(str(tmp_path / "libs" / "ui" / "button.component.ts"))
+
+    def test_find_component_files_uses_patterns(self, tmp_path):
+        """Test that component discovery applies the patterns and suffix in effect for each file"""
+        from angular_tester.main import AngularTester
+        self._write(tmp_path, ".angulartesterrc", {"included_files": ["*.component.ts", "*.service.ts"]})
+        self._write(tmp_path / "lib", ".angulartesterrc", {"test_file_suffix": ".test.ts"})
+        for name in ("a.component.ts", "a.component.spec.ts", "b.service.ts", "lib/c.component.ts",
+                     "lib/c.component.test.ts", "lib/d.pipe.ts"):
+            (tmp_path / name).write_text("")
+        tester = AngularTester.__new__(AngularTester)
+        tester.config_manager = ConfigManager()
+        tester.config = tester.config_manager.load_config(str(tmp_path))
+
+        found = sorted(os.path.relpath(path, tmp_path) for path in tester.find_component_files(str(tmp_path)))
+        assert found == ["a.component.ts", "b.service.ts", os.path.join("lib", "c.component.ts")]
+        assert tester.find_test_file(str(tmp_path / "lib" / "c.component.ts")).endswith("c.component.test.ts")
+
+    def test_budget_estimate_uses_directory_routing(self, tmp_path):
+        """Test that token-budget planning routes with the same per-directory rules as generation"""
+        from angular_tester.main import AngularTester
+        self._write(tmp_path / "lib", ".angulartesterrc", {"routing_rules": [{"when": {"max_loc": 100}, "max_tokens": 300}]})
+        component = tmp_path / "lib" / "a.component.ts"
+        component.write_text("export class AComponent {}\n")
+        tester = AngularTester.__new__(AngularTester)
+        tester.config_manager = ConfigManager()
+        tester.config = tester.config_manager.load_config(str(tmp_path))
+        tester.config["skip_llm_for_trivial"] = False
+
+        route = tester.route_request(str(component), component.read_text())
+        estimate = tester.estimate_component(str(component), None)
+        assert route["max_tokens"] == 300
+        assert estimate["cost"] == len(component.read_text()) // 4 + 300
@@ -1,12 +1,27 @@
 import pytest
 import os
 import sys
+import json
 from unittest.mock import patch, MagicMock
 
 # Add src directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from angular_tester.main import AngularTester
+from angular_tester.coverage import coverage_gaps, describe_gaps, find_file_coverage
+
+
+def file_coverage(statement_hits, branch_hits=None):
+    """coverage-final entry with one statement per line and branches on line 2"""
+    branch_hits = branch_hits or []
+    return {
+        "s": {str(i): hits for i, hits in enumerate(statement_hits)},
+        "statementMap": {str(i): {"start": {"line": i + 1}, "end": {"line": i + 1}}
+                         for i in range(len(statement_hits))},
+        "b": {str(i): hits for i, hits in enumerate(branch_hits)},
+        "branchMap": {str(i): {"line": 2, "type": "if"} for i in range(len(branch_hits))},
+        "f": {},
+    }
 
 
 class TestCoverageFunctionality:
@@ -52,4 +67,100 @@ class TestCoverageFunctionality:
     def test_coverage_threshold_from_env(self):
         """Test that coverage threshold is correctly loaded from environment"""
         tester = AngularTester()
-        assert tester.coverage_threshold == 75
\ No newline at end of file
+        assert tester.coverage_threshold == 75
+    
+    def test_get_coverage_report_from_summary(self, tmp_path, monkeypatch):
+        """Test reading the json-summary report from a project subdirectory"""
+        tester = AngularTester.__new__(AngularTester)
+        report_dir = tmp_path / "coverage" / "my-app"
+        report_dir.mkdir(parents=True)
+        (report_dir / "coverage-summary.json").write_text(
+            '{"total": {"lines": {"total": 200, "covered": 171, "pct": 85.5}}}'
+        )
+        monkeypatch.chdir(tmp_path)
+        
+        assert tester.get_coverage_report() == 85.5
+    
+    def test_get_coverage_report_from_test_output(self, tmp_path, monkeypatch):
+        """Test falling back to the text summary printed by Karma"""
+        tester = AngularTester.__new__(AngularTester)
+        tester.last_test_output = "Statements   : 90% ( 9/10 )\nLines        : 87.5% ( 7/8 )"
+        monkeypatch.chdir(tmp_path)
+        
+        assert tester.get_coverage_report() == 87.5
+
+
+class TestCoverageGuided:
+    """Tests for coverage-guided generation"""
+    
+    def _project(self, tmp_path, monkeypatch, report):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "coverage").mkdir()
+        (tmp_path / "coverage" / "coverage-final.json").write_text(json.dumps(report))
+        tester = AngularTester.__new__(AngularTester)
+        tester.coverage_threshold = 80
+        tester.config = {"coverage_guided": True}
+        return tester
+    
+    def test_coverage_gaps(self):
+        """Test that uncovered statements become line ranges and branch paths are listed"""
+        gaps = coverage_gaps(file_coverage([1, 0, 0, 1, 0], [[3, 0]]))
+        
+        assert gaps["lines"] == [(2, 3), (5, 5)]
+        assert gaps["branches"] == [{"line": 2, "type": "if", "path": 1}]
+        assert gaps["uncovered_statements"] == 3
+        assert gaps["pct"] == 40.0
+        assert describe_gaps(gaps) == "Uncovered lines: 2-3, 5\nUncovered branches: line 2 (if path 2)"
+        assert describe_gaps(None) == "No existing test executes this file."
+    
+    def test_find_file_coverage(self, tmp_path, monkeypatch):
+        """Test matching report entries by absolute and relative paths"""
+        monkeypatch.chdir(tmp_path)
+        absolute = {str(tmp_path / "src" / "a.component.ts"): "a"}
+        relative = {"src/b.component.ts": "b"}
+        
+        assert find_file_coverage(absolute, "src/a.component.ts") == "a"
+        assert find_file_coverage(relative, str(tmp_path / "src" / "b.component.ts")) == "b"
+        assert find_file_coverage(relative, "src/c.component.ts") is None
+    
+    def test_select_uncovered(self, tmp_path, monkeypatch):
+        """Test that only files below the threshold or missing from the report are selected"""
+        tester = self._project(tmp_path, monkeypatch, {
+            "src/covered.component.ts": file_coverage([1, 1, 1, 1, 1]),
+            "src/partial.component.ts": file_coverage([1, 0, 0, 1, 1]),
+        })
+        files = ["src/covered.component.ts", "src/partial.component.ts", "src/new.component.ts"]
+        
+        assert tester.select_uncovered(files) == ["src/partial.component.ts", "src/new.component.ts"]
+        assert tester.coverage_gaps["src/partial.component.ts"]["lines"] == [(2, 3)]
+        assert tester.coverage_gaps["src/new.component.ts"] is None
+    
+    def test_coverage_section_includes_existing_spec(self, tmp_path, monkeypatch):
+        """Test that the prompt asks to extend the existing spec with the uncovered lines"""
+        tester = self._project(tmp_path, monkeypatch, {})
+        (tmp_path / "a.component.spec.ts").write_text("it('should create', () => {});")
+        tester.coverage_gaps = {"a.component.ts": coverage_gaps(file_coverage([1, 0]))}
+        
+        section = tester.coverage_section("a.component.ts")
+        
+        assert "Existing test file (a.component.spec.ts):\nit('should create'" in section
+        assert "Uncovered lines: 2" in section
+        assert "keep every existing test unchanged" in section
+        assert tester.coverage_section("b.component.ts") is None
+    
+    def test_augmented_spec_keeps_existing_tests(self, tmp_path, monkeypatch):
+        """Test that a generated spec with fewer tests does not replace the existing one"""
+        tester = self._project(tmp_path, monkeypatch, {})
+        spec = tmp_path / "a.component.spec.ts"
+        spec.write_text("describe('A', () => { it('one', () => {}); it('two', () => {}); });")
+        tester.coverage_gaps = {"a.component.ts": None}
+        tester.generate_test_content = MagicMock(return_value="describe('A', () => { it('one', () => {}); });")
+        
+        assert tester.create_or_update_test("a.component.ts") is False
+        assert "it('two'" in spec.read_text()
+        
+        tester.generate_test_content.return_value = (
+            "describe('A', () => { it('one', () => {}); it('two', () => {}); it('three', () => {}); });"
+        )
+        assert tester.create_or_update_test("a.component.ts") is True
+        assert "it('three'" in spec.read_text()
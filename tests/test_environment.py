@@ -0,0 +1,152 @@
+import pytest
+import os
+import sys
+import json
+from unittest.mock import patch, MagicMock
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from angular_tester import environment
+from angular_tester.environment import LazyModule, find_browser, find_downloaded_browser, probe_environment
+from angular_tester import install_chrome
+
+
+def make_executable(path):
+    path.write_text("#!/bin/sh\n")
+    path.chmod(0o755)
+    return str(path)
+
+
+class TestEnvironment:
+    """Tests for lazy imports and cached environment probes"""
+
+    def test_lazy_module(self):
+        """Test that the module is imported on first use and attributes can be patched"""
+        lazy = LazyModule("textwrap")
+        assert lazy._module is None
+        assert lazy.dedent("  x") == "x"
+        assert lazy._module is not None
+
+        with patch.object(lazy, "dedent", return_value="patched"):
+            assert lazy.dedent("  x") == "patched"
+        assert lazy.dedent("  x") == "x"
+
+    def test_find_browser(self, tmp_path, monkeypatch):
+        """Test that CHROME_BIN wins over PATH and that nothing is spawned"""
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        chromium = make_executable(bin_dir / "chromium")
+        custom = make_executable(tmp_path / "chrome")
+        monkeypatch.setenv("PATH", str(bin_dir))
+        monkeypatch.delenv("CHROME_BIN", raising=False)
+
+        with patch("angular_tester.environment.subprocess.run") as mock_run:
+            assert find_browser() == chromium
+            monkeypatch.setenv("CHROME_BIN", custom)
+            assert find_browser() == custom
+            monkeypatch.setenv("CHROME_BIN", str(tmp_path / "missing"))
+            assert find_browser() == chromium
+        mock_run.assert_not_called()
+
+    def test_probe_cache_keyed_by_path(self, tmp_path, monkeypatch):
+        """Test that probes are reused until PATH changes"""
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        make_executable(bin_dir / "chromium")
+        monkeypatch.setenv("PATH", str(bin_dir))
+        monkeypatch.delenv("CHROME_BIN", raising=False)
+        cache_dir = str(tmp_path / "cache")
+        monkeypatch.setattr(environment, "node_version", MagicMock(return_value="v20.0.0"))
+
+        first = probe_environment(cache_dir)
+        second = probe_environment(cache_dir)
+
+        assert first["browser"] == str(bin_dir / "chromium") and not first["cached"]
+        assert second == dict(first, cached=True)
+        assert environment.node_version.call_count == 1
+
+        monkeypatch.setenv("PATH", str(bin_dir) + os.pathsep + str(tmp_path))
+        assert not probe_environment(cache_dir)["cached"]
+        assert len(json.loads((tmp_path / "cache" / "environment.json").read_text())) == 1
+
+
+class TestDownloadedBrowsers:
+    """Tests for reusing browsers downloaded by Puppeteer and Playwright"""
+
+    def _isolate(self, tmp_path, monkeypatch):
+        """Empty PATH and a temporary home directory"""
+        monkeypatch.setenv("HOME", str(tmp_path / "home"))
+        monkeypatch.setenv("PATH", str(tmp_path / "empty"))
+        for name in ("CHROME_BIN", "PUPPETEER_CACHE_DIR", "PLAYWRIGHT_BROWSERS_PATH"):
+            monkeypatch.delenv(name, raising=False)
+        monkeypatch.chdir(tmp_path)
+
+    def test_puppeteer_and_playwright_caches(self, tmp_path, monkeypatch):
+        """Test that the newest cached build is found when nothing is on PATH"""
+        self._isolate(tmp_path, monkeypatch)
+        puppeteer = tmp_path / "home" / ".cache" / "puppeteer" / "chrome"
+        for version in ("linux-120.0.6099.109", "linux-131.0.6778.85"):
+            (puppeteer / version / "chrome-linux64").mkdir(parents=True)
+            make_executable(puppeteer / version / "chrome-linux64" / "chrome")
+        assert find_browser() == str(puppeteer / "linux-131.0.6778.85" / "chrome-linux64" / "chrome")
+
+        (tmp_path / "home" / ".cache" / "puppeteer").rename(tmp_path / "unused")
+        playwright = tmp_path / "home" / ".cache" / "ms-playwright" / "chromium-1148" / "chrome-linux"
+        playwright.mkdir(parents=True)
+        make_executable(playwright / "chrome")
+        assert find_browser() == str(playwright / "chrome")
+
+    def test_configured_directories_first(self, tmp_path, monkeypatch):
+        """Test that configured directories are searched before the caches"""
+        self._isolate(tmp_path, monkeypatch)
+        cached = tmp_path / "node_modules" / "puppeteer" / ".local-chromium" / "linux-1095492" / "chrome-linux"
+        cached.mkdir(parents=True)
+        make_executable(cached / "chrome")
+        (tmp_path / "browsers" / "chromium-118").mkdir(parents=True)
+        configured = make_executable(tmp_path / "browsers" / "chromium-118" / "chromium")
+
+        assert find_downloaded_browser() == str(cached / "chrome")
+        assert find_downloaded_browser([str(tmp_path / "browsers")]) == configured
+
+    def test_ensure_chrome_skips_package_manager(self, tmp_path, monkeypatch):
+        """Test that a working downloaded browser is exported as CHROME_BIN without installing"""
+        self._isolate(tmp_path, monkeypatch)
+        (tmp_path / "browsers").mkdir()
+        browser = make_executable(tmp_path / "browsers" / "chrome")
+        monkeypatch.setattr(install_chrome, "browser_works", lambda path: True)
+        install = MagicMock()
+        monkeypatch.setattr(install_chrome, "install_chrome", install)
+
+        assert install_chrome.ensure_chrome([str(tmp_path / "browsers")]) == browser
+        assert os.environ["CHROME_BIN"] == browser
+        install.assert_not_called()
+
+    def test_run_tests_exports_chrome_bin(self, tmp_path, monkeypatch):
+        """Test that the resolved browser is passed to ng test as CHROME_BIN"""
+        from angular_tester.main import AngularTester
+        self._isolate(tmp_path, monkeypatch)
+        (tmp_path / "browsers").mkdir()
+        browser = make_executable(tmp_path / "browsers" / "chromium")
+        tester = AngularTester.__new__(AngularTester)
+        tester.config = {"cache_dir": str(tmp_path / "cache"), "browser_dirs": [str(tmp_path / "browsers")],
+                         "per_spec_results": False}
+
+        with patch("angular_tester.main.subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+            assert tester.run_tests()
+        assert mock_run.call_args[1]["env"]["CHROME_BIN"] == browser
+
+    def test_warmup_exports_chrome_bin(self, tmp_path, monkeypatch):
+        """Test that the warm-up ng test also gets the resolved browser as CHROME_BIN"""
+        from angular_tester.main import AngularTester
+        self._isolate(tmp_path, monkeypatch)
+        (tmp_path / "browsers").mkdir()
+        browser = make_executable(tmp_path / "browsers" / "chromium")
+        tester = AngularTester.__new__(AngularTester)
+        tester.config = {"cache_dir": str(tmp_path / "cache"), "browser_dirs": [str(tmp_path / "browsers")]}
+
+        with patch("angular_tester.warmup.subprocess.Popen") as mock_popen, \
+                patch("angular_tester.warmup.threading.Thread"):
+            assert tester.start_build_warmup() is not None
+        assert mock_popen.call_args[1]["env"]["CHROME_BIN"] == browser
@@ -0,0 +1,103 @@
+import pytest
+import os
+import sys
+from unittest.mock import patch, MagicMock
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from angular_tester.main import AngularTester
+from angular_tester.examples import SpecIndex, select_examples, tokenize
+
+
+USER_SPEC = """import { UserService } from './user.service';
+describe('UserListComponent', () => {
+  it('loads users', () => {
+    const service = jasmine.createSpyObj('UserService', ['getUsers']);
+    expect(service).toBeTruthy();
+  });
+});
+"""
+
+CART_SPEC = """import { CartStore } from '../store/cart.store';
+describe('CartComponent', () => {
+  it('adds items', () => {
+    expect(new CartStore().items.length).toBe(0);
+  });
+});
+"""
+
+
+def _write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    return str(path)
+
+
+class TestSpecIndex:
+    """Tests for the BM25 spec index"""
+
+    def test_tokenize_splits_identifiers_and_imports(self):
+        """Test that camelCase identifiers and import paths become terms"""
+        tokens = tokenize("import { UserService } from './user-data.service';\nexport class UserComponent {}")
+        assert "userservice" in tokens
+        assert "service" in tokens
+        assert "data" in tokens
+        assert "import" not in tokens
+
+    def test_search_ranks_similar_specs(self, tmp_path):
+        """Test that the spec sharing identifiers with the query ranks first"""
+        user = _write(tmp_path / "users" / "user-list.component.spec.ts", USER_SPEC)
+        cart = _write(tmp_path / "cart" / "cart.component.spec.ts", CART_SPEC)
+        index = SpecIndex(str(tmp_path / "index.json"))
+        assert index.update([user, cart]) == 2
+
+        query = "import { UserService } from './user.service';\nexport class UserDetailComponent {}"
+        assert index.search(query, k=2)[0][0] == user
+        assert index.search(query, k=2, exclude=[user])[0][0] == cart
+
+    def test_incremental_update_and_persistence(self, tmp_path):
+        """Test that only changed specs are re-read and removed ones dropped"""
+        user = _write(tmp_path / "user.component.spec.ts", USER_SPEC)
+        cart = _write(tmp_path / "cart.component.spec.ts", CART_SPEC)
+        index = SpecIndex(str(tmp_path / "cache" / "index.json"))
+        index.update([user, cart])
+        index.save()
+
+        reloaded = SpecIndex(str(tmp_path / "cache" / "index.json"))
+        reloaded.load()
+        assert reloaded.update([user, cart]) == 0
+        _write(tmp_path / "cart.component.spec.ts", CART_SPEC + "\n// more")
+        assert reloaded.update([cart]) == 1
+        assert list(reloaded.documents) == [cart]
+
+    def test_select_examples_within_budget(self, tmp_path):
+        """Test that examples are added best first while they fit the token budget"""
+        user = _write(tmp_path / "user.component.spec.ts", USER_SPEC)
+        cart = _write(tmp_path / "cart.component.spec.ts", CART_SPEC)
+        budget = len(USER_SPEC) // 4 + 1
+        examples = select_examples([(user, 2.0), (cart, 1.0)], budget)
+        assert [spec for spec, _ in examples] == [user]
+
+
+class TestFewShotPrompt:
+    """Tests for few-shot examples in generated prompts"""
+
+    def test_examples_in_prompt(self, tmp_path):
+        """Test that the most similar existing spec is added, but not the component's own"""
+        _write(tmp_path / "users" / "user-list.component.spec.ts", USER_SPEC)
+        _write(tmp_path / "cart" / "cart.component.spec.ts", CART_SPEC)
+        component = _write(tmp_path / "users" / "user-detail.component.ts",
+                           "import { UserService } from './user.service';\nexport class UserDetailComponent {}")
+        _write(tmp_path / "users" / "user-detail.component.spec.ts", "describe('old', () => {});")
+
+        tester = AngularTester.__new__(AngularTester)
+        tester.config = {"cache_dir": str(tmp_path / "cache"), "few_shot_examples": 1, "few_shot_token_budget": 1000}
+        tester.open_example_index(str(tmp_path))
+        assert os.path.exists(tmp_path / "cache" / "spec-index.json")
+
+        examples = tester.find_examples(component, open(component).read())
+        assert [os.path.basename(spec) for spec, _ in examples] == ["user-list.component.spec.ts"]
+        prompt = tester.build_prompt(component, {component: "export class UserDetailComponent {}"}, examples=examples)
+        assert "Example of an existing test in this project" in prompt
+        assert prompt.index("loads users") < prompt.index("Component file:")
@@ -0,0 +1,110 @@
+import pytest
+import os
+import sys
+from unittest.mock import patch, MagicMock
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from angular_tester.main import AngularTester, main
+from angular_tester.history import HistoryStore
+
+
+class TestHistoryStore:
+    """Tests for the timing history database"""
+
+    def test_record_many_smooths_measurements(self, tmp_path):
+        """Test that repeated runs are folded into moving averages"""
+        store = HistoryStore(str(tmp_path / "history.sqlite"))
+        store.record_many({"a.component.ts": {"llm_latency": 4.0, "duration": 5.0, "failed": True}})
+        store.record_many({"a.component.ts": {"llm_latency": 2.0, "duration": 3.0, "spec_runtime": 1.0}})
+        stats = store.get("a.component.ts")
+        assert stats["runs"] == 2
+        assert stats["llm_latency"] == 3.0
+        assert stats["spec_runtime"] == 1.0
+        assert stats["failures"] == 1
+        assert store.expected_costs() == {"a.component.ts": 5.0}
+        store.close()
+
+    def test_report(self, tmp_path):
+        """Test the trend report lists runs and expensive components"""
+        store = HistoryStore(str(tmp_path / "history.sqlite"))
+        stats = {"slow.component.ts": {"duration": 9.0, "prompt_tokens": 800},
+                 "fast.component.ts": {"duration": 1.0}}
+        store.record_many(stats)
+        store.record_run(0.0, stats)
+        report = store.report()
+        assert "Recent runs:" in report
+        assert report.index("slow.component.ts") < report.index("fast.component.ts")
+        store.close()
+
+
+class TestScheduling:
+    """Tests for history-driven scheduling in AngularTester"""
+
+    def _tester(self, tmp_path, **config):
+        tester = AngularTester.__new__(AngularTester)
+        tester.config = dict({"cache_dir": str(tmp_path / "cache"), "journal": False,
+                              "typecheck_specs": False}, **config)
+        return tester
+
+    def test_schedule_longest_first(self, tmp_path):
+        """Test that components are ordered by expected cost, unknown ones at the median"""
+        tester = self._tester(tmp_path)
+        tester.open_history().record_many({
+            "a.component.ts": {"duration": 1.0},
+            "b.component.ts": {"duration": 9.0},
+            "c.component.ts": {"duration": 5.0},
+        })
+        files = [os.path.join("src", name) for name in
+                 ("a.component.ts", "new.component.ts", "b.component.ts", "c.component.ts")]
+        ordered = tester.schedule_components(files, "src")
+        assert [os.path.basename(name) for name in ordered] == [
+            "b.component.ts", "new.component.ts", "c.component.ts", "a.component.ts"
+        ]
+
+    def test_process_components_records_history(self, tmp_path):
+        """Test that a concurrent run stores per-component timings"""
+        tester = self._tester(tmp_path, llm_concurrency=2)
+        tester.run_started = 0.0
+        tester.component_stats = {}
+        files = [str(tmp_path / "a.component.ts"), str(tmp_path / "b.component.ts")]
+        with patch.object(tester, "find_component_files", return_value=files), \
+             patch.object(tester, "create_or_update_test", side_effect=lambda f: f.endswith("a.component.ts")):
+            assert tester.process_components(str(tmp_path)) is False
+        tester.save_history(str(tmp_path))
+        history = tester.open_history()
+        assert history.get("a.component.ts")["failures"] == 0
+        assert history.get("b.component.ts")["failures"] == 1
+        assert history.recent_runs()[0]["components"] == 2
+
+    def test_spec_runtimes_attributed_to_components(self, tmp_path):
+        """Test that per-spec durations are recorded against their component"""
+        spec_file = tmp_path / "a.component.spec.ts"
+        spec_file.write_text("describe('AComponent', () => {});")
+        tester = self._tester(tmp_path)
+        tester.component_stats = {}
+        tester.written_specs = {str(spec_file): "a.component.ts"}
+        tester._record_spec_runtimes([
+            {"suite": ["AComponent"], "description": "works", "success": True, "time": 1500},
+            {"suite": ["AComponent"], "description": "fails", "success": False, "time": 500, "log": []},
+        ])
+        assert tester.component_stats["a.component.ts"] == {"spec_runtime": 2.0, "failed": True}
+
+
+class TestHistoryReport:
+    """Tests for the --history-report command line option"""
+
+    def test_history_report(self, tmp_path, capsys):
+        """Test that the report is printed without requiring an LLM endpoint"""
+        store = HistoryStore(str(tmp_path / "history.sqlite"))
+        store.record_many({"a.component.ts": {"duration": 2.0}})
+        store.close()
+        with patch("angular_tester.main.ConfigManager") as config_manager, \
+             patch("sys.argv", ["angular-tester", "--history-report"]), \
+             patch("sys.exit", side_effect=SystemExit) as mock_exit:
+            config_manager.return_value.load_config.return_value = {"cache_dir": str(tmp_path)}
+            with pytest.raises(SystemExit):
+                main()
+            mock_exit.assert_called_once_with(0)
+        assert "a.component.ts" in capsys.readouterr().out
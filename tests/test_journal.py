@@ -0,0 +1,135 @@
+import pytest
+import os
+import sys
+import json
+from unittest.mock import patch, MagicMock
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from angular_tester.main import AngularTester
+from angular_tester.journal import WorkJournal, file_hash
+
+
+class TestWorkJournal:
+    """Tests for the WorkJournal class"""
+
+    def test_record_and_replay(self, tmp_path):
+        """Test that the last record per component wins on replay"""
+        path = str(tmp_path / "journal.jsonl")
+        journal = WorkJournal(path)
+        journal.open()
+        journal.record("a.component.ts", "pending", input_hash="abc")
+        journal.record("a.component.ts", "written", spec_hash="def")
+        journal.record("b.component.ts", "failed")
+        journal.close()
+
+        # Simulate a crash in the middle of a write
+        with open(path, 'a') as f:
+            f.write('{"component": "b.comp')
+
+        entries = WorkJournal(path).load()
+        assert entries["a.component.ts"]["state"] == "written"
+        assert entries["a.component.ts"]["input_hash"] == "abc"
+        assert entries["b.component.ts"]["state"] == "failed"
+
+    def test_open_without_resume_truncates(self, tmp_path):
+        """Test that a fresh run starts a new journal"""
+        path = str(tmp_path / "journal.jsonl")
+        journal = WorkJournal(path)
+        journal.open()
+        journal.record("a.component.ts", "written")
+        journal.close()
+
+        journal.open(resume=False)
+        journal.close()
+        assert WorkJournal(path).load() == {}
+
+    def test_is_complete(self, tmp_path):
+        """Test completion requires matching inputs and an intact spec"""
+        spec_file = tmp_path / "a.component.spec.ts"
+        spec_file.write_text("describe('A', () => {});")
+        journal = WorkJournal(str(tmp_path / "journal.jsonl"))
+        journal.record("a.component.ts", "written", input_hash="abc", spec_hash=file_hash(str(spec_file)))
+
+        assert journal.is_complete("a.component.ts", "abc", str(spec_file))
+        assert not journal.is_complete("a.component.ts", "changed", str(spec_file))
+        spec_file.write_text("edited")
+        assert not journal.is_complete("a.component.ts", "abc", str(spec_file))
+
+    def test_unknown_state(self, tmp_path):
+        """Test that unknown states are rejected"""
+        with pytest.raises(ValueError):
+            WorkJournal(str(tmp_path / "journal.jsonl")).record("a.component.ts", "done")
+
+
+class TestResume:
+    """Tests for resuming interrupted runs"""
+
+    def _tester(self, tmp_path, resume):
+        tester = AngularTester.__new__(AngularTester)
+        tester.config = {"cache_dir": str(tmp_path / "cache"), "typecheck_specs": False}
+        tester.resume = resume
+        return tester
+
+    def _write_spec(self, component_file):
+        with open(component_file.replace('.ts', '.spec.ts'), 'w') as f:
+            f.write("describe('A', () => {});")
+        return True
+
+    def test_resume_skips_completed_components(self, tmp_path):
+        """Test that a resumed run only processes unfinished or changed components"""
+        done = tmp_path / "done.component.ts"
+        changed = tmp_path / "changed.component.ts"
+        done.write_text("export class DoneComponent {}")
+        changed.write_text("export class ChangedComponent {}")
+
+        first = self._tester(tmp_path, resume=False)
+        first.create_or_update_test = MagicMock(side_effect=self._write_spec)
+        assert first.process_components(str(tmp_path))
+
+        changed.write_text("export class ChangedComponent { edited = true; }")
+        second = self._tester(tmp_path, resume=True)
+        second.create_or_update_test = MagicMock(side_effect=self._write_spec)
+        assert second.process_components(str(tmp_path))
+
+        second.create_or_update_test.assert_called_once_with(str(changed))
+        assert str(done).replace('.ts', '.spec.ts') in second.written_specs
+
+    def test_context_is_collected_once(self, tmp_path):
+        """Test that generation reuses the related files hashed for the journal"""
+        component = tmp_path / "user.component.ts"
+        component.write_text("export class UserComponent {}")
+        tester = self._tester(tmp_path, resume=False)
+        tester.generate_test_content = MagicMock(side_effect=lambda component_file, feedback=None:
+                                                 tester._take_context(component_file) and "describe('A', () => {});")
+
+        with patch.object(AngularTester, "collect_related_files", wraps=tester.collect_related_files) as collect:
+            assert tester.process_components(str(tmp_path))
+        assert collect.call_count == 1
+        assert tester.collected_context == {}
+
+    def test_retried_specs_are_journaled(self, tmp_path):
+        """Test that a spec rewritten after failing is recorded with its new hash, so resuming trusts it"""
+        component = tmp_path / "user.component.ts"
+        component.write_text("export class UserComponent {}")
+        spec = str(tmp_path / "user.component.spec.ts")
+        first = self._tester(tmp_path, resume=False)
+        first.create_or_update_test = MagicMock(side_effect=self._write_spec)
+        assert first.process_components(str(tmp_path))
+
+        def rewrite(component_file, feedback=None):
+            with open(spec, 'w') as f:
+                f.write("describe('A', () => { it('works', () => {}); });")
+            return True
+
+        first.create_or_update_test = MagicMock(side_effect=rewrite)
+        first.spec_results = [{"file": spec, "suite": ["A"], "description": "fails", "success": False,
+                               "skipped": False, "time": 1, "log": ["Error"]}]
+        first.run_tests = MagicMock(return_value=True)
+        assert first.retry_failing_specs()
+
+        second = self._tester(tmp_path, resume=True)
+        second.create_or_update_test = MagicMock(side_effect=self._write_spec)
+        assert second.process_components(str(tmp_path))
+        second.create_or_update_test.assert_not_called()
@@ -0,0 +1,109 @@
+import pytest
+import os
+import sys
+import json
+from unittest.mock import patch, MagicMock
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from angular_tester.main import AngularTester
+from angular_tester.karma import group_results_by_spec, load_spec_results, write_karma_wrapper
+
+
+def _result(suite, description, success=True, time=10, log=None):
+    return {"suite": suite, "description": description, "success": success,
+            "skipped": False, "time": time, "log": log or []}
+
+
+class TestKarmaResults:
+    """Tests for per-spec result collection"""
+
+    def test_write_karma_wrapper(self, tmp_path):
+        """Test that the wrapper loads the project config and adds the reporter"""
+        base_config = tmp_path / "karma.conf.js"
+        results_file = tmp_path / "cache" / "results.json"
+
+        wrapper = write_karma_wrapper(str(tmp_path / "cache"), str(base_config), str(results_file))
+        with open(wrapper) as f:
+            content = f.read()
+
+        assert f"const BASE_CONFIG = {json.dumps(str(base_config))};" in content
+        assert f"const RESULTS_FILE = {json.dumps(str(results_file))};" in content
+        assert "'reporter:angular-tester-json'" in content
+
+    def test_load_missing_results(self, tmp_path):
+        """Test that a missing results file is reported as None"""
+        assert load_spec_results(str(tmp_path / "missing.json")) is None
+
+    def test_group_results_by_spec(self, tmp_path):
+        """Test aggregation of it-level results per spec file"""
+        spec_file = tmp_path / "user.component.spec.ts"
+        spec_file.write_text("describe('UserComponent', () => {\n  it('should create', () => {});\n});")
+        results = [
+            _result(["UserComponent"], "should create", time=30),
+            _result(["UserComponent", "edit"], "should emit", success=False, log=["Expected 1 to be 2.\n    at stack"]),
+            _result(["HandWrittenSpec"], "works"),
+        ]
+
+        grouped = group_results_by_spec(results, [str(spec_file)])
+
+        assert grouped[str(spec_file)]["passed"] == 1
+        assert grouped[str(spec_file)]["failed"] == 1
+        assert grouped[str(spec_file)]["duration"] == 40
+        assert grouped[str(spec_file)]["failures"] == ["UserComponent > edit > should emit: Expected 1 to be 2. | at stack"]
+        assert grouped[None]["passed"] == 1
+
+
+class TestRetryFailingSpecs:
+    """Tests for selective regeneration and re-run of failing specs"""
+
+    def test_failing_specs_are_regenerated_and_rerun(self, tmp_path):
+        """Test that only failing generated specs are regenerated and re-run"""
+        good_spec = tmp_path / "good.component.spec.ts"
+        bad_spec = tmp_path / "bad.component.spec.ts"
+        good_spec.write_text("describe('GoodComponent', () => {});")
+        bad_spec.write_text("describe('BadComponent', () => {});")
+
+        tester = AngularTester.__new__(AngularTester)
+        tester.config = {"spec_retry_budget": 2, "cache_dir": str(tmp_path)}
+        tester.written_specs = {str(good_spec): "good.component.ts", str(bad_spec): "bad.component.ts"}
+        tester.spec_results = [
+            _result(["GoodComponent"], "should create"),
+            _result(["BadComponent"], "should create", success=False, log=["NullInjectorError"]),
+        ]
+        tester.create_or_update_test = MagicMock(return_value=True)
+        tester.run_tests = MagicMock(return_value=True)
+
+        assert tester.retry_failing_specs() is True
+        tester.create_or_update_test.assert_called_once_with(
+            "bad.component.ts", feedback="BadComponent > should create: NullInjectorError"
+        )
+        tester.run_tests.assert_called_once_with([str(bad_spec)], code_coverage=False)
+
+    def test_unattributed_failures_are_not_retried(self, tmp_path):
+        """Test that failures in hand-written specs stop the retry loop"""
+        tester = AngularTester.__new__(AngularTester)
+        tester.config = {"cache_dir": str(tmp_path)}
+        tester.written_specs = {str(tmp_path / "a.component.spec.ts"): "a.component.ts"}
+        tester.spec_results = [_result(["HandWrittenSpec"], "works", success=False)]
+        tester.run_tests = MagicMock()
+
+        assert tester.retry_failing_specs() is False
+        tester.run_tests.assert_not_called()
+
+    @patch("angular_tester.main.probe_environment", return_value={"browser": "/usr/bin/chromium", "cached": True})
+    @patch("angular_tester.main.subprocess.run")
+    def test_run_tests_injects_reporter(self, mock_subprocess, mock_probe, tmp_path):
+        """Test that run_tests passes the wrapper config and include filters"""
+        tester = AngularTester.__new__(AngularTester)
+        tester.config = {"cache_dir": str(tmp_path / "cache"), "karma_config": str(tmp_path / "missing.conf.js")}
+        mock_subprocess.return_value = MagicMock(returncode=0, stdout="", stderr="")
+
+        assert tester.run_tests([str(tmp_path / "a.component.spec.ts")], code_coverage=False) is True
+
+        command = mock_subprocess.call_args_list[-1][0][0]
+        assert '--code-coverage' not in command
+        assert f"--include={os.path.relpath(str(tmp_path / 'a.component.spec.ts'))}" in command
+        assert f"--karma-config={os.path.join(str(tmp_path / 'cache'), 'karma.conf.js')}" in command
+        assert tester.spec_results is None
@@ -69,4 +69,19 @@ class TestMainFunction:
             with patch("sys.exit") as mock_exit:
                 main()
                 mock_exit.assert_called_once_with(0)
-                mock_tester_instance.run.assert_called_once_with('./src')
\ No newline at end of file
+                mock_tester_instance.run.assert_called_once_with('./src')
+
+    @patch.dict(os.environ, {"LLM_API_URL": "https://test.api.com"})
+    @patch("angular_tester.main.AngularTester")
+    def test_main_function_resume(self, mock_tester_class):
+        """Test that --resume is passed to the tester"""
+        mock_tester_instance = MagicMock()
+        mock_tester_instance.run.return_value = True
+        mock_tester_class.return_value = mock_tester_instance
+        
+        with patch("sys.argv", ["angular-tester", "/test/path", "--resume"]):
+            with patch("sys.exit") as mock_exit:
+                main()
+                mock_exit.assert_called_once_with(0)
+                mock_tester_class.assert_called_once_with(resume=True, shard=None)
+                mock_tester_instance.run.assert_called_once_with('/test/path')
@@ -0,0 +1,133 @@
+import pytest
+import os
+import sys
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from angular_tester.main import AngularTester
+from angular_tester.metadata import MetadataExtractor, primary_class
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+SIGNAL_COMPONENT = """
+import { Component, inject, input, output } from '@angular/core';
+
+@Component({
+  selector: 'app-order',
+  standalone: true,
+  imports: [CommonModule],
+  template: `<p>{{ total() }} selector: 'not-this-one'</p>`
+})
+export class OrderComponent implements OnInit {
+  orderId = input.required<number>();
+  placed = output<Order>();
+  private http = inject(HttpClient);
+
+  constructor(private readonly store: Store<AppState>) {}
+
+  ngOnInit(): void {
+    if (this.orderId()) { this.load(); }
+  }
+
+  async submit(order: Order): Promise<void> {}
+
+  private load() {}
+}
+"""
+
+
+class TestMetadataExtractor:
+    """Tests for the MetadataExtractor class"""
+
+    def test_extract_decorator_inputs_and_outputs(self):
+        """Test extraction of @Component metadata and decorator-based members"""
+        extractor = MetadataExtractor()
+        metadata = extractor.extract_file(os.path.join(FIXTURES_DIR, 'sample.component.ts'))
+
+        component = primary_class(metadata)
+        assert component["name"] == "UserCardComponent"
+        assert component["kind"] == "component"
+        assert component["decorator"]["properties"]["selector"] == "'app-user-card'"
+        assert [(i["name"], i["type"]) for i in component["inputs"]] == [("user", "User | null")]
+        assert [(o["name"], o["type"]) for o in component["outputs"]] == [("edit", "User")]
+        assert [m["name"] for m in component["methods"]] == ["onEdit"]
+        assert any(t.startswith("export interface User") for t in metadata["types"])
+
+    def test_extract_signal_members_and_dependencies(self):
+        """Test extraction of input()/output() members and injected dependencies"""
+        metadata = MetadataExtractor().extract(SIGNAL_COMPONENT)
+        component = primary_class(metadata)
+
+        assert component["decorator"]["properties"] == {
+            "selector": "'app-order'",
+            "standalone": "true",
+            "imports": "[CommonModule]",
+        }
+        assert component["inputs"][0]["name"] == "orderId"
+        assert component["inputs"][0]["required"] is True
+        assert component["outputs"][0]["type"] == "Order"
+        assert [(d["name"], d["type"], d["via"]) for d in component["dependencies"]] == [
+            ("store", "Store<AppState>", "constructor"),
+            ("http", "HttpClient", "inject"),
+        ]
+        # Private methods are not part of the public surface
+        assert [m["name"] for m in component["methods"]] == ["ngOnInit", "submit"]
+
+    def test_summarize_drops_implementation(self):
+        """Test that summaries keep signatures but drop bodies and templates"""
+        extractor = MetadataExtractor()
+        summary = extractor.summarize(extractor.extract(SIGNAL_COMPONENT))
+
+        assert "@Component({ selector: 'app-order', standalone: true, imports: [CommonModule] })" in summary
+        assert "async submit(order: Order): Promise<void>;" in summary
+        assert "http = inject(HttpClient);" in summary
+        assert "this.load()" not in summary
+        assert "not-this-one" not in summary
+
+    def test_cache_does_not_keep_sources(self):
+        """Test that cached metadata is reused for unchanged content without storing the source"""
+        extractor = MetadataExtractor()
+        first = extractor.extract_file("user.component.ts", SIGNAL_COMPONENT)
+        assert extractor.extract_file("user.component.ts", SIGNAL_COMPONENT) is first
+        assert all(SIGNAL_COMPONENT not in entry for entry in extractor._cache.values())
+        assert extractor.extract_file("user.component.ts", SIGNAL_COMPONENT + "\n") is not first
+
+
+class TestPromptSummaries:
+    """Tests for dependency summaries in the generated prompt"""
+
+    def test_build_prompt_summarizes_related_files(self):
+        """Test that related files are sent as summaries and the component as source"""
+        tester = AngularTester.__new__(AngularTester)
+        service_source = (
+            "@Injectable({ providedIn: 'root' })\n"
+            "export class UserService {\n"
+            "  getUsers(): User[] { return this.users.filter(u => u.active); }\n"
+            "}\n"
+        )
+        related_files = {
+            "/app/user.component.ts": "export class UserComponent {}",
+            "/app/user.service.ts": service_source,
+        }
+
+        prompt = tester.build_prompt("/app/user.component.ts", related_files)
+        assert "export class UserComponent {}" in prompt
+        assert "Related file summary (/app/user.service.ts)" in prompt
+        assert "getUsers(): User[];" in prompt
+        assert "u.active" not in prompt
+
+    def test_build_prompt_with_summaries_disabled(self):
+        """Test that full sources are sent when summaries are disabled"""
+        tester = AngularTester.__new__(AngularTester)
+        tester.config = {"summarize_dependencies": False}
+        related_files = {
+            "/app/user.component.ts": "export class UserComponent {}",
+            "/app/user.service.ts": "export class UserService { run() { return 42; } }",
+        }
+
+        prompt = tester.build_prompt("/app/user.component.ts", related_files)
+        assert "Related file (/app/user.service.ts)" in prompt
+        assert "return 42;" in prompt
+
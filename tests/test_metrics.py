@@ -0,0 +1,104 @@
+import pytest
+import os
+import sys
+import urllib.request
+from unittest.mock import patch, MagicMock
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from angular_tester.main import AngularTester
+from angular_tester import metrics
+from angular_tester.metrics import Registry, start_metrics_server
+
+
+class TestRegistry:
+    """Tests for the Prometheus text exposition format"""
+
+    def test_render_counter_and_histogram(self):
+        """Test counters with labels and cumulative histogram buckets"""
+        registry = Registry()
+        counter = registry.counter("demo_total", "Demo counter", ["kind"])
+        histogram = registry.histogram("demo_seconds", "Demo histogram", buckets=(1, 5))
+        counter.inc(kind="a")
+        counter.inc(2, kind="a")
+        histogram.observe(0.5)
+        histogram.observe(3)
+
+        text = registry.render()
+        assert "# TYPE demo_total counter" in text
+        assert 'demo_total{kind="a"} 3' in text
+        assert 'demo_seconds_bucket{le="1"} 1' in text
+        assert 'demo_seconds_bucket{le="5"} 2' in text
+        assert 'demo_seconds_bucket{le="+Inf"} 2' in text
+        assert "demo_seconds_sum 3.5" in text
+        assert "demo_seconds_count 2" in text
+
+    def test_write_textfile(self, tmp_path):
+        """Test that the textfile is written without leaving temporary files"""
+        registry = Registry()
+        registry.counter("demo_total", "Demo counter").inc()
+        path = tmp_path / "metrics" / "angular_tester.prom"
+        registry.write_textfile(str(path))
+        assert "demo_total 1" in path.read_text()
+        assert os.listdir(path.parent) == ["angular_tester.prom"]
+
+    def test_metrics_server(self):
+        """Test that /metrics serves the registry"""
+        registry = Registry()
+        registry.counter("demo_total", "Demo counter").inc()
+        server = start_metrics_server(registry, "127.0.0.1", 0)
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics") as response:
+                assert "demo_total 1" in response.read().decode()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+class TestTesterMetrics:
+    """Tests for metrics recorded during generation"""
+
+    @patch("angular_tester.main.requests.post")
+    def test_llm_request_metrics(self, mock_post, tmp_path):
+        """Test LLM outcome, token usage and fallback counters"""
+        component = tmp_path / "user.component.ts"
+        component.write_text("export class UserComponent {\n  load() {}\n}")
+        ok = MagicMock(status_code=200)
+        ok.json.return_value = {"text": "describe('UserComponent', () => {});",
+                                "usage": {"prompt_tokens": 120, "completion_tokens": 30}}
+        failed = MagicMock(status_code=500, text="error")
+        mock_post.side_effect = [ok, failed]
+
+        tester = AngularTester.__new__(AngularTester)
+        tester.llm_api_url = "http://llm"
+        before = (metrics.LLM_REQUESTS.value(outcome="ok"), metrics.LLM_REQUESTS.value(outcome="error"),
+                  metrics.TOKENS.value(kind="prompt"), metrics.FALLBACKS.value(reason="llm_error"),
+                  metrics.LLM_LATENCY.count())
+        with patch.object(tester, "is_trivial_component", return_value=False):
+            tester.generate_test_content(str(component))
+            tester.generate_test_content(str(component))
+
+        assert metrics.LLM_REQUESTS.value(outcome="ok") == before[0] + 1
+        assert metrics.LLM_REQUESTS.value(outcome="error") == before[1] + 1
+        assert metrics.TOKENS.value(kind="prompt") == before[2] + 120
+        assert metrics.FALLBACKS.value(reason="llm_error") == before[3] + 1
+        assert metrics.LLM_LATENCY.count() == before[4] + 2
+
+    def test_tokens_estimated_without_usage(self):
+        """Test that token counters are estimated when the API does not report usage"""
+        tester = AngularTester.__new__(AngularTester)
+        before = (metrics.TOKENS.value(kind="prompt"), metrics.TOKENS.value(kind="completion"))
+        tester._spend_tokens(None, "x" * 400, "y" * 80)
+        assert metrics.TOKENS.value(kind="prompt") == before[0] + 100
+        assert metrics.TOKENS.value(kind="completion") == before[1] + 20
+
+    def test_textfile_written_after_run(self, tmp_path):
+        """Test that a run writes the metrics textfile"""
+        tester = AngularTester.__new__(AngularTester)
+        tester.coverage_threshold = 80
+        tester.config = {"cache_dir": str(tmp_path), "history": False}
+        tester.start_build_warmup = MagicMock(return_value=None)
+        tester.process_components = MagicMock(return_value=False)
+        tester.run("./src")
+        assert "angular_tester_components_total" in (tmp_path / "metrics.prom").read_text()
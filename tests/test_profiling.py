@@ -0,0 +1,92 @@
+import pytest
+import os
+import sys
+import json
+import datetime
+from unittest.mock import patch, MagicMock
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from angular_tester.main import AngularTester, main
+from angular_tester.profiling import DISABLED, Profiler, percentile
+
+
+class TestProfiler:
+    """Tests for phase spans and their exports"""
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles"""
+        values = [float(value) for value in range(1, 21)]
+        assert percentile(values, 0.5) == 10.0
+        assert percentile(values, 0.95) == 19.0
+        assert percentile([3.0], 0.95) == 3.0
+
+    def test_phase_stats_and_trace(self, tmp_path):
+        """Test that spans are summarized and exported as trace events"""
+        profiler = Profiler()
+        for duration in (1.0, 2.0, 3.0):
+            profiler.record('llm', 10.0, 'a.component.ts', finished=10.0 + duration)
+        with profiler.span('scan'):
+            pass
+
+        stats = profiler.phase_stats()
+        assert stats['llm']['count'] == 3
+        assert stats['llm']['p50'] == 2.0
+        assert stats['llm']['max'] == 3.0
+        assert 'llm' in profiler.summary()
+
+        path = tmp_path / "trace.json"
+        profiler.write_trace(str(path))
+        events = json.loads(path.read_text())["traceEvents"]
+        assert events[0]["ph"] == "X"
+        assert events[0]["dur"] == 1000000
+        assert events[0]["args"] == {"component": "a.component.ts"}
+
+    def test_disabled_profiler_is_inert(self):
+        """Test that the default profiler records nothing"""
+        with DISABLED.span('scan'):
+            pass
+        DISABLED.record('llm', 0.0)
+        assert DISABLED.span('a') is DISABLED.span('b')
+
+
+class TestProfiledRun:
+    """Tests for spans recorded by AngularTester"""
+
+    @patch("angular_tester.main.requests.post")
+    def test_generation_spans(self, mock_post, tmp_path):
+        """Test that generation phases are attributed to the component"""
+        component = tmp_path / "user.component.ts"
+        component.write_text("@Component({selector: 'app-user'})\nexport class UserComponent {\n  load() {}\n}")
+        response = MagicMock(status_code=200, elapsed=datetime.timedelta(seconds=0.25))
+        response.json.return_value = {"text": "describe('UserComponent', () => { it('works', () => {}); });"}
+        mock_post.return_value = response
+
+        tester = AngularTester.__new__(AngularTester)
+        tester.llm_api_url = "http://llm"
+        tester.metadata_extractor = None
+        tester.profiler = Profiler()
+        with patch.object(tester, "is_trivial_component", return_value=False):
+            assert tester.create_or_update_test(str(component))
+
+        names = [event["name"] for event in tester.profiler.events]
+        assert names == ["context", "prompt", "llm", "llm_ttfb", "validation", "write"]
+        ttfb = tester.profiler.events[3]
+        assert ttfb["duration"] == pytest.approx(0.25)
+        assert all(event["args"]["component"] == str(component) for event in tester.profiler.events)
+
+    @patch.dict(os.environ, {"LLM_API_URL": "https://test.api.com"})
+    @patch("angular_tester.main.AngularTester")
+    def test_profile_flag(self, mock_tester_class):
+        """Test that --profile installs a profiler and writes the report"""
+        mock_tester_instance = MagicMock()
+        mock_tester_instance.run.return_value = True
+        mock_tester_class.return_value = mock_tester_instance
+
+        with patch("sys.argv", ["angular-tester", "--profile"]):
+            with patch("sys.exit") as mock_exit:
+                main()
+                mock_exit.assert_called_once_with(0)
+        assert isinstance(mock_tester_instance.profiler, Profiler)
+        mock_tester_instance.write_profile.assert_called_once_with()
@@ -0,0 +1,114 @@
+import pytest
+import os
+import sys
+from unittest.mock import patch, MagicMock
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from angular_tester.main import AngularTester
+from angular_tester.prompt import PromptBuffer
+
+
+class TestPromptBuffer:
+    """Tests for size-capped prompt assembly"""
+
+    def test_optional_sections_respect_cap_and_reserve(self):
+        """Test that optional sections are skipped once they no longer fit"""
+        buffer = PromptBuffer(max_chars=20, reserve=5)
+        buffer.write("0123456789")
+        assert buffer.write_optional("abc", "small") is True
+        assert buffer.write_optional("defghi", "large") is False
+        buffer.write("END!!")
+        assert buffer.getvalue() == "0123456789abcEND!!"
+        assert buffer.omitted == ["large"]
+
+
+class TestStreamingPrompt:
+    """Tests for bounded-memory prompt building"""
+
+    def _tester(self, **config):
+        tester = AngularTester.__new__(AngularTester)
+        tester.config = dict({"summarize_dependencies": False}, **config)
+        return tester
+
+    def test_release_drops_emitted_sources(self):
+        """Test that related sources are removed from the dict once in the prompt"""
+        related_files = {
+            "/app/a.component.ts": "export class AComponent {}",
+            "/app/a.service.ts": "export class AService {}",
+            "/app/a.model.ts": "export interface A {}",
+        }
+        prompt = self._tester().build_prompt("/app/a.component.ts", related_files, release=True)
+        assert "export class AService {}" in prompt
+        assert "export interface A {}" in prompt
+        assert list(related_files) == ["/app/a.component.ts"]
+
+    def test_prompt_cap_keeps_component_and_closing(self):
+        """Test that the cap drops related files but never the component or instructions"""
+        related_files = {
+            "/app/a.component.ts": "export class AComponent {}",
+            "/app/big.service.ts": "x" * 5000,
+        }
+        prompt = self._tester(max_prompt_chars=1500).build_prompt(
+            "/app/a.component.ts", related_files, feedback="it failed")
+        assert "export class AComponent {}" in prompt
+        assert "x" * 100 not in prompt
+        assert "it failed" in prompt
+        assert prompt.endswith("Only return the test code, nothing else.")
+
+    def test_context_limit_stops_reading(self, tmp_path):
+        """Test that collection stops once the context limit is reached"""
+        (tmp_path / "a.model.ts").write_text("export interface A { value: string; }" + " " * 200)
+        (tmp_path / "b.model.ts").write_text("export interface B {}")
+        component = tmp_path / "a.component.ts"
+        component.write_text("import { A } from './a.model';\nimport { B } from './b.model';\nexport class AComponent {}")
+        tester = self._tester()
+        assert len(tester.collect_related_files(str(component))) == 3
+        assert len(tester.collect_related_files(str(component), max_chars=150)) == 2
+
+
+class TestPromptLayout:
+    """Tests for the prefix-cache-friendly prompt layout"""
+
+    def _tester(self, **config):
+        tester = AngularTester.__new__(AngularTester)
+        tester.config = dict({"summarize_dependencies": False}, **config)
+        return tester
+
+    def test_shared_dependencies_form_common_prefix(self):
+        """Test that components with the same dependencies share everything before their own code"""
+        tester = self._tester()
+        shared = {"/app/z.service.ts": "export class ZService {}", "/app/a.model.ts": "export interface A {}"}
+        first = tester.build_prompt("/app/one.component.ts",
+                                    dict({"/app/one.component.ts": "export class OneComponent {}"}, **shared))
+        second = tester.build_prompt("/app/two.component.ts",
+                                     dict(shared, **{"/app/two.component.ts": "export class TwoComponent {}"}))
+
+        prefix = first[:first.index("Component file:")]
+        assert second.startswith(prefix)
+        assert prefix.index("/app/a.model.ts") < prefix.index("/app/z.service.ts")
+        assert "one.component" not in prefix
+
+    def test_legacy_layout(self):
+        """Test that the component-first layout is kept when disabled"""
+        tester = self._tester(cache_friendly_prompt=False)
+        prompt = tester.build_prompt("/app/one.component.ts", {
+            "/app/one.component.ts": "export class OneComponent {}",
+            "/app/a.model.ts": "export interface A {}",
+        })
+        assert prompt.index("Component file: /app/one.component.ts") < prompt.index("Component code:")
+        assert prompt.index("Component code:") < prompt.index("Related file (/app/a.model.ts)")
+
+    def test_group_by_dependencies(self, tmp_path):
+        """Test that components sharing dependencies are queued together"""
+        (tmp_path / "a.service.ts").write_text("export class AService {}")
+        (tmp_path / "b.service.ts").write_text("export class BService {}")
+        files = []
+        for name, service in (("one", "a"), ("two", "b"), ("three", "a")):
+            component = tmp_path / f"{name}.component.ts"
+            component.write_text(f"import {{ X }} from './{service}.service';\nexport class C {{}}")
+            files.append(str(component))
+
+        ordered = [os.path.basename(path) for path in self._tester().group_by_dependencies(files)]
+        assert ordered == ["one.component.ts", "three.component.ts", "two.component.ts"]
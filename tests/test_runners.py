@@ -0,0 +1,117 @@
+import pytest
+import os
+import sys
+import json
+from unittest.mock import patch, MagicMock
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from angular_tester.main import AngularTester
+from angular_tester.karma import group_results_by_spec
+from angular_tester.runners import (
+    JestRunner, KarmaRunner, SpecRunner, VitestRunner, AngularUnitTestRunner, create_runner, detect_runner, load_jest_results
+)
+
+
+JEST_REPORT = {
+    "testResults": [{
+        "name": "/repo/src/app/user.component.spec.ts",
+        "assertionResults": [
+            {"ancestorTitles": ["UserComponent"], "title": "should create", "status": "passed", "duration": 12},
+            {"ancestorTitles": ["UserComponent"], "title": "should save", "status": "failed", "duration": 3,
+             "failureMessages": ["Expected 1 to be 2"]},
+            {"ancestorTitles": ["UserComponent"], "title": "later", "status": "pending", "duration": None},
+        ],
+    }],
+}
+
+
+class TestRunners:
+    """Tests for the test runner backends"""
+
+    def test_karma_command_unchanged(self, tmp_path):
+        """Test that the Karma backend builds the ng test command"""
+        runner = KarmaRunner({})
+        assert runner.command([], True, None, str(tmp_path)) == [
+            'ng', 'test', '--browsers=ChromeHeadless', '--watch=false', '--code-coverage'
+        ]
+        assert runner.needs_browser
+
+    def test_jest_and_vitest_commands(self, tmp_path):
+        """Test that coverage is written where the coverage check reads it"""
+        project = {"name": "admin", "root": "apps/admin"}
+        jest = JestRunner({"jest_config": "jest.config.ts"}).command(
+            ["src/a.spec.ts"], True, "results.json", str(tmp_path), project)
+        assert jest[:4] == ['npx', 'jest', '--ci', '--config=jest.config.ts']
+        assert '--coverageDirectory=coverage/admin' in jest
+        assert '--coverageReporters=json-summary' in jest and '--coverageReporters=json' in jest
+        assert '--outputFile=results.json' in jest and jest[-1] == 'src/a.spec.ts'
+
+        vitest = VitestRunner({}).command(["src/a.spec.ts"], True, "results.json", str(tmp_path), project)
+        assert vitest[:4] == ['npx', 'vitest', 'run', '--root=apps/admin']
+        assert f'--coverage.reportsDirectory={os.path.abspath("coverage/admin")}' in vitest
+        assert '--reporter=json' in vitest and vitest[-1] == os.path.abspath("src/a.spec.ts")
+        assert not VitestRunner.needs_browser
+
+    def test_angular_unit_test_command(self, tmp_path):
+        """Test the @angular/build:unit-test command"""
+        command = AngularUnitTestRunner({}).command(["src/a.spec.ts"], True, None, str(tmp_path), {"name": "app", "root": ""})
+        assert command[:4] == ['ng', 'test', 'app', '--watch=false']
+        assert '--coverage' in command and '--include=src/a.spec.ts' in command
+
+    def test_load_jest_results(self, tmp_path):
+        """Test that Jest JSON reports become per-spec records"""
+        results_file = tmp_path / "results.json"
+        results_file.write_text(json.dumps(JEST_REPORT))
+        records = load_jest_results(str(results_file))
+        assert [(r["success"], r["skipped"]) for r in records] == [(True, False), (False, False), (False, True)]
+        assert records[1]["log"] == ["Expected 1 to be 2"]
+        assert load_jest_results(str(tmp_path / "missing.json")) is None
+
+        grouped = group_results_by_spec(records, ["/repo/src/app/user.component.spec.ts"])
+        summary = grouped["/repo/src/app/user.component.spec.ts"]
+        assert (summary["passed"], summary["failed"], summary["skipped"]) == (1, 1, 1)
+
+    def test_detect_runner(self, tmp_path):
+        """Test detection from the test builder and from config files"""
+        assert detect_runner(str(tmp_path)) == "karma"
+        (tmp_path / "jest.config.ts").write_text("")
+        assert detect_runner(str(tmp_path)) == "jest"
+        project = {"name": "app", "root": "", "test": {"builder": "@angular/build:unit-test"}}
+        assert detect_runner(str(tmp_path), project) == "angular"
+
+        assert isinstance(create_runner({}), KarmaRunner)
+        with pytest.raises(ValueError):
+            create_runner({"test_runner": "mocha"})
+        with pytest.raises(TypeError):
+            SpecRunner({})
+
+    def test_run_tests_with_jest(self, tmp_path):
+        """Test that Jest runs without a browser check and reports per-spec results"""
+        tester = AngularTester.__new__(AngularTester)
+        tester.config = {"test_runner": "jest", "cache_dir": str(tmp_path)}
+        tester.ensure_chrome_installed = MagicMock()
+
+        def run(command, **kwargs):
+            (tmp_path / "jest-results.json").write_text(json.dumps(JEST_REPORT))
+            return MagicMock(returncode=1, stdout="", stderr="")
+
+        with patch("angular_tester.main.subprocess.run", side_effect=run) as mock_run:
+            assert not tester.run_tests()
+        assert mock_run.call_args[0][0][:2] == ['npx', 'jest']
+        tester.ensure_chrome_installed.assert_not_called()
+        assert len(tester.spec_results) == 3
+
+    def test_prompt_conventions(self):
+        """Test that the prompt names the runner's mocking API"""
+        tester = AngularTester.__new__(AngularTester)
+        tester.config = {"test_runner": "vitest", "few_shot_examples": 0}
+        prompt = tester.build_prompt("a.component.ts", {"a.component.ts": "export class A {}"})
+        assert "vi.fn()" in prompt
+        assert "instead of Jasmine spies.\n\n" in prompt
+        tester.config["cache_friendly_prompt"] = False
+        assert "instead of Jasmine spies.\n\nComponent file:" in tester.build_prompt(
+            "a.component.ts", {"a.component.ts": "export class A {}"})
+        tester.config["test_runner"] = "karma"
+        assert "vi.fn()" not in tester.build_prompt("a.component.ts", {"a.component.ts": "export class A {}"})
@@ -0,0 +1,111 @@
+import pytest
+import os
+import sys
+import json
+import time
+import threading
+import urllib.request
+import urllib.error
+from unittest.mock import patch, MagicMock
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from angular_tester.main import AngularTester
+from angular_tester.service import QueueFull, JobService, make_server
+
+
+def _tester(cache_dir=".angular-tester"):
+    tester = AngularTester.__new__(AngularTester)
+    tester.config = {"history": False, "metrics": False, "cache_dir": str(cache_dir)}
+    tester.coverage_threshold = 80
+    return tester
+
+
+def _wait(service, job_id, timeout=5.0):
+    deadline = time.time() + timeout
+    while service.status(job_id)["status"] in ("queued", "running"):
+        assert time.time() < deadline, "job did not finish"
+        time.sleep(0.01)
+    return service.status(job_id)
+
+
+class TestTesterSession:
+    """Tests for re-entrant tester sessions"""
+
+    def test_session_shares_caches_but_not_run_state(self):
+        """Test that sessions reuse the warm tester and isolate per-run state"""
+        tester = _tester()
+        tester.metadata_extractor = MagicMock()
+        tester.written_specs = {"old.spec.ts": "old.component.ts"}
+        session = tester.session()
+        assert session.metadata_extractor is tester.metadata_extractor
+        assert session.config is tester.config
+        assert session.written_specs == {}
+        session.written_specs["new.spec.ts"] = "new.component.ts"
+        assert tester.written_specs == {"old.spec.ts": "old.component.ts"}
+
+
+class TestJobService:
+    """Tests for the job queue and HTTP API"""
+
+    def test_generate_changed_components(self, tmp_path):
+        """Test that a generate job only regenerates components affected by the changes"""
+        (tmp_path / "user.service.ts").write_text("export class UserService {}")
+        (tmp_path / "user.component.ts").write_text(
+            "import { UserService } from './user.service';\nexport class UserComponent {}")
+        (tmp_path / "other.component.ts").write_text("export class OtherComponent {}")
+        tester = _tester(tmp_path / "cache")
+        service = JobService(tester, str(tmp_path), workers=2)
+        with patch.object(AngularTester, "create_or_update_test", return_value=True) as create:
+            job = service.submit({"type": "generate", "changed": [str(tmp_path / "user.service.ts")]})
+            job = _wait(service, job["id"])
+        service.shutdown()
+        assert job["status"] == "done"
+        user = os.path.normpath(str(tmp_path / "user.component.ts"))
+        assert job["result"]["components"] == [user]
+        assert "finished" in job and job is not service.jobs[job["id"]]
+        create.assert_called_once_with(user)
+
+    def test_queue_is_bounded(self, tmp_path):
+        """Test that submissions beyond the queue size are rejected"""
+        release = threading.Event()
+        tester = _tester(tmp_path / "cache")
+        service = JobService(tester, str(tmp_path), workers=1, queue_size=1)
+        with patch.object(AngularTester, "run_tests", side_effect=lambda **kwargs: release.wait(5)):
+            service.submit({"type": "test"})
+            assert service.pending() == 1
+            with pytest.raises(QueueFull):
+                service.submit({"type": "test"})
+            release.set()
+            service.shutdown()
+        with pytest.raises(ValueError):
+            service.submit({"type": "deploy"})
+
+    def test_http_api(self, tmp_path):
+        """Test submitting a job and polling its status over HTTP"""
+        tester = _tester(tmp_path / "cache")
+        service = JobService(tester, str(tmp_path), workers=1)
+        server = make_server(service, "127.0.0.1", 0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            with patch.object(AngularTester, "get_coverage_report", return_value=91.5):
+                request = urllib.request.Request(f"{base}/jobs", data=json.dumps({"type": "coverage"}).encode(),
+                                                 headers={"Content-Type": "application/json"}, method="POST")
+                with urllib.request.urlopen(request) as response:
+                    assert response.status == 202
+                    job = json.load(response)
+                _wait(service, job["id"])
+            with urllib.request.urlopen(f"{base}/jobs/{job['id']}") as response:
+                result = json.load(response)["result"]
+            assert result == {"coverage": 91.5, "threshold": 80, "success": True}
+
+            with pytest.raises(urllib.error.HTTPError) as error:
+                urllib.request.urlopen(f"{base}/jobs/unknown")
+            assert error.value.code == 404
+        finally:
+            server.shutdown()
+            server.server_close()
+            service.shutdown()
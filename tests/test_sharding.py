@@ -0,0 +1,129 @@
+import pytest
+import os
+import sys
+import json
+import argparse
+from unittest.mock import patch, MagicMock
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from angular_tester.main import AngularTester, main
+from angular_tester.sharding import assign_shards, merge_shard_results, parse_shard, select_shard
+from angular_tester.coverage import merge_coverage_final, summarize_coverage_final
+
+
+def _file_coverage(hits):
+    """coverage-final entry with one statement per line"""
+    return {
+        "statementMap": {str(i): {"start": {"line": i + 1}, "end": {"line": i + 1}} for i in range(len(hits))},
+        "s": {str(i): count for i, count in enumerate(hits)},
+        "f": {},
+        "b": {},
+    }
+
+
+class TestSharding:
+    """Tests for shard partitioning"""
+
+    def test_parse_shard(self):
+        """Test parsing of i/N shard specifications"""
+        assert parse_shard("2/4") == (2, 4)
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_shard("0/4")
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_shard("two")
+
+    def test_invalid_shard_message_is_shown(self, capsys):
+        """Test that the command line reports why a shard specification is invalid"""
+        with patch("sys.argv", ["angular-tester", "--shard", "5/4"]), pytest.raises(SystemExit):
+            main()
+        assert "index must be between 1 and 4" in capsys.readouterr().err
+
+    def test_round_robin_without_weights(self):
+        """Test that shards cover every file exactly once"""
+        files = [f"c{i}.component.ts" for i in range(7)]
+        shards = assign_shards(list(reversed(files)), 3)
+        assert shards[0] == ["c0.component.ts", "c3.component.ts", "c6.component.ts"]
+        assert sorted(sum(shards, [])) == sorted(files)
+
+    def test_weighted_shards_are_balanced(self):
+        """Test longest-first placement using historical cost"""
+        weights = {"a.ts": 10.0, "b.ts": 6.0, "c.ts": 4.0, "d.ts": 1.0}
+        shards = assign_shards(["d.ts", "c.ts", "b.ts", "a.ts", "new.ts"], 2, weights)
+        assert shards == [["a.ts", "c.ts"], ["b.ts", "d.ts", "new.ts"]]
+
+    def test_select_shard_uses_relative_paths(self):
+        """Test that the checkout location does not change the assignment"""
+        first = select_shard(["/ci/a/src/x.ts", "/ci/a/src/y.ts"], "/ci/a/src", (1, 2))
+        second = select_shard(["/home/b/src/y.ts", "/home/b/src/x.ts"], "/home/b/src", (1, 2))
+        assert first == ["/ci/a/src/x.ts"]
+        assert second == ["/home/b/src/x.ts"]
+
+    def test_process_components_only_handles_its_shard(self):
+        """Test that process_components restricts work to the shard"""
+        tester = AngularTester.__new__(AngularTester)
+        tester.shard = (2, 2)
+        tester.find_component_files = MagicMock(return_value=["/src/a.component.ts", "/src/b.component.ts"])
+        tester.create_or_update_test = MagicMock(return_value=True)
+
+        assert tester.process_components("/src")
+        tester.create_or_update_test.assert_called_once_with("/src/b.component.ts")
+
+    def test_shard_only_runs_its_specs(self, tmp_path):
+        """Test that a shard runs the specs of its own components, not the whole suite"""
+        for name in ("a", "b"):
+            (tmp_path / f"{name}.component.ts").write_text("")
+            (tmp_path / f"{name}.component.spec.ts").write_text("")
+        tester = AngularTester.__new__(AngularTester)
+        tester.shard = (2, 2)
+        tester.config = {"warmup_build": False}
+        tester.run_status = {"processed": False, "tests_passed": False}
+        tester.processed_components = [str(tmp_path / "b.component.ts")]
+        tester.process_components = MagicMock(return_value=True)
+        tester.run_tests = MagicMock(return_value=True)
+
+        assert tester._run(str(tmp_path))
+        tester.run_tests.assert_called_once_with([str(tmp_path / "b.component.spec.ts")])
+
+
+class TestMergeShards:
+    """Tests for merging shard results"""
+
+    def _write(self, tmp_path, index, count, hits, passed=True, components=None, all_components=None):
+        path = tmp_path / f"shard-{index}-of-{count}.json"
+        path.write_text(json.dumps({
+            "shard": [index, count], "components": components or [f"c{index}.ts"],
+            "all_components": all_components or [f"c{i}.ts" for i in range(1, count + 1)], "processed": True,
+            "tests_passed": passed, "coverage": {"/src/app.ts": _file_coverage(hits)},
+        }))
+        return str(path)
+
+    def test_merge_coverage_is_union(self):
+        """Test that hit counts of the same file are added"""
+        merged = merge_coverage_final([{"f.ts": _file_coverage([1, 0, 0])}, {"f.ts": _file_coverage([0, 2, 0])}])
+        summary = summarize_coverage_final(merged)
+        assert merged["f.ts"]["s"] == {"0": 1, "1": 2, "2": 0}
+        assert summary["total"]["lines"] == {"total": 3, "covered": 2, "pct": 66.67}
+
+    def test_merge_shard_results_gate(self, tmp_path):
+        """Test the combined gate decision"""
+        files = [self._write(tmp_path, 1, 2, [1, 1, 0, 0]), self._write(tmp_path, 2, 2, [0, 0, 1, 0])]
+        assert merge_shard_results(files, threshold=75)
+        assert not merge_shard_results(files, threshold=80)
+
+    def test_merge_shard_results_missing_or_failed(self, tmp_path):
+        """Test that missing or failed shards fail the gate"""
+        first = self._write(tmp_path, 1, 2, [1, 1])
+        assert not merge_shard_results([first], threshold=0)
+        second = self._write(tmp_path, 2, 2, [1, 1], passed=False)
+        assert not merge_shard_results([first, second], threshold=0)
+
+    def test_merge_fails_on_divergent_partitions(self, tmp_path):
+        """Test that overlapping or incomplete partitions fail the merge"""
+        overlap = [self._write(tmp_path, 1, 2, [1], components=["a.ts", "b.ts"], all_components=["a.ts", "b.ts"]),
+                   self._write(tmp_path, 2, 2, [1], components=["b.ts"], all_components=["a.ts", "b.ts"])]
+        assert not merge_shard_results(overlap, threshold=0)
+        gap = [self._write(tmp_path, 1, 2, [1], components=["a.ts"], all_components=["a.ts", "b.ts", "c.ts"]),
+               self._write(tmp_path, 2, 2, [1], components=["b.ts"], all_components=["a.ts", "b.ts", "c.ts"])]
+        assert not merge_shard_results(gap, threshold=0)
@@ -0,0 +1,117 @@
+import pytest
+import os
+import sys
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from angular_tester.main import AngularTester
+from angular_tester.template_engine import TemplateError, compile_template, render_template, sample_value
+
+
+SERVICE = """
+@Injectable({ providedIn: 'root' })
+export class UserService {
+  load(id: number) { return id; }
+  save(): void {}
+  get count() { return 1; }
+}
+"""
+
+COMPONENT = """
+import { Component, Input, Output, EventEmitter, inject } from '@angular/core';
+import { UserService } from '../services/user.service';
+
+@Component({ selector: 'app-user-card', template: '' })
+export class UserCardComponent {
+  @Input() name: string = '';
+  @Output() selected = new EventEmitter<string>();
+  private users = inject(UserService);
+  select() { this.selected.emit(this.name); }
+}
+"""
+
+TEMPLATE = """{{imports}}
+{{#each services}}
+import { {{type}} } from '{{path}}';
+{{/each}}
+
+describe('{{component_name}}', () => {
+  {{#each services}}
+  const {{mock}} = jasmine.createSpyObj('{{type}}', [{{method_names}}]);
+  {{/each}}
+  providers: [{{#each services}}{{provider}}{{#unless @last}}, {{/unless}}{{/each}}]
+  {{#each inputs}}
+  fixture.componentRef.setInput('{{name}}', {{sample}});
+  {{/each}}
+  {{#each outputs}}
+  it('emits {{name}}', () => {});
+  {{else}}
+  // no outputs
+  {{/each}}
+  {{#each methods}}
+  it('calls {{name}}', () => {});
+  {{/each}}
+});"""
+
+
+class TestTemplateEngine:
+    """Tests for compiled spec templates"""
+
+    def test_variables_and_blocks(self):
+        """Test loops, conditionals, else branches and loop variables"""
+        context = {"items": [{"name": "a"}, {"name": "b"}], "flag": False, "nested": {"value": 3}}
+        source = "{{#each items}}{{@index}}:{{name}}{{#unless @last}},{{/unless}}{{/each}}" \
+                 "|{{#if flag}}yes{{else}}no{{/if}}|{{nested.value}}|{{missing}}"
+        assert render_template(source, context) == "0:a,1:b|no|3|{{missing}}"
+        assert render_template("{{#each items}}x{{else}}empty{{/each}}", {"items": []}) == "empty"
+
+    def test_angular_interpolation_is_kept(self):
+        """Test that interpolation in a host component's inline template is not replaced"""
+        source = "@Component({ template: '<p>{{ value }} {{user.name}}</p>' })\nclass Host { value = '{{component_name}}'; }"
+        assert render_template(source, {"component_name": "CardComponent"}) == \
+            "@Component({ template: '<p>{{ value }} {{user.name}}</p>' })\nclass Host { value = 'CardComponent'; }"
+
+    def test_standalone_tags_leave_no_blank_lines(self):
+        """Test that block tags on their own lines are removed with their line"""
+        source = "a\n  {{#each items}}\n  - {{this}}\n  {{/each}}\nb"
+        assert render_template(source, {"items": [1, 2]}) == "a\n  - 1\n  - 2\nb"
+
+    def test_compiled_once(self):
+        """Test that identical sources share one compiled template"""
+        assert compile_template("{{#if x}}y{{/if}}") is compile_template("{{#if x}}y{{/if}}")
+
+    def test_unbalanced_blocks(self):
+        """Test that unbalanced block tags are reported"""
+        with pytest.raises(TemplateError):
+            compile_template("{{#each items}}x")
+        with pytest.raises(TemplateError):
+            compile_template("{{#if x}}y{{/each}}")
+
+    def test_sample_value(self):
+        """Test sample input values by type"""
+        assert sample_value("string") == "'test'"
+        assert sample_value("number | null") == "1"
+        assert sample_value("User[]") == "[]"
+        assert sample_value("'primary' | 'accent'") == "'primary'"
+        assert sample_value(None) == "{} as any"
+
+    def test_custom_template_with_component_metadata(self, tmp_path):
+        """Test that custom templates see inputs, outputs, mocked services and methods"""
+        component_file = str(tmp_path / "user-card.component.ts")
+        (tmp_path / "user-card.component.ts").write_text(COMPONENT)
+        related_files = {component_file: COMPONENT, str(tmp_path / "user.service.ts"): SERVICE}
+        tester = AngularTester.__new__(AngularTester)
+
+        spec = tester._apply_custom_template(TEMPLATE, component_file, related_files)
+
+        assert spec == """import { UserCardComponent } from './user-card.component';
+import { UserService } from '../services/user.service';
+
+describe('UserCardComponent', () => {
+  const mockUserService = jasmine.createSpyObj('UserService', ['load', 'save']);
+  providers: [{ provide: UserService, useValue: mockUserService }]
+  fixture.componentRef.setInput('name', 'test');
+  it('emits selected', () => {});
+  it('calls select', () => {});
+});"""
@@ -0,0 +1,91 @@
+import pytest
+import os
+import sys
+import json
+from unittest.mock import patch, MagicMock
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from angular_tester.main import AngularTester
+from angular_tester.typecheck import SpecTypeChecker, load_tsconfig
+
+
+class TestSpecTypeChecker:
+    """Tests for the TypeScript pre-flight check"""
+
+    def _project(self, tmp_path):
+        (tmp_path / "tsconfig.spec.json").write_text(
+            '/* spec config */\n{\n  "extends": "./tsconfig.json",\n'
+            '  "include": ["src/**/*.spec.ts", "src/**/*.d.ts",],\n}\n'
+        )
+        return SpecTypeChecker(project_dir=str(tmp_path))
+
+    def test_load_tsconfig_with_comments(self, tmp_path):
+        """Test that tsconfig comments and trailing commas are tolerated"""
+        self._project(tmp_path)
+        config = load_tsconfig(str(tmp_path / "tsconfig.spec.json"))
+        assert config["include"] == ["src/**/*.spec.ts", "src/**/*.d.ts"]
+
+    def test_write_preflight_config(self, tmp_path):
+        """Test that the derived config only compiles the given specs"""
+        checker = self._project(tmp_path)
+        spec_file = str(tmp_path / "src" / "a.component.spec.ts")
+
+        config_path = checker.write_preflight_config([spec_file])
+        with open(config_path) as f:
+            config = json.load(f)
+
+        assert config["files"] == [spec_file]
+        assert config["include"] == [str(tmp_path / "src/**/*.d.ts")]
+        assert config["compilerOptions"]["noEmit"] is True
+        assert config["compilerOptions"]["incremental"] is True
+        assert config["compilerOptions"]["tsBuildInfoFile"].endswith(os.path.join(".angular-tester", "preflight.tsbuildinfo"))
+
+    @patch("angular_tester.typecheck.subprocess.run")
+    def test_check_groups_errors_by_spec(self, mock_run, tmp_path):
+        """Test that diagnostics are attributed to the checked specs only"""
+        checker = self._project(tmp_path)
+        spec_file = str(tmp_path / "src" / "a.component.spec.ts")
+        mock_run.return_value = MagicMock(returncode=2, stderr="", stdout=(
+            "src/a.component.spec.ts(3,24): error TS2307: Cannot find module './missing'.\n"
+            "src/other.ts(1,1): error TS1005: ';' expected.\n"
+        ))
+
+        errors = checker.check([spec_file])
+        assert errors == {spec_file: ["line 3: TS2307 Cannot find module './missing'."]}
+
+    @patch("angular_tester.typecheck.subprocess.run")
+    def test_check_without_compiler(self, mock_run, tmp_path):
+        """Test that a missing compiler skips the check"""
+        checker = self._project(tmp_path)
+        mock_run.side_effect = FileNotFoundError("npx")
+        assert checker.check([str(tmp_path / "a.spec.ts")]) is None
+
+
+class TestPreflightTypecheck:
+    """Tests for regenerating specs that do not compile"""
+
+    @patch("angular_tester.main.SpecTypeChecker")
+    def test_broken_specs_are_regenerated_then_replaced(self, mock_checker_class, tmp_path):
+        """Test that specs failing twice fall back to the basic template"""
+        tester = AngularTester.__new__(AngularTester)
+        tester.config = {"typecheck_retries": 1}
+        tester.create_or_update_test = MagicMock(return_value=True)
+        tester.generate_basic_test_content = MagicMock(return_value="basic test")
+        good_spec = str(tmp_path / "good.component.spec.ts")
+        bad_spec = str(tmp_path / "bad.component.spec.ts")
+        mock_checker_class.return_value.check.side_effect = [
+            {bad_spec: ["line 1: TS2307 Cannot find module"]},
+            {bad_spec: ["line 1: TS2307 Cannot find module"]},
+        ]
+
+        replaced = tester.preflight_typecheck({good_spec: "good.component.ts", bad_spec: "bad.component.ts"})
+
+        assert replaced == 1
+        tester.create_or_update_test.assert_called_once_with(
+            "bad.component.ts", feedback="line 1: TS2307 Cannot find module"
+        )
+        with open(bad_spec) as f:
+            assert f.read() == "basic test"
+        assert not os.path.exists(good_spec)
@@ -0,0 +1,119 @@
+import pytest
+import os
+import sys
+import subprocess
+from unittest.mock import patch, MagicMock
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from angular_tester.main import AngularTester
+from angular_tester.warmup import BuildWarmer
+
+
+class TestBuildWarmer:
+    """Tests for the background build warm-up"""
+
+    @patch("angular_tester.warmup.subprocess.Popen")
+    def test_start_uses_persistent_cache(self, mock_popen):
+        """Test that the warm-up runs ng test with the build cache forced on"""
+        warmer = BuildWarmer(['ng', 'test', '--watch=false'])
+        assert warmer.start() is True
+
+        args, kwargs = mock_popen.call_args
+        assert args[0] == ['ng', 'test', '--watch=false']
+        assert kwargs["env"]["NG_PERSISTENT_BUILD_CACHE"] == "1"
+
+    @patch("angular_tester.warmup.subprocess.Popen")
+    def test_warmup_builds_like_the_real_run(self, mock_popen, tmp_path):
+        """Test that the warm-up uses the real run's command, coverage and Karma wrapper included"""
+        tester = AngularTester.__new__(AngularTester)
+        tester.config = {"cache_dir": str(tmp_path)}
+        tester.ensure_chrome_installed = MagicMock(return_value=True)
+        with patch("angular_tester.warmup.threading.Thread"):
+            assert tester.start_build_warmup() is not None
+        command = mock_popen.call_args[0][0]
+        assert '--code-coverage' in command
+        assert any(arg.startswith('--karma-config=') for arg in command)
+
+        with patch("angular_tester.main.subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+            tester.run_tests()
+        assert mock_run.call_args[0][0] == command
+
+    @patch("angular_tester.warmup.subprocess.Popen")
+    def test_warmup_follows_detected_runner(self, mock_popen, tmp_path, monkeypatch):
+        """Test that test_runner "auto" warms up when Karma is detected and skips other runners"""
+        monkeypatch.chdir(tmp_path)
+        tester = AngularTester.__new__(AngularTester)
+        tester.config = {"cache_dir": str(tmp_path / "cache"), "test_runner": "auto"}
+        tester.ensure_chrome_installed = MagicMock(return_value=True)
+        with patch("angular_tester.warmup.threading.Thread"):
+            assert tester.start_build_warmup() is not None
+        (tmp_path / "jest.config.ts").write_text("")
+        assert tester.start_build_warmup() is None
+
+    @patch("angular_tester.warmup.subprocess.Popen")
+    def test_start_without_angular_cli(self, mock_popen):
+        """Test that a missing Angular CLI disables the warm-up"""
+        mock_popen.side_effect = FileNotFoundError("ng")
+        warmer = BuildWarmer(['ng', 'test'])
+        assert warmer.start() is False
+        assert warmer.wait(1) is None
+
+    def test_wait_timeout_cancels(self):
+        """Test that a warm-up exceeding the timeout is terminated"""
+        warmer = BuildWarmer(['ng', 'test'])
+        warmer.process = MagicMock()
+        warmer.process.wait.side_effect = [subprocess.TimeoutExpired("ng", 1), 0]
+        warmer.process.poll.return_value = None
+
+        assert warmer.wait(1) is None
+        warmer.process.terminate.assert_called_once()
+
+
+    def test_stops_once_the_build_is_done(self):
+        """Test that the warm-up is stopped before the existing suite runs"""
+        script = "import time; print('Application bundle generation complete.', flush=True); time.sleep(30)"
+        warmer = BuildWarmer([sys.executable, "-c", script])
+        assert warmer.start()
+        assert warmer.built.wait(10)
+        assert warmer.wait(10) is None
+        assert not warmer.running
+
+    def test_wait_returns_exit_code_of_failed_build(self):
+        """Test that a warm-up ending on its own reports its exit code"""
+        warmer = BuildWarmer([sys.executable, "-c", "import sys; sys.exit(3)"])
+        assert warmer.start()
+        assert warmer.wait(10) == 3
+
+
+class TestRunWithWarmup:
+    """Tests for overlapping the warm-up with generation"""
+
+    def test_warmup_runs_during_generation(self):
+        """Test that the warm-up starts before generation and is awaited before tests"""
+        tester = AngularTester.__new__(AngularTester)
+        tester.coverage_threshold = 80
+        tester.config = {"warmup_timeout": 42, "metrics": False}
+        calls = []
+        warmer = MagicMock()
+        warmer.wait.side_effect = lambda timeout: calls.append(("wait", timeout))
+        tester.start_build_warmup = MagicMock(side_effect=lambda: calls.append("start") or warmer)
+        tester.process_components = MagicMock(side_effect=lambda d: calls.append("process") or True)
+        tester.run_tests = MagicMock(side_effect=lambda: calls.append("test") or True)
+        tester.check_coverage = MagicMock(return_value=True)
+
+        assert tester.run("./src") is True
+        assert calls == ["start", "process", ("wait", 42), "test"]
+
+    def test_warmup_cancelled_when_processing_fails(self):
+        """Test that the warm-up is stopped if generation fails"""
+        tester = AngularTester.__new__(AngularTester)
+        tester.coverage_threshold = 80
+        warmer = MagicMock()
+        tester.start_build_warmup = MagicMock(return_value=warmer)
+        tester.process_components = MagicMock(return_value=False)
+
+        assert tester.run("./src") is False
+        warmer.cancel.assert_called_once()
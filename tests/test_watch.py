@@ -0,0 +1,127 @@
+import pytest
+import os
+import sys
+from unittest.mock import patch, MagicMock
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from angular_tester.main import AngularTester
+from angular_tester.watch import ImportGraph, PollingWatcher, changed_paths, snapshot, wait_for_changes
+
+
+def _write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    return str(path)
+
+
+class TestWatchPrimitives:
+    """Tests for change detection and debouncing"""
+
+    def test_snapshot_ignores_specs(self, tmp_path):
+        """Test that spec files and node_modules are not watched"""
+        _write(tmp_path / "a.component.ts", "export class A {}")
+        _write(tmp_path / "a.component.spec.ts", "describe('A', () => {});")
+        _write(tmp_path / "node_modules" / "lib" / "index.ts", "")
+        assert list(snapshot(str(tmp_path))) == [os.path.normpath(str(tmp_path / "a.component.ts"))]
+
+    def test_polling_watcher_reports_changes(self, tmp_path):
+        """Test that added, modified and removed files are reported"""
+        first = _write(tmp_path / "a.service.ts", "export class A {}")
+        watcher = PollingWatcher(str(tmp_path))
+        assert watcher.poll() == set()
+
+        _write(tmp_path / "a.service.ts", "export class A { x = 1; }")
+        second = _write(tmp_path / "b.model.ts", "export interface B {}")
+        assert watcher.poll() == {os.path.normpath(first), os.path.normpath(second)}
+        assert changed_paths({"x.ts": (1, 1)}, {}) == {"x.ts"}
+
+    def test_wait_for_changes_debounces(self):
+        """Test that bursts of changes are returned as one batch"""
+        watcher = MagicMock()
+        watcher.poll.side_effect = [set(), {"a.ts"}, {"b.ts"}, set()]
+        sleeps = []
+        assert wait_for_changes(watcher, 1.0, 0.2, sleep=sleeps.append) == {"a.ts", "b.ts"}
+        assert sleeps == [1.0, 1.0, 0.2, 0.2]
+
+
+class TestWatchMode:
+    """Tests for affected-only regeneration in watch mode"""
+
+    def _project(self, tmp_path):
+        _write(tmp_path / "user.model.ts", "export interface User { name: string; }")
+        _write(tmp_path / "user.service.ts",
+               "import { User } from './user.model';\nexport class UserService {}")
+        user = _write(tmp_path / "user.component.ts",
+                      "import { UserService } from './user.service';\nexport class UserComponent {}")
+        other = _write(tmp_path / "other.component.ts", "export class OtherComponent {}")
+        return user, other
+
+    def test_import_graph_affected(self, tmp_path):
+        """Test that transitive imports map changes back to components"""
+        user, other = self._project(tmp_path)
+        tester = AngularTester.__new__(AngularTester)
+        graph = ImportGraph(lambda component_file: tester.collect_related_files(component_file).keys())
+        graph.update(user)
+        graph.update(other)
+        assert graph.affected([str(tmp_path / "user.model.ts")]) == [os.path.normpath(user)]
+        assert graph.affected([other]) == [os.path.normpath(other)]
+        assert graph.affected([str(tmp_path / "unrelated.ts")]) == []
+
+    def test_import_graph_with_relative_directory(self, tmp_path, monkeypatch):
+        """Test that local imports are followed when components are found under a relative directory"""
+        self._project(tmp_path / "src" / "app")
+        monkeypatch.chdir(tmp_path)
+        tester = AngularTester.__new__(AngularTester)
+        graph = ImportGraph(lambda component_file: tester.collect_related_files(component_file).keys())
+        graph.update(os.path.join("src", "app", "user.component.ts"))
+        graph.update(os.path.join("src", "app", "other.component.ts"))
+        assert graph.apply([os.path.join("src", "app", "user.model.ts")]) == [
+            os.path.join("src", "app", "user.component.ts")
+        ]
+
+    def test_watch_cycle_regenerates_affected_only(self, tmp_path):
+        """Test that only affected components are regenerated and only their specs re-run"""
+        user, other = self._project(tmp_path)
+        tester = AngularTester.__new__(AngularTester)
+        tester.config = {"history": False, "metrics": False}
+        graph = ImportGraph(lambda component_file: tester.collect_related_files(component_file).keys())
+        graph.update(user)
+        graph.update(other)
+
+        with patch.object(tester, "create_or_update_test", return_value=True) as create, \
+             patch.object(tester, "run_tests", return_value=True) as run_tests:
+            assert tester.watch_cycle(graph, {os.path.normpath(str(tmp_path / "user.service.ts"))}, str(tmp_path))
+            create.assert_called_once_with(os.path.normpath(user))
+            run_tests.assert_called_once_with(
+                spec_files=[tester.find_test_file(os.path.normpath(user))], code_coverage=False
+            )
+
+    def test_watch_cycle_picks_up_new_components(self, tmp_path):
+        """Test that a newly created component is added and generated"""
+        tester = AngularTester.__new__(AngularTester)
+        tester.config = {"history": False, "metrics": False}
+        graph = ImportGraph(lambda component_file: tester.collect_related_files(component_file).keys())
+        new = os.path.normpath(_write(tmp_path / "new.component.ts", "export class NewComponent {}"))
+
+        with patch.object(tester, "create_or_update_test", return_value=True) as create, \
+             patch.object(tester, "run_tests", return_value=True):
+            tester.watch_cycle(graph, {new}, str(tmp_path))
+        create.assert_called_once_with(new)
+        assert new in graph.closures
+
+    def test_new_files_follow_included_patterns(self, tmp_path):
+        """Test that added files are tracked when they match included_files, as in discovery"""
+        from angular_tester.config import ConfigManager
+        (tmp_path / ".angulartesterrc").write_text('{"included_files": ["*.component.ts", "*.service.ts"]}')
+        tester = AngularTester.__new__(AngularTester)
+        tester.config_manager = ConfigManager()
+        tester.config = tester.config_manager.load_config(str(tmp_path))
+        graph = ImportGraph(lambda component_file: tester.collect_related_files(component_file).keys(),
+                            tester.is_component_file)
+        service = os.path.normpath(_write(tmp_path / "user.service.ts", "export class UserService {}"))
+        pipe = os.path.normpath(_write(tmp_path / "user.pipe.ts", "export class UserPipe {}"))
+        assert graph.apply([service, pipe]) == [service]
+        os.remove(service)
+        assert graph.apply([service]) == [] and service not in graph.closures
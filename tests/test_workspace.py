@@ -0,0 +1,107 @@
+import pytest
+import os
+import sys
+import json
+from unittest.mock import patch, MagicMock
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from angular_tester.main import AngularTester
+from angular_tester.workspace import discover_projects, select_projects
+
+
+ANGULAR_JSON = {
+    "projects": {
+        "shop": {
+            "root": "", "sourceRoot": "src", "projectType": "application",
+            "architect": {"test": {"builder": "@angular-devkit/build-angular:karma",
+                                   "options": {"karmaConfig": "karma.conf.js", "tsConfig": "tsconfig.spec.json"}}},
+        },
+        "docs": {"root": "projects/docs", "sourceRoot": "projects/docs/src", "architect": {}},
+    }
+}
+
+PROJECT_JSON = {
+    "name": "@acme/ui", "sourceRoot": "libs/ui/src", "projectType": "library",
+    "targets": {"test": {"executor": "@angular-devkit/build-angular:karma",
+                         "options": {"tsConfig": "libs/ui/tsconfig.spec.json"}}},
+}
+
+
+def write_workspace(root):
+    (root / "angular.json").write_text(json.dumps(ANGULAR_JSON))
+    (root / "libs" / "ui").mkdir(parents=True)
+    (root / "libs" / "ui" / "project.json").write_text(json.dumps(PROJECT_JSON))
+    # Packages under node_modules are never projects
+    (root / "node_modules" / "pkg").mkdir(parents=True)
+    (root / "node_modules" / "pkg" / "project.json").write_text(json.dumps({"name": "pkg"}))
+
+
+class TestWorkspace:
+    """Tests for multi-project workspaces"""
+
+    def test_discover_projects(self, tmp_path):
+        """Test reading projects from angular.json and Nx project.json files"""
+        write_workspace(tmp_path)
+
+        projects = discover_projects(str(tmp_path))
+
+        assert [project["name"] for project in projects] == ["@acme/ui", "docs", "shop"]
+        ui, docs, shop = projects
+        assert ui["root"] == os.path.join("libs", "ui")
+        assert ui["source_root"] == os.path.join(str(tmp_path), "libs/ui/src")
+        assert ui["type"] == "library"
+        assert shop["source_root"] == os.path.join(str(tmp_path), "src")
+        assert [project["name"] for project in select_projects(projects)] == ["@acme/ui", "shop"]
+        assert [project["name"] for project in select_projects(projects, ["shop"])] == ["shop"]
+
+    def test_project_config(self, tmp_path):
+        """Test that each project gets its own state directory and test configs"""
+        write_workspace(tmp_path)
+        tester = AngularTester.__new__(AngularTester)
+        tester.config = {"cache_dir": ".angular-tester", "karma_config": "karma.conf.js"}
+        ui = discover_projects(str(tmp_path))[0]
+
+        config = tester.project_config(ui)
+
+        assert config["cache_dir"] == os.path.join(".angular-tester", "projects", "acme_ui")
+        assert config["tsconfig_spec"] == "libs/ui/tsconfig.spec.json"
+        assert config["karma_config"] == "karma.conf.js"
+        assert tester.config["cache_dir"] == ".angular-tester"
+
+    def test_run_workspace(self, tmp_path, monkeypatch, capsys):
+        """Test running every project with its own threshold and aggregating the results"""
+        write_workspace(tmp_path)
+        monkeypatch.chdir(tmp_path)
+        coverage = {"shop": 85.0, "@acme/ui": 70.0}
+        monkeypatch.setattr(AngularTester, "get_coverage_report", lambda self: coverage[self.project["name"]])
+        tester = AngularTester.__new__(AngularTester)
+        tester.coverage_threshold = 80
+        tester.config = {"cache_dir": str(tmp_path / "state"), "project_workers": 2, "warmup_build": False,
+                         "history": False, "metrics": False, "project_thresholds": {"@acme/ui": 60}}
+        tester.process_components = MagicMock(return_value=True)
+        tester.run_tests = MagicMock(return_value=True)
+
+        assert tester.run_workspace(".")
+
+        report = json.loads((tmp_path / "state" / "workspace-report.json").read_text())
+        results = {project["project"]: project for project in report["projects"]}
+        assert results["shop"]["coverage"] == 85.0 and results["shop"]["threshold"] == 80
+        assert results["@acme/ui"]["coverage"] == 70.0 and results["@acme/ui"]["threshold"] == 60
+        assert "2/2 projects passed" in capsys.readouterr().out
+
+        tester.config["project_thresholds"] = {}
+        assert not tester.run_workspace(".")
+
+    @patch("angular_tester.main.subprocess.run")
+    def test_project_test_command(self, mock_run):
+        """Test that ng test is run for the session's project"""
+        tester = AngularTester.__new__(AngularTester)
+        tester.project = {"name": "shop", "root": ""}
+        tester.config = {"per_spec_results": False}
+        tester.ensure_chrome_installed = MagicMock(return_value=True)
+        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+
+        assert tester.run_tests()
+        assert mock_run.call_args[0][0][:3] == ["ng", "test", "shop"]